@@ -1,53 +1,189 @@
-from typing import Optional
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
 
+from django.core.paginator import Paginator
 from django.utils import timezone
 
+from events.cache import get_events
 from events.models import Event, EventCategory
 from event_detail.models import EventSchedule, AidStation, RouteSegment, EventDocument
+from event_detail.gpx import serialize_route_track
+from event_detail.route import route_profile_for, serialize_route_profile
 from forum.models import ForumPost, ForumThread
 from notifications.models import Notification as NotificationModel
-from profiles.models import RunnerAchievement, UserProfile, UserRaceHistory
+from profiles.models import RunnerAchievement, RunnerStats, UserProfile, UserRaceHistory
 from registrations.models import EventRegistration
 
+# Each serializer is described by a field table mapping payload keys to
+# ``getter(obj, context)`` callables. Tables keep key order (the payload order)
+# and let sparse fieldsets skip work -- and deferred columns -- for fields that
+# are not rendered.
+FieldTable = dict[str, Callable[[Any, dict], Any]]
 
-def serialize_category(category: EventCategory) -> dict:
-    """Serialize an EventCategory with fields expected by the Flutter models."""
+
+@dataclass(frozen=True)
+class FieldSet:
+    """Sparse fieldset from ``?fields=a,b`` / ``?exclude=c``; ``id`` is always kept."""
+
+    fields: Optional[frozenset] = None
+    exclude: frozenset = frozenset()
+
+    @classmethod
+    def from_request(cls, request, prefix: str = "") -> "FieldSet":
+        if request is None:
+            return cls()
+        fields = _split_param(request.GET.getlist(f"{prefix}fields"))
+        exclude = _split_param(request.GET.getlist(f"{prefix}exclude"))
+        return cls(fields=frozenset(fields) if fields else None, exclude=frozenset(exclude))
+
+    @property
+    def is_full(self) -> bool:
+        return self.fields is None and not self.exclude
+
+    def includes(self, name: str) -> bool:
+        if name == "id":
+            return True
+        if name in self.exclude:
+            return False
+        return self.fields is None or name in self.fields
+
+
+ALL_FIELDS = FieldSet()
+
+
+def _split_param(values) -> set[str]:
+    return {item.strip() for value in values for item in value.split(",") if item.strip()}
+
+
+def _render(obj, table: FieldTable, fieldset: Optional[FieldSet], context: dict) -> dict:
+    if fieldset is None or fieldset.is_full:
+        return {name: getter(obj, context) for name, getter in table.items()}
     return {
-        "id": category.id,
-        "name": category.name,
-        "display_name": category.display_name,
-        "distance_km": float(category.distance_km),
+        name: getter(obj, context)
+        for name, getter in table.items()
+        if fieldset.includes(name)
     }
 
 
-def serialize_event(event: Event) -> dict:
-    """Serialize an Event into the mobile-friendly payload."""
+def restrict_queryset(
+    queryset,
+    fieldset: FieldSet,
+    table: FieldTable,
+    *,
+    sources: Optional[dict] = None,
+    related=(),
+    prefetch: Optional[dict] = None,
+):
+    """
+    Push a fieldset down to the ORM.
+
+    ``sources`` maps payload keys to the model paths they read; unlisted keys
+    read the concrete field of the same name. Relations in ``related`` are
+    joined only when one of their columns is rendered, and ``prefetch`` maps
+    payload keys to the prefetch lookups that back them.
+    """
+    sources = sources or {}
+    prefetch = prefetch or {}
+    if fieldset.is_full:
+        if related:
+            queryset = queryset.select_related(*related)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch.values())
+        return queryset
+
+    meta = queryset.model._meta
+    concrete = {field.name for field in meta.concrete_fields}
+    paths = {meta.pk.name}
+    for name in table:
+        if fieldset.includes(name):
+            paths.update(sources.get(name, (name,) if name in concrete else ()))
+
+    joins = [
+        relation
+        for relation in related
+        if any(path == relation or path.startswith(f"{relation}__") for path in paths)
+    ]
+    paths.update(joins)
+    queryset = queryset.select_related(None)
+    if joins:
+        queryset = queryset.select_related(*joins)
+    lookups = [lookup for name, lookup in prefetch.items() if fieldset.includes(name)]
+    if lookups:
+        queryset = queryset.prefetch_related(*lookups)
+    return queryset.only(*sorted(paths))
+
+
+def _isoformat(value) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _absolute_media_url(url: str, request=None) -> str:
+    """Expand a site-relative media path (e.g. uploaded banners) when a request is available."""
+    if request is not None and url.startswith("/"):
+        return request.build_absolute_uri(url)
+    return url
+
+
+def _banner_variants(event: Event, request=None) -> dict:
     return {
-        "id": event.id,
-        "title": event.title,
-        "slug": event.slug,
-        "description": event.description,
-        "city": event.city,
-        "country": event.country,
-        "venue": event.venue,
-        "start_date": event.start_date.isoformat(),
-        "end_date": event.end_date.isoformat() if event.end_date else None,
-        "registration_open_date": (
-            event.registration_open_date.isoformat() if event.registration_open_date else None
-        ),
-        "registration_deadline": event.registration_deadline.isoformat(),
-        "status": event.status,
-        "popularity_score": event.popularity_score,
-        "participant_limit": event.participant_limit,
-        "registered_count": event.registered_count,
-        "featured": event.featured,
-        "banner_image": event.banner_image,
-        "categories": [serialize_category(cat) for cat in event.categories.all()],
-        "created_at": event.created_at.isoformat() if event.created_at else timezone.now().isoformat(),
-        "updated_at": event.updated_at.isoformat() if event.updated_at else timezone.now().isoformat(),
+        variant: {
+            key: _absolute_media_url(value, request) if isinstance(value, str) else value
+            for key, value in entry.items()
+        }
+        for variant, entry in (event.banner_variants or {}).items()
     }
 
 
+CATEGORY_FIELDS: FieldTable = {
+    "id": lambda category, ctx: category.id,
+    "name": lambda category, ctx: category.name,
+    "display_name": lambda category, ctx: category.display_name,
+    "distance_km": lambda category, ctx: float(category.distance_km),
+}
+
+
+def serialize_category(category: EventCategory, *, fieldset: Optional[FieldSet] = None) -> dict:
+    """Serialize an EventCategory with fields expected by the Flutter models."""
+    return _render(category, CATEGORY_FIELDS, fieldset, {})
+
+
+EVENT_FIELDS: FieldTable = {
+    "id": lambda event, ctx: event.id,
+    "title": lambda event, ctx: event.title,
+    "slug": lambda event, ctx: event.slug,
+    "description": lambda event, ctx: event.description,
+    "city": lambda event, ctx: event.city,
+    "country": lambda event, ctx: event.country,
+    "venue": lambda event, ctx: event.venue,
+    "latitude": lambda event, ctx: event.latitude,
+    "longitude": lambda event, ctx: event.longitude,
+    "start_date": lambda event, ctx: event.start_date.isoformat(),
+    "end_date": lambda event, ctx: _isoformat(event.end_date),
+    "registration_open_date": lambda event, ctx: _isoformat(event.registration_open_date),
+    "registration_deadline": lambda event, ctx: event.registration_deadline.isoformat(),
+    "status": lambda event, ctx: event.status,
+    "popularity_score": lambda event, ctx: event.popularity_score,
+    "participant_limit": lambda event, ctx: event.participant_limit,
+    "registered_count": lambda event, ctx: event.registered_count,
+    "featured": lambda event, ctx: event.featured,
+    "banner_image": lambda event, ctx: _absolute_media_url(event.banner_image, ctx.get("request")),
+    "banner_variants": lambda event, ctx: _banner_variants(event, ctx.get("request")),
+    "categories": lambda event, ctx: [serialize_category(cat) for cat in event.categories.all()],
+    "created_at": lambda event, ctx: (
+        event.created_at.isoformat() if event.created_at else timezone.now().isoformat()
+    ),
+    "updated_at": lambda event, ctx: (
+        event.updated_at.isoformat() if event.updated_at else timezone.now().isoformat()
+    ),
+}
+EVENT_PREFETCH = {"categories": "categories"}
+
+
+def serialize_event(event: Event, *, request=None, fieldset: Optional[FieldSet] = None) -> dict:
+    """Serialize an Event into the mobile-friendly payload."""
+    return _render(event, EVENT_FIELDS, fieldset, {"request": request})
+
+
 def serialize_event_detail(event: Event) -> dict:
     """Serialize the extended event detail (route, schedule, documents)."""
     return {
@@ -85,6 +221,8 @@ def serialize_event_detail(event: Event) -> dict:
             }
             for segment in event.route_segments.all()
         ],
+        "route_profile": serialize_route_profile(route_profile_for(event)),
+        "route_track": serialize_route_track(event),
         "documents": [
             {
                 "id": document.id,
@@ -100,133 +238,317 @@ def serialize_event_detail(event: Event) -> dict:
     }
 
 
-def serialize_history(history: UserRaceHistory) -> dict:
+HISTORY_FIELDS: FieldTable = {
+    "id": lambda history, ctx: history.id,
+    "event": lambda history, ctx: serialize_event(history.event),
+    "category": lambda history, ctx: history.category,
+    "registration_date": lambda history, ctx: history.registration_date.isoformat(),
+    "status": lambda history, ctx: history.status,
+    "bib_number": lambda history, ctx: history.bib_number,
+    "finish_time": lambda history, ctx: (
+        history.finish_time.total_seconds() if history.finish_time else None
+    ),
+    "medal_awarded": lambda history, ctx: history.medal_awarded,
+    "certificate_url": lambda history, ctx: history.certificate_url,
+    "notes": lambda history, ctx: history.notes,
+    "updated_at": lambda history, ctx: history.updated_at.isoformat(),
+}
+
+
+HISTORY_RELATED = ("event",)
+HISTORY_PREFETCH = {"event": "event__categories"}
+PROFILE_HISTORY_PAGE_SIZE = 20
+
+
+def serialize_history(history: UserRaceHistory, *, fieldset: Optional[FieldSet] = None) -> dict:
     """Serialize a user's race history item."""
-    return {
-        "id": history.id,
-        "event": serialize_event(history.event),
-        "category": history.category,
-        "registration_date": history.registration_date.isoformat(),
-        "status": history.status,
-        "bib_number": history.bib_number,
-        "finish_time": history.finish_time.total_seconds() if history.finish_time else None,
-        "medal_awarded": history.medal_awarded,
-        "certificate_url": history.certificate_url,
-        "notes": history.notes,
-        "updated_at": history.updated_at.isoformat(),
-    }
+    return _render(history, HISTORY_FIELDS, fieldset, {})
 
 
-def serialize_achievement(achievement: RunnerAchievement) -> dict:
+def paginate_history(profile: UserProfile, page_number=1, *, fieldset: Optional[FieldSet] = None):
+    """Return one page of ``profile``'s history with events and categories preloaded."""
+    queryset = restrict_queryset(
+        UserRaceHistory.objects.filter(profile=profile).order_by("-registration_date", "-id"),
+        fieldset or ALL_FIELDS,
+        HISTORY_FIELDS,
+        related=HISTORY_RELATED,
+        prefetch=HISTORY_PREFETCH,
+    )
+    return Paginator(queryset, PROFILE_HISTORY_PAGE_SIZE).get_page(page_number)
+
+
+ACHIEVEMENT_FIELDS: FieldTable = {
+    "id": lambda achievement, ctx: achievement.id,
+    "title": lambda achievement, ctx: achievement.title,
+    "description": lambda achievement, ctx: achievement.description,
+    "achieved_on": lambda achievement, ctx: _isoformat(achievement.achieved_on),
+    "link": lambda achievement, ctx: achievement.link,
+}
+
+
+def serialize_achievement(achievement: RunnerAchievement, *, fieldset: Optional[FieldSet] = None) -> dict:
     """Serialize a runner achievement."""
+    return _render(achievement, ACHIEVEMENT_FIELDS, fieldset, {})
+
+
+RUNNER_STATS_FIELDS: FieldTable = {
+    "total_races": lambda stats, ctx: stats.total_races,
+    "completed_races": lambda stats, ctx: stats.completed_races,
+    "upcoming_races": lambda stats, ctx: stats.upcoming_races,
+    "total_distance_km": lambda stats, ctx: float(stats.total_distance_km),
+    "total_time": lambda stats, ctx: stats.total_time.total_seconds(),
+    "average_pace_seconds": lambda stats, ctx: stats.average_pace_seconds,
+    "personal_bests": lambda stats, ctx: stats.personal_bests,
+    "yearly": lambda stats, ctx: stats.yearly,
+}
+
+
+def serialize_runner_stats(stats: RunnerStats, *, fieldset: Optional[FieldSet] = None) -> dict:
+    """Serialize a runner's aggregate stats (times and paces in seconds)."""
+    return _render(stats, RUNNER_STATS_FIELDS, fieldset, {})
+
+
+def serialize_leaderboard_entry(history: UserRaceHistory) -> dict:
+    """Serialize a ranked history row (annotated with ``rank``) for event leaderboards."""
+    profile = history.profile
     return {
-        "id": achievement.id,
-        "title": achievement.title,
-        "description": achievement.description,
-        "achieved_on": achievement.achieved_on.isoformat() if achievement.achieved_on else None,
-        "link": achievement.link,
+        "rank": history.rank,
+        "profile_id": profile.id,
+        "username": profile.user.username,
+        "display_name": profile.full_display_name,
+        "category": history.category,
+        "bib_number": history.bib_number,
+        "finish_time": history.finish_time.total_seconds(),
     }
 
 
-def serialize_profile(profile: UserProfile) -> dict:
-    """Serialize the authenticated user's profile."""
+def serialize_distance_leaderboard_entry(row: dict, profile: UserProfile) -> dict:
+    """Serialize a ranked personal-best row for overall distance leaderboards."""
     return {
-        "id": profile.id,
+        "rank": row["rank"],
+        "profile_id": profile.id,
         "username": profile.user.username,
         "display_name": profile.full_display_name,
-        "bio": profile.bio,
-        "city": profile.city,
-        "country": profile.country,
-        "avatar_url": profile.avatar_url,
-        "favorite_distance": profile.favorite_distance,
-        "emergency_contact_name": profile.emergency_contact_name,
-        "emergency_contact_phone": profile.emergency_contact_phone,
-        "website": profile.website,
-        "instagram_handle": profile.instagram_handle,
-        "strava_profile": profile.strava_profile,
-        "birth_date": profile.birth_date.isoformat() if profile.birth_date else None,
-        "created_at": profile.created_at.isoformat(),
-        "updated_at": profile.updated_at.isoformat(),
-        "history": [serialize_history(item) for item in profile.history.select_related("event")],
-        "achievements": [serialize_achievement(ach) for ach in profile.achievements.all()],
+        "finish_time": row["best_time"].total_seconds(),
     }
 
 
-def serialize_registration(registration: EventRegistration) -> dict:
-    """Serialize an event registration with nested event detail."""
-    category_display = registration.category.display_name if registration.category else registration.distance_label
+PROFILE_FIELDS: FieldTable = {
+    "id": lambda profile, ctx: profile.id,
+    "username": lambda profile, ctx: profile.user.username,
+    "display_name": lambda profile, ctx: profile.full_display_name,
+    "bio": lambda profile, ctx: profile.bio,
+    "city": lambda profile, ctx: profile.city,
+    "country": lambda profile, ctx: profile.country,
+    "avatar_url": lambda profile, ctx: profile.avatar_url,
+    "favorite_distance": lambda profile, ctx: profile.favorite_distance,
+    "emergency_contact_name": lambda profile, ctx: profile.emergency_contact_name,
+    "emergency_contact_phone": lambda profile, ctx: profile.emergency_contact_phone,
+    "website": lambda profile, ctx: profile.website,
+    "instagram_handle": lambda profile, ctx: profile.instagram_handle,
+    "strava_profile": lambda profile, ctx: profile.strava_profile,
+    "birth_date": lambda profile, ctx: _isoformat(profile.birth_date),
+    "created_at": lambda profile, ctx: profile.created_at.isoformat(),
+    "updated_at": lambda profile, ctx: profile.updated_at.isoformat(),
+    "history": lambda profile, ctx: [
+        serialize_history(item) for item in _history_page(profile, ctx).object_list
+    ],
+    "history_total": lambda profile, ctx: _history_page(profile, ctx).paginator.count,
+    "history_has_next": lambda profile, ctx: _history_page(profile, ctx).has_next(),
+    "achievements": lambda profile, ctx: [
+        serialize_achievement(ach) for ach in profile.achievements.all()
+    ],
+    "stats": lambda profile, ctx: serialize_runner_stats(profile.runner_stats),
+}
+
+
+def _history_page(profile: UserProfile, ctx: dict):
+    # Computed on first use so excluding the history keys skips the queries.
+    if "history_page" not in ctx:
+        ctx["history_page"] = paginate_history(profile)
+    return ctx["history_page"]
+
+
+def serialize_profile(profile: UserProfile, *, fieldset: Optional[FieldSet] = None) -> dict:
+    """
+    Serialize the authenticated user's profile.
+
+    Only the first page of history is embedded; the rest is served by the
+    paginated history endpoint. Load ``profile`` with ``UserProfile.load_for``
+    to avoid per-row queries for the user and achievements.
+    """
+    return _render(profile, PROFILE_FIELDS, fieldset, {})
+
+
+def parse_expand(request) -> set[str]:
+    """Return the relations requested via ``?expand=a,b`` (repeatable)."""
+    if request is None:
+        return set()
+    return _split_param(request.GET.getlist("expand"))
+
+
+def _registration_category_display(registration: EventRegistration) -> str:
+    if registration.category_id:
+        return registration.category.display_name
+    return registration.distance_label
+
+
+REGISTRATION_FIELDS: FieldTable = {
+    "id": lambda registration, ctx: str(registration.id),
+    "reference_code": lambda registration, ctx: registration.reference_code,
+    "user": lambda registration, ctx: registration.user_id,
+    "user_username": lambda registration, ctx: registration.user.username,
+    "event": lambda registration, ctx: (
+        serialize_event(registration.event, request=ctx.get("request"))
+        if ctx.get("expand_event")
+        else registration.event_id
+    ),
+    "category": lambda registration, ctx: registration.category_id,
+    "category_display_name": lambda registration, ctx: _registration_category_display(registration),
+    "distance_label": lambda registration, ctx: (
+        registration.distance_label
+        or _registration_category_display(registration)
+        or "Open Category"
+    ),
+    "phone_number": lambda registration, ctx: registration.phone_number,
+    "emergency_contact_name": lambda registration, ctx: registration.emergency_contact_name,
+    "emergency_contact_phone": lambda registration, ctx: registration.emergency_contact_phone,
+    "medical_notes": lambda registration, ctx: registration.medical_notes,
+    "status": lambda registration, ctx: registration.status,
+    "payment_status": lambda registration, ctx: registration.payment_status,
+    "form_payload": lambda registration, ctx: registration.form_payload or {},
+    "decision_note": lambda registration, ctx: registration.decision_note,
+    "created_at": lambda registration, ctx: registration.created_at.isoformat(),
+    "updated_at": lambda registration, ctx: registration.updated_at.isoformat(),
+    "confirmed_at": lambda registration, ctx: _isoformat(registration.confirmed_at),
+    "cancelled_at": lambda registration, ctx: _isoformat(registration.cancelled_at),
+}
+REGISTRATION_SOURCES = {
+    "user_username": ("user__username",),
+    "category_display_name": ("category__display_name", "distance_label"),
+    "distance_label": ("category__display_name", "distance_label"),
+}
+REGISTRATION_RELATED = ("user", "category")
+
+
+def serialize_registration(
+    registration: EventRegistration,
+    *,
+    request=None,
+    expand_event: bool = True,
+    fieldset: Optional[FieldSet] = None,
+) -> dict:
+    """
+    Serialize an event registration.
+
+    With ``expand_event`` the full event payload is nested; otherwise ``event``
+    is just the id and callers are expected to sideload events (see
+    ``serialize_registration_page``).
+    """
+    context = {"request": request, "expand_event": expand_event}
+    return _render(registration, REGISTRATION_FIELDS, fieldset, context)
+
+
+def serialize_registration_page(registrations, *, request=None) -> dict:
+    """
+    Serialize a page of registrations.
+
+    Registrations reference their event by id and each distinct event is
+    serialized once into the ``events`` map, keyed by id, from the event cache
+    (misses are fetched in a single query).
+    ``?expand=event`` restores the nested per-row event payload for older app
+    versions. ``?fields=``/``?exclude=`` apply to registrations and
+    ``?event_fields=``/``?event_exclude=`` to the events.
+    """
+    registrations = list(registrations)
+    fieldset = FieldSet.from_request(request)
+    event_fieldset = FieldSet.from_request(request, prefix="event_")
+
+    events = {}
+    if fieldset.includes("event") and registrations:
+        events = {
+            event_id: serialize_event(event, request=request, fieldset=event_fieldset)
+            for event_id, event in get_events(reg.event_id for reg in registrations).items()
+        }
+
+    rows = [
+        serialize_registration(reg, request=request, expand_event=False, fieldset=fieldset)
+        for reg in registrations
+    ]
+    if "event" in parse_expand(request):
+        for row in rows:
+            if "event" in row:
+                row["event"] = events[row["event"]]
+        return {"results": rows}
     return {
-        "id": str(registration.id),
-        "reference_code": registration.reference_code,
-        "user": registration.user_id,
-        "user_username": registration.user.username,
-        "event": serialize_event(registration.event),
-        "category": registration.category_id,
-        "category_display_name": category_display,
-        "distance_label": registration.distance_label or category_display or "Open Category",
-        "phone_number": registration.phone_number,
-        "emergency_contact_name": registration.emergency_contact_name,
-        "emergency_contact_phone": registration.emergency_contact_phone,
-        "medical_notes": registration.medical_notes,
-        "status": registration.status,
-        "payment_status": registration.payment_status,
-        "form_payload": registration.form_payload or {},
-        "decision_note": registration.decision_note,
-        "created_at": registration.created_at.isoformat(),
-        "updated_at": registration.updated_at.isoformat(),
-        "confirmed_at": registration.confirmed_at.isoformat() if registration.confirmed_at else None,
-        "cancelled_at": registration.cancelled_at.isoformat() if registration.cancelled_at else None,
+        "results": rows,
+        "events": {str(event_id): payload for event_id, payload in events.items()},
     }
 
 
-def serialize_thread(thread: ForumThread) -> dict:
+THREAD_FIELDS: FieldTable = {
+    "id": lambda thread, ctx: thread.id,
+    "event": lambda thread, ctx: thread.event_id,
+    "author": lambda thread, ctx: thread.author_id,
+    "author_username": lambda thread, ctx: thread.author.username,
+    "title": lambda thread, ctx: thread.title,
+    "slug": lambda thread, ctx: thread.slug,
+    "body": lambda thread, ctx: thread.body,
+    "created_at": lambda thread, ctx: thread.created_at.isoformat(),
+    "updated_at": lambda thread, ctx: thread.updated_at.isoformat(),
+    "last_activity_at": lambda thread, ctx: thread.last_activity_at.isoformat(),
+    "is_pinned": lambda thread, ctx: thread.is_pinned,
+    "is_locked": lambda thread, ctx: thread.is_locked,
+    "view_count": lambda thread, ctx: thread.view_count,
+}
+THREAD_SOURCES = {"author_username": ("author__username",)}
+THREAD_RELATED = ("author",)
+
+
+def serialize_thread(thread: ForumThread, *, fieldset: Optional[FieldSet] = None) -> dict:
     """Serialize a forum thread with activity metadata."""
-    return {
-        "id": thread.id,
-        "event": thread.event_id,
-        "author": thread.author_id,
-        "author_username": thread.author.username,
-        "title": thread.title,
-        "slug": thread.slug,
-        "body": thread.body,
-        "created_at": thread.created_at.isoformat(),
-        "updated_at": thread.updated_at.isoformat(),
-        "last_activity_at": thread.last_activity_at.isoformat(),
-        "is_pinned": thread.is_pinned,
-        "is_locked": thread.is_locked,
-        "view_count": thread.view_count,
-    }
+    return _render(thread, THREAD_FIELDS, fieldset, {})
 
 
-def serialize_post(post: ForumPost, *, user=None) -> dict:
-    """Serialize a forum post, including like counts and user like state."""
-    is_liked = False
+def _post_is_liked(post: ForumPost, user) -> bool:
     if user and user.is_authenticated:
-        is_liked = post.likes.filter(pk=user.pk).exists()
-    return {
-        "id": post.id,
-        "thread": post.thread_id,
-        "author": post.author_id,
-        "author_username": post.author.username,
-        "parent": post.parent_id,
-        "content": post.content,
-        "created_at": post.created_at.isoformat(),
-        "updated_at": post.updated_at.isoformat(),
-        "likes_count": post.like_count,
-        "is_liked_by_user": is_liked,
-    }
+        return post.likes.filter(pk=user.pk).exists()
+    return False
+
 
+POST_FIELDS: FieldTable = {
+    "id": lambda post, ctx: post.id,
+    "thread": lambda post, ctx: post.thread_id,
+    "author": lambda post, ctx: post.author_id,
+    "author_username": lambda post, ctx: post.author.username,
+    "parent": lambda post, ctx: post.parent_id,
+    "content": lambda post, ctx: post.content,
+    "created_at": lambda post, ctx: post.created_at.isoformat(),
+    "updated_at": lambda post, ctx: post.updated_at.isoformat(),
+    "likes_count": lambda post, ctx: post.like_count,
+    "is_liked_by_user": lambda post, ctx: _post_is_liked(post, ctx.get("user")),
+}
+POST_SOURCES = {"author_username": ("author__username",)}
+
+
+def serialize_post(post: ForumPost, *, user=None, fieldset: Optional[FieldSet] = None) -> dict:
+    """Serialize a forum post, including like counts and user like state."""
+    return _render(post, POST_FIELDS, fieldset, {"user": user})
 
-def serialize_notification(note: NotificationModel) -> dict:
+
+NOTIFICATION_FIELDS: FieldTable = {
+    "id": lambda note, ctx: note.id,
+    "recipient": lambda note, ctx: note.recipient_id,
+    "title": lambda note, ctx: note.title,
+    "message": lambda note, ctx: note.message,
+    "category": lambda note, ctx: note.category,
+    "link_url": lambda note, ctx: note.link_url,
+    "is_read": lambda note, ctx: note.is_read,
+    "created_at": lambda note, ctx: note.created_at.isoformat(),
+    "read_at": lambda note, ctx: _isoformat(note.read_at),
+}
+
+
+def serialize_notification(note: NotificationModel, *, fieldset: Optional[FieldSet] = None) -> dict:
     """Serialize a notification payload for the app."""
-    return {
-        "id": note.id,
-        "recipient": note.recipient_id,
-        "title": note.title,
-        "message": note.message,
-        "category": note.category,
-        "link_url": note.link_url,
-        "is_read": note.is_read,
-        "created_at": note.created_at.isoformat(),
-        "read_at": note.read_at.isoformat() if note.read_at else None,
-    }
+    return _render(note, NOTIFICATION_FIELDS, fieldset, {})
@@ -1,10 +1,12 @@
 from django.urls import path
+from django.views.decorators.cache import never_cache
 from rest_framework.authtoken.views import obtain_auth_token
 from . import api_views
 
 app_name = 'core_api'
 
 urlpatterns = [
-    path('auth/login/', obtain_auth_token, name='api_login'),
+    # never_cache keeps the token out of caches and compressed responses.
+    path('auth/login/', never_cache(obtain_auth_token), name='api_login'),
     path('auth/logout/', api_views.logout_view, name='api_logout'),
 ]
\ No newline at end of file
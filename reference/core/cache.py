@@ -0,0 +1,167 @@
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+_MISSING = object()
+
+
+def _fresh_version() -> int:
+    # Seeded from the clock so an evicted counter never restarts at a value a
+    # worker (or client ETag) may still hold.
+    return time.time_ns() // 1000
+
+
+class LRUCache:
+    """Thread-safe, size-bounded LRU map whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires <= now:
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value, ttl: float | None = None) -> None:
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TwoTierCache:
+    """
+    Namespaced cache with a bounded in-process LRU (L1) in front of a shared
+    Django cache backend (L2, ``CACHES[alias]``).
+
+    Entries are keyed by a namespace-wide version and an optional per-scope
+    version (e.g. one per user), both kept in L2. ``invalidate()`` bumps them,
+    so every worker moves to new keys: immediately in the invalidating
+    process, and within ``version_ttl`` seconds elsewhere, which is how long a
+    worker trusts its L1 copy of a version. Nothing is deleted; superseded
+    entries age out of both tiers.
+
+    ``maxsize`` and ``ttl`` bound L1; ``timeout`` is the L2 timeout (the
+    backend's default unless given). L1 hands out the same object to every
+    caller in the process, so cached values must be treated as read-only.
+    """
+
+    _instances: "weakref.WeakSet[TwoTierCache]" = weakref.WeakSet()
+
+    def __init__(
+        self,
+        namespace: str,
+        *,
+        alias: str = "default",
+        maxsize: int = 1024,
+        ttl: float = 60,
+        version_ttl: float = 1,
+        timeout=DEFAULT_TIMEOUT,
+    ):
+        self.namespace = namespace
+        self.alias = alias
+        self.timeout = timeout
+        self.version_ttl = version_ttl
+        self.local = LRUCache(maxsize, ttl)
+        self._versions = LRUCache(maxsize, version_ttl)
+        self._instances.add(self)
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    def _version_key(self, scope) -> str:
+        return f"{self.namespace}:version:{scope}"
+
+    def version(self, scope="") -> int:
+        """Current version of ``scope`` (``""`` is the namespace-wide version)."""
+        version = self._versions.get(scope)
+        if version is None:
+            key = self._version_key(scope)
+            version = self.shared.get(key)
+            if version is None:
+                self.shared.add(key, _fresh_version(), None)
+                version = self.shared.get(key)
+            self._versions.set(scope, version)
+        return version
+
+    def _key(self, key: str, scope) -> str:
+        versions = f"{self.version()}.{self.version(scope)}" if scope != "" else str(self.version())
+        return f"{self.namespace}:{scope}:{versions}:{key}"
+
+    def get(self, key: str, default=None, *, scope=""):
+        full_key = self._key(key, scope)
+        value = self.local.get(full_key, _MISSING)
+        if value is _MISSING:
+            value = self.shared.get(full_key, _MISSING)
+            if value is _MISSING:
+                return default
+            self.local.set(full_key, value)
+        return value
+
+    def set(self, key: str, value, *, scope="", timeout=None) -> None:
+        full_key = self._key(key, scope)
+        self.shared.set(full_key, value, self.timeout if timeout is None else timeout)
+        self.local.set(full_key, value)
+
+    def get_or_set(self, key: str, builder: Callable[[], Any], *, scope="", timeout=None):
+        """Return the cached value for ``key``, building and storing it in both tiers on a miss."""
+        full_key = self._key(key, scope)
+        value = self.local.get(full_key, _MISSING)
+        if value is not _MISSING:
+            return value
+        value = self.shared.get(full_key, _MISSING)
+        if value is _MISSING:
+            value = builder()
+            self.shared.set(full_key, value, self.timeout if timeout is None else timeout)
+        self.local.set(full_key, value)
+        return value
+
+    def invalidate(self, *scopes) -> None:
+        """Bump the version of each scope, or of the whole namespace when none are given."""
+        for scope in set(scopes) if scopes else {""}:
+            key = self._version_key(scope)
+            # get + set rather than incr: it works on every backend, and a bump
+            # that loses a race still moves the version past every key built
+            # before it.
+            current = self.shared.get(key) or 0
+            version = max(_fresh_version(), current + 1)
+            self.shared.set(key, version, None)
+            self._versions.set(scope, version)
+        if not scopes:
+            self.local.clear()
+
+    def clear_local(self) -> None:
+        self.local.clear()
+        self._versions.clear()
+
+    @classmethod
+    def clear_all_local(cls) -> None:
+        """Drop every instance's L1 state (e.g. after ``cache.clear()`` in tests)."""
+        for instance in list(cls._instances):
+            instance.clear_local()
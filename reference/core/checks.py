@@ -0,0 +1,119 @@
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import ManifestFilesMixin, staticfiles_storage
+from django.core.checks import Error, Tags, Warning, register
+from django.template import engines
+
+_STATIC_TAG_RE = re.compile(r"""{%\s*static\s+(['"])([^'"]+)\1""")
+
+
+def _template_directories() -> list[Path]:
+    """Every directory the template engines load from, ``APP_DIRS`` included."""
+    directories = []
+    for engine in engines.all():
+        loaders = getattr(getattr(engine, "engine", None), "template_loaders", None)
+        if loaders is None:
+            directories.extend(getattr(engine, "template_dirs", ()))
+            continue
+        for loader in loaders:
+            directories.extend(loader.get_dirs())
+    return list(dict.fromkeys(Path(directory) for directory in directories))
+
+
+def _template_static_paths() -> dict[str, str]:
+    """Literal ``{% static "..." %}`` paths used by templates -> first template using them."""
+    paths = {}
+    for directory in _template_directories():
+        for template in directory.rglob("*.html"):
+            for match in _STATIC_TAG_RE.finditer(template.read_text(errors="ignore")):
+                paths.setdefault(match.group(2), str(template))
+    return paths
+
+
+def _source_paths() -> set[str]:
+    paths = set()
+    for finder in finders.get_finders():
+        for path, _ in finder.list(["CVS", ".*", "*~"]):
+            paths.add(Path(path).as_posix())
+    return paths
+
+
+@register(Tags.staticfiles, deploy=True)
+def check_static_manifest(app_configs, **kwargs):
+    """
+    Verify a fingerprinted static build (``check --deploy``).
+
+    The manifest must exist, every hashed file it lists must be on disk, every
+    ``{% static %}`` path in the templates must be in it (a strict manifest
+    raises on render otherwise), and every source asset should have been
+    collected.
+    """
+    storage = staticfiles_storage
+    if not isinstance(storage, ManifestFilesMixin):
+        return []
+
+    manifest, _ = storage.load_manifest()
+    if not manifest:
+        return [
+            Error(
+                f"Static manifest {storage.manifest_name} is missing or empty.",
+                hint="Run `manage.py collectstatic --noinput` before deploying.",
+                id="core.E001",
+            )
+        ]
+
+    errors = []
+    missing_files = sorted(name for name, hashed in manifest.items() if not storage.exists(hashed))
+    if missing_files:
+        errors.append(
+            Error(
+                f"{len(missing_files)} fingerprinted file(s) listed in the manifest are missing: "
+                f"{', '.join(missing_files[:5])}",
+                hint="Re-run `manage.py collectstatic --noinput`.",
+                id="core.E002",
+            )
+        )
+
+    unknown = {path: template for path, template in _template_static_paths().items() if path not in manifest}
+    if unknown:
+        errors.append(
+            Error(
+                "Templates reference static files that are not in the manifest: "
+                + ", ".join(f"{path} ({template})" for path, template in sorted(unknown.items())[:5]),
+                hint="Add the files to a static directory or fix the paths, then collectstatic.",
+                id="core.E003",
+            )
+        )
+
+    stale = sorted(_source_paths() - manifest.keys())
+    if stale:
+        errors.append(
+            Warning(
+                f"{len(stale)} static source file(s) are not in the manifest: {', '.join(stale[:5])}",
+                hint="The build is stale; re-run `manage.py collectstatic --noinput`.",
+                id="core.W001",
+            )
+        )
+    return errors
+
+
+@register(Tags.urls, deploy=True)
+def check_media_serving(app_configs, **kwargs):
+    """
+    Warn when nothing serves uploads (``check --deploy``): with DEBUG off
+    Django only serves ``MEDIA_URL`` when ``SERVE_MEDIA`` is on, so a
+    same-host ``MEDIA_URL`` needs a web server in front of it.
+    """
+    media_url = settings.MEDIA_URL or ""
+    if settings.DEBUG or settings.SERVE_MEDIA or media_url.startswith(("http://", "https://", "//")):
+        return []
+    return [
+        Warning(
+            f"Uploaded files under {media_url} are not served: DEBUG and SERVE_MEDIA are both off.",
+            hint="Set SERVE_MEDIA=true, serve MEDIA_ROOT from the web server, or point MEDIA_URL at a media host.",
+            id="core.W002",
+        )
+    ]
@@ -0,0 +1,95 @@
+import statistics
+import threading
+import time
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+from django.test import Client
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure requests/sec of an endpoint through the WSGI application with the "
+        "configured database settings. Run once per configuration (e.g. DB_POOL=false "
+        "CONN_MAX_AGE=0 vs. the defaults) to compare connection handling."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/api/events/", help="URL to request (default: /api/events/).")
+        parser.add_argument("--requests", type=int, default=500, help="Requests per thread (default: 500).")
+        parser.add_argument("--threads", type=int, default=1, help="Concurrent client threads (default: 1).")
+        parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per thread (default: 20).")
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1 or options["threads"] < 1 or options["warmup"] < 0:
+            raise CommandError("--requests and --threads must be positive, --warmup non-negative.")
+        host = next((h for h in settings.ALLOWED_HOSTS if h and h != "*" and not h.startswith(".")), "localhost")
+        path = options["path"]
+
+        status = Client(HTTP_HOST=host).get(path).status_code
+        if status >= 400:
+            raise CommandError(f"{path} answered {status}; pick an endpoint that succeeds anonymously.")
+
+        latencies: list[float] = []
+        lock = threading.Lock()
+        start_barrier = threading.Barrier(options["threads"] + 1)
+
+        # The test Client disconnects close_old_connections from the request
+        # signals, so connection handling would not be measured through it.
+        # The WSGI handler sends request_started/request_finished like a
+        # production server does; only the socket is skipped.
+        application = get_wsgi_application()
+        path_info, _, query_string = path.partition("?")
+
+        def call():
+            environ = {"PATH_INFO": path_info, "QUERY_STRING": query_string, "HTTP_HOST": host}
+            setup_testing_defaults(environ)
+            response = application(environ, lambda status, headers, exc_info=None: None)
+            try:
+                for _ in response:
+                    pass
+            finally:
+                response.close()  # Sends request_finished.
+
+        def worker():
+            # Each thread gets its own database connection, as a threaded
+            # server worker would.
+            for _ in range(options["warmup"]):
+                call()
+            start_barrier.wait()
+            timings = []
+            for _ in range(options["requests"]):
+                began = time.perf_counter()
+                call()
+                timings.append(time.perf_counter() - began)
+            with lock:
+                latencies.extend(timings)
+            connections.close_all()
+
+        threads = [threading.Thread(target=worker) for _ in range(options["threads"])]
+        for thread in threads:
+            thread.start()
+        start_barrier.wait()
+        began = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - began
+
+        database = settings.DATABASES["default"]
+        pool = database.get("OPTIONS", {}).get("pool")
+        latencies.sort()
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        self.stdout.write(
+            f"{database['ENGINE'].rsplit('.', 1)[-1]} "
+            f"CONN_MAX_AGE={database.get('CONN_MAX_AGE', 0)} pool={'on' if pool else 'off'}"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(latencies) / elapsed:.1f} req/s over {len(latencies)} requests "
+                f"({options['threads']} threads); p50 {statistics.median(latencies) * 1000:.1f} ms, "
+                f"p95 {p95 * 1000:.1f} ms"
+            )
+        )
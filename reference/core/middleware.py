@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+DEFAULT_JSON_COMPRESSION_MIN_SIZE = 1024
+
+_accepts_br = _lazy_re_compile(r"\bbr\b")
+_accepts_gzip = _lazy_re_compile(r"\bgzip\b")
+_no_store = _lazy_re_compile(r"\bno-store\b")
+
+
+class JSONCompressionMiddleware:
+    """
+    Compress large JSON responses with brotli (when installed) or gzip.
+
+    Only non-streaming ``application/json`` bodies of at least
+    ``JSON_COMPRESSION_MIN_SIZE`` bytes are touched; small payloads are cheaper
+    to send as-is. Gzip output carries the same random-filename padding as
+    Django's ``GZipMiddleware``.
+
+    BREACH needs a secret in a compressed body that also reflects attacker
+    input. Responses that may hold one are sent uncompressed: those setting
+    cookies (login, session rotation), those for which the CSRF token was
+    read, and ``Cache-Control: no-store`` ones (``never_cache``, e.g. the API
+    token login). Other JSON bodies carry no credentials.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = getattr(settings, "JSON_COMPRESSION_MIN_SIZE", DEFAULT_JSON_COMPRESSION_MIN_SIZE)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            response.streaming
+            or response.has_header("Content-Encoding")
+            or not response.get("Content-Type", "").startswith("application/json")
+            or len(response.content) < self.min_size
+            or response.cookies
+            or request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+            or _no_store.search(response.get("Cache-Control", ""))
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        accept_encoding = request.META.get("HTTP_ACCEPT_ENCODING", "")
+        if brotli is not None and _accepts_br.search(accept_encoding):
+            encoding, compressed = "br", brotli.compress(response.content)
+        elif _accepts_gzip.search(accept_encoding):
+            encoding = "gzip"
+            compressed = compress_string(response.content, max_random_bytes=GZipMiddleware.max_random_bytes)
+        else:
+            return response
+
+        if len(compressed) >= len(response.content):
+            return response
+        # A strong ETag must change with the encoding; weaken it like GZipMiddleware.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response.content = compressed
+        response["Content-Length"] = str(len(compressed))
+        response["Content-Encoding"] = encoding
+        return response
@@ -0,0 +1,156 @@
+import json
+import re
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is not installed
+    orjson = None
+
+# Datetimes and dataclasses are routed through the encoder's ``default`` so
+# both backends produce the same strings (trailing "Z", Decimal handling, ...).
+# Subclasses of str/int/dict/list are passed through too: orjson reads their
+# native storage and would skip overrides such as ``ErrorList.__iter__``.
+_ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+    | orjson.OPT_PASSTHROUGH_SUBCLASS
+    if orjson is not None
+    else 0
+)
+_COMPACT_SEPARATORS = (",", ":")
+_JSON_RESPONSE_SEPARATORS = (", ", ": ")
+# orjson spells float exponents "1e16" / "1e-7" where the stdlib writes
+# "1e+16" / "1e-07". A match inside a string only costs the slow path.
+_FLOAT_EXPONENT = re.compile(rb"\de[-\d]")
+
+
+def _subclass_default(default):
+    """Wrap an encoder's ``default`` to encode builtin subclasses like the stdlib does."""
+
+    def encode(value):
+        if isinstance(value, str):
+            return str.__str__(value)
+        if isinstance(value, int):
+            return int(value)
+        if isinstance(value, dict):
+            return dict(value)
+        if isinstance(value, list):
+            return list(value)
+        return default(value)
+
+    return encode
+
+
+def _respace(content: bytes, separators: tuple[str, str]) -> bytes | None:
+    """
+    Re-spell orjson's compact separators outside strings, or ``None`` when
+    a string holds an escaped quote and the split below would be unreliable.
+    """
+    if b'\\"' in content:
+        return None
+    item, key = (separator.encode() for separator in separators)
+    parts = content.split(b'"')
+    # Even parts lie outside strings.
+    parts[::2] = [part.replace(b",", item).replace(b":", key) for part in parts[::2]]
+    return b'"'.join(parts)
+
+
+def dumps(
+    data,
+    *,
+    encoder=encoders.JSONEncoder,
+    ensure_ascii: bool = False,
+    separators: tuple[str, str] = _COMPACT_SEPARATORS,
+    allow_nan: bool = False,
+) -> bytes:
+    """
+    Serialize ``data`` to JSON bytes, byte-identical to
+    ``json.dumps(data, cls=encoder, ensure_ascii=..., separators=...)`` for
+    finite numbers.
+
+    Uses orjson when it is installed and falls back to the stdlib encoder
+    otherwise, and for output orjson spells differently: integers wider than
+    64 bits, float exponents and, with ``ensure_ascii``, non-ASCII text.
+    Non-finite floats differ: with orjson, NaN and infinities become
+    ``null`` (valid JSON), where the stdlib writes ``NaN`` (``allow_nan``)
+    or raises ``ValueError``.
+    """
+    if orjson is not None:
+        try:
+            content = orjson.dumps(data, default=_subclass_default(encoder().default), option=_ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            content = None
+        if (
+            content is not None
+            and (not ensure_ascii or content.isascii())
+            and not _FLOAT_EXPONENT.search(content)
+        ):
+            if separators == _COMPACT_SEPARATORS:
+                return content
+            content = _respace(content, separators)
+            if content is not None:
+                return content
+    return json.dumps(
+        data,
+        cls=encoder,
+        ensure_ascii=ensure_ascii,
+        allow_nan=allow_nan,
+        separators=separators,
+    ).encode()
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Drop-in replacement for DRF's ``JSONRenderer`` backed by :func:`dumps`.
+
+    Indented output (``Accept: application/json; indent=4`` or the browsable
+    API) is delegated to the stock renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        renderer_context = renderer_context or {}
+        if (
+            self.get_indent(accepted_media_type, renderer_context) is not None
+            or not self.compact
+            or not self.strict
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        content = dumps(data, encoder=self.encoder_class, ensure_ascii=self.ensure_ascii)
+        # Same strict-javascript-subset escaping as JSONRenderer.
+        if b"\xe2\x80\xa8" in content or b"\xe2\x80\xa9" in content:
+            content = content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return content
+
+
+class FastJsonResponse(HttpResponse):
+    """
+    ``JsonResponse`` counterpart for the legacy (non-DRF) endpoints.
+
+    Produces the same bytes as ``JsonResponse`` (DjangoJSONEncoder, ASCII
+    only, ``", "`` / ``": "`` separators), just faster; only NaN and
+    infinities differ, written as ``null`` rather than ``NaN`` (see
+    :func:`dumps`).
+    """
+
+    def __init__(self, data, encoder=DjangoJSONEncoder, safe=True, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError(
+                "In order to allow non-dict objects to be serialized set the "
+                "safe parameter to False."
+            )
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(
+            content=dumps(
+                data, encoder=encoder, ensure_ascii=True, separators=_JSON_RESPONSE_SEPARATORS, allow_nan=True
+            ),
+            **kwargs,
+        )
@@ -0,0 +1,109 @@
+import re
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+from typing import Callable, Iterable
+
+from django.db import IntegrityError, transaction
+from django.db.models import Model, Q
+
+SLUG_SAVE_ATTEMPTS = 5
+# Bases per collision query; each adds three conditions to the WHERE clause,
+# and SQLite rejects expression trees beyond a depth of 1000.
+COLLISION_QUERY_CHUNK = 200
+
+
+def _collisions(model: type[Model], bases: Iterable[str], exclude_pk=None) -> dict[str, int]:
+    """
+    Highest suffix in use for each base slug, in one query per
+    ``COLLISION_QUERY_CHUNK`` bases: ``-1`` when no slug is taken, ``0`` when
+    only the bare base is, ``N`` for ``base-N``.
+
+    ``startswith`` keeps the lookup on the slug index; the regex then drops
+    longer slugs that merely share the prefix ("run-club" for "run").
+    """
+    highest = dict.fromkeys(bases, -1)
+    ordered = sorted(highest)
+    slugs = []
+    for start in range(0, len(ordered), COLLISION_QUERY_CHUNK):
+        matches = (
+            Q(slug=base) | Q(slug__startswith=f"{base}-", slug__regex=rf"^{re.escape(base)}-[0-9]+$")
+            for base in ordered[start:start + COLLISION_QUERY_CHUNK]
+        )
+        queryset = model._default_manager.filter(reduce(or_, matches))
+        if exclude_pk is not None:
+            queryset = queryset.exclude(pk=exclude_pk)
+        slugs.extend(queryset.values_list("slug", flat=True))
+    for slug in slugs:
+        if slug in highest:
+            highest[slug] = max(highest[slug], 0)
+        base, _, suffix = slug.rpartition("-")
+        if base in highest and suffix.isdigit():
+            highest[base] = max(highest[base], int(suffix))
+    return highest
+
+
+def _with_suffix(base: str, suffix: int) -> str:
+    return f"{base}-{suffix}" if suffix else base
+
+
+def next_slug(model: type[Model], base: str, *, exclude_pk=None) -> str:
+    """``base``, or ``base-N`` with N one past the highest suffix already taken."""
+    return _with_suffix(base, _collisions(model, [base], exclude_pk)[base] + 1)
+
+
+def save_with_unique_slug(instance: Model, base: str, save: Callable[[], None]) -> None:
+    """
+    Give ``instance`` a free slug derived from ``base`` and ``save()`` it.
+
+    The free slug is picked from one query; a concurrent insert that takes it
+    first surfaces as an ``IntegrityError``, after which the slug is picked
+    again (up to ``SLUG_SAVE_ATTEMPTS`` times).
+    """
+    model = type(instance)
+    for attempt in range(SLUG_SAVE_ATTEMPTS):
+        instance.slug = next_slug(model, base, exclude_pk=instance.pk)
+        try:
+            with transaction.atomic():
+                save()
+            return
+        except IntegrityError:
+            taken = model._default_manager.filter(slug=instance.slug).exclude(pk=instance.pk).exists()
+            if not taken or attempt == SLUG_SAVE_ATTEMPTS - 1:
+                raise
+
+
+def assign_slugs(model: type[Model], instances: Iterable[Model], base_for: Callable[[Model], str]) -> list[Model]:
+    """
+    Set a free slug on every instance without one, for ``bulk_create``.
+
+    Collisions for all bases are fetched together (one query per
+    ``COLLISION_QUERY_CHUNK`` bases) and suffixes are handed out in memory,
+    so instances sharing a base within the batch get consecutive ones.
+    """
+    pending = defaultdict(list)
+    for instance in instances:
+        if not instance.slug:
+            pending[base_for(instance)].append(instance)
+    for base, suffix in _collisions(model, pending).items():
+        for instance in pending[base]:
+            suffix += 1
+            instance.slug = _with_suffix(base, suffix)
+    return [instance for group in pending.values() for instance in group]
+
+
+def bulk_create_with_slugs(
+    model: type[Model], instances: list[Model], base_for: Callable[[Model], str], *, batch_size: int = 500
+) -> list[Model]:
+    """``bulk_create`` with slugs from ``assign_slugs``, re-assigned and retried on a collision."""
+    unslugged = [instance for instance in instances if not instance.slug]
+    for attempt in range(SLUG_SAVE_ATTEMPTS):
+        assign_slugs(model, instances, base_for)
+        try:
+            with transaction.atomic():
+                return model._default_manager.bulk_create(instances, batch_size=batch_size)
+        except IntegrityError:
+            if attempt == SLUG_SAVE_ATTEMPTS - 1:
+                raise
+            for instance in unslugged:
+                instance.slug = ""
@@ -1,3 +1,4 @@
+import time
 from datetime import timedelta
 from decimal import Decimal
 from unittest.mock import patch
@@ -508,4 +509,585 @@ class URLConfigTests(TestCase):
     def test_about_url_resolves(self):
         """Test about URL resolves correctly."""
         url = reverse("core:about")
-        self.assertEqual(url, "/about/")
\ No newline at end of file
+        self.assertEqual(url, "/about/")
+
+class SparseFieldsetTests(TestCase):
+    """Tests for ?fields= / ?exclude= support in core.api_helpers."""
+
+    def setUp(self):
+        from forum.models import ForumThread
+
+        self.today = timezone.localdate()
+        self.user = User.objects.create_user(username="sparse", password="password123")
+        self.client.login(username="sparse", password="password123")
+        self.category = EventCategory.objects.create(
+            name="sparse-10k", distance_km=Decimal("10.00"), display_name="Sparse 10K"
+        )
+        self.event = Event.objects.create(
+            title="Sparse Run",
+            description="A very long description " * 50,
+            city="Bandung",
+            start_date=self.today + timedelta(days=10),
+            registration_deadline=self.today + timedelta(days=5),
+        )
+        self.event.categories.add(self.category)
+        ForumThread.objects.create(
+            event=self.event, author=self.user, title="Training tips", body="Long body " * 50
+        )
+
+    def _captured(self, url, params):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, params)
+        return response, [query["sql"] for query in ctx.captured_queries]
+
+    def test_fieldset_parsing(self):
+        from core.api_helpers import FieldSet
+
+        request = RequestFactory().get("/", {"fields": "title, city", "exclude": "city"})
+        fieldset = FieldSet.from_request(request)
+        self.assertTrue(fieldset.includes("id"))
+        self.assertTrue(fieldset.includes("title"))
+        self.assertFalse(fieldset.includes("city"))
+        self.assertFalse(fieldset.includes("description"))
+        self.assertTrue(FieldSet.from_request(RequestFactory().get("/")).is_full)
+
+    def test_event_list_fields_pushed_down_to_query(self):
+        response, queries = self._captured("/api/events/", {"fields": "title,start_date"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"], [
+            {"id": self.event.id, "title": "Sparse Run", "start_date": self.event.start_date.isoformat()}
+        ])
+        event_queries = [sql for sql in queries if 'FROM "events_event"' in sql]
+        self.assertTrue(event_queries)
+        self.assertTrue(all('"description"' not in sql for sql in event_queries))
+        self.assertFalse(any("events_event_categories" in sql for sql in queries))
+
+    def test_event_exclude_keeps_everything_else(self):
+        response = self.client.get("/api/events/", {"exclude": "description"})
+
+        payload = response.json()["results"][0]
+        self.assertNotIn("description", payload)
+        self.assertEqual(payload["categories"][0]["display_name"], "Sparse 10K")
+        self.assertIn("registration_deadline", payload)
+
+    def test_full_payload_unchanged_without_params(self):
+        from core.api_helpers import serialize_event
+
+        response = self.client.get(f"/api/events/{self.event.id}/")
+        self.assertEqual(response.json(), serialize_event(Event.objects.get(pk=self.event.pk)))
+        self.assertEqual(list(response.json())[:3], ["id", "title", "slug"])
+
+    def test_thread_fields_skip_author_join_and_body(self):
+        response, queries = self._captured("/api/forum/threads/", {"fields": "title"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()["results"][0]), {"id", "title"})
+        thread_sql = next(sql for sql in queries if 'FROM "forum_forumthread"' in sql and "LIMIT" in sql)
+        self.assertNotIn('"body"', thread_sql)
+        self.assertNotIn("auth_user", thread_sql)
+
+    def test_profile_exclude_skips_nested_queries(self):
+        response, queries = self._captured(
+            "/api/profile/", {"exclude": "history,history_total,history_has_next,achievements"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertNotIn("history", payload)
+        self.assertEqual(payload["username"], "sparse")
+        self.assertFalse(any("profiles_userracehistory" in sql for sql in queries))
+        self.assertFalse(any("profiles_runnerachievement" in sql for sql in queries))
+
+
+class FastJSONRendererTests(TestCase):
+    """Tests for core.renderers and the JSON compression middleware."""
+
+    def setUp(self):
+        import uuid
+
+        self.payload = {
+            "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "created_at": timezone.now(),
+            "start_date": timezone.localdate(),
+            "distance_km": Decimal("21.10"),
+            "title": "Lari Pagi — Bandung  ",
+            "tags": ("road", "night"),
+            "nested": [{"count": 3, "ratio": 0.25, "flag": None}],
+            7: "int key",
+        }
+
+    def test_renderer_matches_drf_json_renderer(self):
+        from rest_framework.renderers import JSONRenderer
+        from core.renderers import FastJSONRenderer
+
+        self.assertEqual(FastJSONRenderer().render(self.payload), JSONRenderer().render(self.payload))
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    def test_stdlib_fallback_matches_fast_path(self):
+        from core import renderers
+
+        fast = renderers.dumps(self.payload)
+        with patch.object(renderers, "orjson", None):
+            self.assertEqual(renderers.dumps(self.payload), fast)
+        self.assertEqual(renderers.dumps({"big": 2 ** 70}), b'{"big":1180591620717411303424}')
+
+    def test_indented_output_uses_stock_renderer(self):
+        from rest_framework.renderers import JSONRenderer
+        from core.renderers import FastJSONRenderer
+
+        media_type = "application/json; indent=2"
+        self.assertEqual(
+            FastJSONRenderer().render(self.payload, media_type),
+            JSONRenderer().render(self.payload, media_type),
+        )
+
+    def test_json_response_stays_ascii_and_equivalent(self):
+        import json
+        from django.http import JsonResponse
+        from core.renderers import FastJsonResponse
+
+        response = FastJsonResponse(self.payload)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertTrue(response.content.isascii())
+        self.assertEqual(response.content, JsonResponse(self.payload).content)
+        self.assertEqual(json.loads(response.content), json.loads(JsonResponse(self.payload).content))
+        with self.assertRaises(TypeError):
+            FastJsonResponse(["not", "a", "dict"])
+
+    def test_form_errors_and_floats_match_stdlib_encoders(self):
+        from django import forms
+        from django.http import JsonResponse
+        from django.utils.safestring import mark_safe
+        from rest_framework.renderers import JSONRenderer
+        from core.renderers import FastJSONRenderer, FastJsonResponse
+
+        class NumberForm(forms.Form):
+            number = forms.IntegerField()
+            email = forms.EmailField()
+
+        form = NumberForm({"number": "x", "email": "y"})
+        self.assertFalse(form.is_valid())
+        payload = {
+            "errors": form.errors,
+            "label": mark_safe("<b>Done</b>"),
+            "status": Event.Status.COMPLETED,
+            "floats": [1e16, 1e-7, 0.0001, 123456789012345.6],
+            "text": 'say "hi", then: bye \\',
+        }
+        rendered = FastJsonResponse(payload).content
+        self.assertIn(b'"number": ["Enter a whole number."]', rendered)
+        self.assertEqual(rendered, JsonResponse(payload).content)
+        self.assertEqual(FastJSONRenderer().render(payload), JSONRenderer().render(payload))
+        # Without exponents or escaped quotes the orjson output itself is used.
+        del payload["floats"]
+        payload["text"] = "a, b: c"
+        self.assertEqual(FastJsonResponse(payload).content, JsonResponse(payload).content)
+        self.assertEqual(FastJSONRenderer().render(payload), JSONRenderer().render(payload))
+
+    def test_non_finite_floats_are_written_as_null(self):
+        from django.http import JsonResponse
+        from rest_framework.renderers import JSONRenderer
+        from core import renderers
+        from core.renderers import FastJSONRenderer, FastJsonResponse
+
+        if renderers.orjson is None:
+            self.skipTest("orjson is not installed")
+
+        payload = {"values": [float("nan"), float("inf"), -float("inf"), 1.5]}
+        self.assertEqual(FastJsonResponse(payload).content, b'{"values": [null, null, null, 1.5]}')
+        self.assertEqual(JsonResponse(payload).content, b'{"values": [NaN, Infinity, -Infinity, 1.5]}')
+        self.assertEqual(FastJSONRenderer().render(payload), b'{"values":[null,null,null,1.5]}')
+        with self.assertRaises(ValueError):
+            JSONRenderer().render(payload)
+
+    def test_large_json_is_compressed(self):
+        import gzip
+        from django.http import HttpResponse
+        from core.middleware import JSONCompressionMiddleware
+        from core.renderers import FastJsonResponse
+
+        body = {"results": [{"title": "Event %d" % i} for i in range(200)]}
+        middleware = JSONCompressionMiddleware(lambda request: FastJsonResponse(body))
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip, deflate")
+        response = middleware(request)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(gzip.decompress(response.content), FastJsonResponse(body).content)
+
+        small = JSONCompressionMiddleware(lambda request: FastJsonResponse({"ok": True}))(request)
+        self.assertFalse(small.has_header("Content-Encoding"))
+        html = JSONCompressionMiddleware(lambda request: HttpResponse("x" * 5000))(request)
+        self.assertFalse(html.has_header("Content-Encoding"))
+
+    def test_responses_that_may_hold_secrets_are_not_compressed(self):
+        from django.middleware.csrf import get_token
+        from django.utils.cache import add_never_cache_headers
+        from core.middleware import JSONCompressionMiddleware
+        from core.renderers import FastJsonResponse
+
+        body = {"results": [{"title": "Event %d" % i} for i in range(200)]}
+
+        def with_cookie(request):
+            response = FastJsonResponse(body)
+            response.set_cookie("sessionid", "secret")
+            return response
+
+        def with_csrf_token(request):
+            return FastJsonResponse({**body, "csrf": get_token(request)})
+
+        def never_cached(request):
+            response = FastJsonResponse(body)
+            add_never_cache_headers(response)
+            return response
+
+        for view in (with_cookie, with_csrf_token, never_cached):
+            request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip, br")
+            self.assertFalse(JSONCompressionMiddleware(view)(request).has_header("Content-Encoding"), view.__name__)
+        self.assertEqual(self.client.post(reverse("core_api:api_login"))["Cache-Control"].count("no-store"), 1)
+
+
+class StaticPipelineTests(TestCase):
+    """Tests for the fingerprinted, precompressed static build and its deploy check."""
+
+    def setUp(self):
+        import shutil
+        import tempfile
+
+        from django.conf import settings
+        from django.test import override_settings
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.source = f"{tmp.name}/src"
+        self.root = f"{tmp.name}/root"
+        shutil.copytree(settings.BASE_DIR / "static", self.source)
+        override = override_settings(
+            STATICFILES_DIRS=[self.source],
+            STATIC_ROOT=self.root,
+            STORAGES={
+                **settings.STORAGES,
+                "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
+            },
+            WHITENOISE_AUTOREFRESH=False,
+            WHITENOISE_USE_FINDERS=False,
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def _collect(self):
+        from django.core.management import call_command
+
+        call_command("collectstatic", interactive=False, verbosity=0)
+
+    def _check_ids(self):
+        from core.checks import check_static_manifest
+
+        return [message.id for message in check_static_manifest(None)]
+
+    def test_build_serves_hashed_precompressed_immutable_assets(self):
+        import os
+
+        from django.templatetags.static import static
+
+        self.assertEqual(self._check_ids(), ["core.E001"])
+        self._collect()
+        self.assertEqual(self._check_ids(), [])
+
+        url = static("css/base.css")
+        self.assertRegex(url, r"^/static/css/base\.[0-9a-f]{12}\.css$")
+        self.assertTrue(os.path.exists(f"{self.root}{url.removeprefix('/static')}.gz"))
+
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], "max-age=315360000, public, immutable")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+    def test_check_flags_stale_and_broken_builds(self):
+        import os
+
+        from django.contrib.staticfiles.storage import staticfiles_storage
+
+        self._collect()
+        with open(f"{self.source}/js/new.js", "w") as handle:
+            handle.write("console.log('new');\n")
+        os.remove(staticfiles_storage.path(staticfiles_storage.stored_name("js/main.js")))
+
+        with patch("core.checks._template_static_paths", return_value={"css/missing.css": "base.html"}):
+            self.assertEqual(sorted(self._check_ids()), ["core.E002", "core.E003", "core.W001"])
+
+    def test_check_scans_app_templates(self):
+        from core.checks import _template_static_paths
+
+        paths = _template_static_paths()
+        self.assertIn("css/base.css", paths)
+        # Only used by events/templates (APP_DIRS), not the project templates dir.
+        self.assertIn("events/templates", paths["css/events.css"])
+
+    def test_check_warns_when_uploads_are_not_served(self):
+        from django.test import override_settings
+
+        from core.checks import check_media_serving
+
+        with override_settings(DEBUG=False, SERVE_MEDIA=False, MEDIA_URL="/media/"):
+            self.assertEqual([message.id for message in check_media_serving(None)], ["core.W002"])
+        with override_settings(DEBUG=False, SERVE_MEDIA=True, MEDIA_URL="/media/"):
+            self.assertEqual(check_media_serving(None), [])
+        with override_settings(DEBUG=False, SERVE_MEDIA=False, MEDIA_URL="https://cdn.example.com/media/"):
+            self.assertEqual(check_media_serving(None), [])
+
+
+class BenchmarkRequestsCommandTests(TestCase):
+    """Tests for the benchmark_requests management command."""
+
+    def test_reports_throughput_for_configured_database(self):
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        out = StringIO()
+        call_command("benchmark_requests", "--path", "/api/events/", "--requests", "3", "--warmup", "0", stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[0], "sqlite3 CONN_MAX_AGE=0 pool=off")
+        self.assertRegex(lines[1], r"^[\d.]+ req/s over 3 requests \(1 threads\); p50 [\d.]+ ms, p95 [\d.]+ ms$")
+
+    def test_rejects_failing_endpoint(self):
+        from django.core.management import CommandError, call_command
+
+        with self.assertRaisesMessage(CommandError, "answered 404"):
+            call_command("benchmark_requests", "--path", "/no-such-page/", "--requests", "1")
+
+
+class TwoTierCacheTests(TestCase):
+    """Tests for the in-process LRU + shared backend cache."""
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+
+    def _workers(self, **kwargs):
+        from core.cache import TwoTierCache
+
+        # Two instances over the same locmem backend stand in for two gunicorn workers.
+        return TwoTierCache("test", **kwargs), TwoTierCache("test", **kwargs)
+
+    def test_builder_runs_once_and_second_worker_reads_shared_tier(self):
+        first, second = self._workers()
+        calls = []
+
+        def build():
+            calls.append(1)
+            return {"value": len(calls)}
+
+        self.assertEqual(first.get_or_set("doc", build), {"value": 1})
+        self.assertEqual(first.get_or_set("doc", build), {"value": 1})
+        self.assertEqual(second.get_or_set("doc", build), {"value": 1})
+        self.assertEqual(len(calls), 1)
+
+    def test_none_is_cached(self):
+        cache, _ = self._workers()
+        calls = []
+        for _ in range(2):
+            self.assertIsNone(cache.get_or_set("missing", lambda: calls.append(1)))
+        self.assertEqual(len(calls), 1)
+
+    def test_invalidation_reaches_other_workers_after_version_ttl(self):
+        first, second = self._workers(version_ttl=60)
+        first.set("doc", "old", scope=7)
+        self.assertEqual(second.get("doc", scope=7), "old")
+
+        first.invalidate(7)
+        self.assertIsNone(first.get("doc", scope=7))
+        # The other worker trusts its copy of the version until it expires.
+        self.assertEqual(second.get("doc", scope=7), "old")
+        with patch("core.cache.time.monotonic", return_value=time.monotonic() + 61):
+            self.assertIsNone(second.get("doc", scope=7))
+
+    def test_scoped_invalidation_leaves_other_scopes(self):
+        cache, _ = self._workers()
+        cache.set("doc", "a", scope=1)
+        cache.set("doc", "b", scope=2)
+        cache.invalidate(1)
+        self.assertIsNone(cache.get("doc", scope=1))
+        self.assertEqual(cache.get("doc", scope=2), "b")
+
+        cache.invalidate()
+        self.assertIsNone(cache.get("doc", scope=2))
+
+    def test_local_tier_is_bounded(self):
+        from django.core.cache import cache as shared
+
+        local, _ = self._workers(maxsize=2)
+        for key in ("a", "b", "c"):
+            local.set(key, key)
+        self.assertEqual(len(local.local), 2)
+        # The evicted entry is still served from the shared tier.
+        shared_calls = []
+        original_get = shared.get
+        with patch.object(shared, "get", side_effect=lambda *a, **kw: shared_calls.append(a[0]) or original_get(*a, **kw)):
+            self.assertEqual(local.get("a"), "a")
+            self.assertEqual(local.get("c"), "c")
+        self.assertEqual(len(shared_calls), 1)
+        self.assertTrue(shared_calls[0].endswith(":a"))
+
+
+class EventCacheTests(TestCase):
+    """Cached event and category lookups are invalidated on writes."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from core.cache import TwoTierCache
+
+        cache.clear()
+        TwoTierCache.clear_all_local()
+        self.today = timezone.localdate()
+        self.event = Event.objects.create(
+            title="Cached Run",
+            city="Bandung",
+            start_date=self.today + timedelta(days=30),
+            registration_deadline=self.today + timedelta(days=20),
+        )
+
+    def test_summary_is_served_from_cache_until_saved(self):
+        url = reverse("events_api:detail", args=[self.event.id])
+        self.assertEqual(self.client.get(url).json()["title"], "Cached Run")
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+        self.event.title = "Renamed Run"
+        self.event.save()
+        self.assertEqual(self.client.get(url).json()["title"], "Renamed Run")
+
+    def test_missing_event_is_404(self):
+        url = reverse("events_api:detail", args=[self.event.id + 1000])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_category_changes_invalidate_cached_events(self):
+        from events.cache import get_categories, get_event
+
+        self.assertEqual(list(get_event(self.event.id).categories.all()), [])
+        before = get_categories()
+        category = EventCategory.objects.create(name="cache-7k", distance_km=Decimal("7.00"), display_name="Cache 7K")
+        self.assertEqual(len(get_categories()), len(before) + 1)
+        self.event.categories.add(category)
+        self.assertEqual(list(get_event(self.event.id).categories.all()), [category])
+
+        category.display_name = "Cache 7K Fun Run"
+        category.save()
+        self.assertIn("Cache 7K Fun Run", [c.display_name for c in get_categories()])
+        self.assertEqual(get_event(self.event.id).categories.all()[0].display_name, "Cache 7K Fun Run")
+
+    def test_registration_counter_update_invalidates_event(self):
+        from events.cache import get_event
+        from registrations.models import EventRegistration
+
+        self.assertEqual(get_event(self.event.id).registered_count, 0)
+        user = User.objects.create_user(username="cache-runner", password="pw")
+        EventRegistration.objects.create(
+            user=user, event=self.event, phone_number="0812", emergency_contact_name="A", emergency_contact_phone="0813"
+        )
+        EventRegistration.refresh_event_counters([self.event.id])
+        self.assertEqual(get_event(self.event.id).registered_count, 1)
+
+
+class SlugAllocationTests(TestCase):
+    """Slugs are allocated from a single collision query and retried on conflicts."""
+
+    def setUp(self):
+        self.today = timezone.localdate()
+        self.author = User.objects.create_user(username="slugger", password="pw")
+
+    def _event(self, title):
+        return Event(
+            title=title,
+            city="Jakarta",
+            start_date=self.today + timedelta(days=30),
+            registration_deadline=self.today + timedelta(days=20),
+        )
+
+    def _slug_queries(self, ctx, table):
+        return [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("SELECT") and f'"{table}"."slug"' in q["sql"]]
+
+    def test_next_suffix_comes_from_one_query(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        for _ in range(3):
+            self._event("Jakarta Marathon").save()
+        self._event("Jakarta Marathon Club").save()
+
+        event = self._event("Jakarta Marathon")
+        with CaptureQueriesContext(connection) as ctx:
+            event.save()
+        self.assertEqual(event.slug, "jakarta-marathon-3")
+        self.assertEqual(len(self._slug_queries(ctx, "events_event")), 1)
+
+    def test_suffix_follows_highest_taken(self):
+        first = self._event("Bromo 100")
+        first.save()
+        self._event("Bromo 100").save()
+        first.delete()
+        event = self._event("Bromo 100")
+        event.save()
+        self.assertEqual(event.slug, "bromo-100-2")
+
+    def test_retries_when_slug_is_taken_concurrently(self):
+        from core import slugs
+
+        self._event("Race Day").save()
+        real = slugs._collisions
+        calls = []
+
+        def stale_then_real(model, bases, exclude_pk=None):
+            calls.append(1)
+            # The first read misses the row a concurrent request just inserted.
+            return dict.fromkeys(bases, -1) if len(calls) == 1 else real(model, bases, exclude_pk)
+
+        event = self._event("Race Day")
+        with patch("core.slugs._collisions", side_effect=stale_then_real):
+            event.save()
+        self.assertEqual(event.slug, "race-day-1")
+        self.assertEqual(len(calls), 2)
+
+    def test_bulk_create_assigns_consecutive_suffixes(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from core.slugs import bulk_create_with_slugs
+        from forum.models import ForumThread
+
+        event = self._event("Forum Host")
+        event.save()
+        ForumThread.objects.create(event=event, author=self.author, title="Training tips", body="x")
+        threads = [
+            ForumThread(event=event, author=self.author, title=title, body="x")
+            for title in ("Training tips", "Gear", "Training tips", "")
+        ]
+        with CaptureQueriesContext(connection) as ctx:
+            bulk_create_with_slugs(ForumThread, threads, ForumThread.slug_base)
+        self.assertEqual(
+            [thread.slug for thread in threads], ["training-tips-1", "gear", "training-tips-2", "thread"]
+        )
+        self.assertEqual(len(self._slug_queries(ctx, "forum_forumthread")), 1)
+
+    def test_many_bases_are_queried_in_chunks(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from core.slugs import COLLISION_QUERY_CHUNK, assign_slugs
+        from forum.models import ForumThread
+
+        event = self._event("Forum Host")
+        event.save()
+        ForumThread.objects.create(event=event, author=self.author, title="Topic 2499", body="x")
+        threads = [ForumThread(event=event, author=self.author, title=f"Topic {n}", body="x") for n in range(2500)]
+        with CaptureQueriesContext(connection) as ctx:
+            assign_slugs(ForumThread, threads, ForumThread.slug_base)
+        self.assertEqual(threads[0].slug, "topic-0")
+        self.assertEqual(threads[-1].slug, "topic-2499-1")
+        self.assertEqual(len(self._slug_queries(ctx, "forum_forumthread")), -(-2500 // COLLISION_QUERY_CHUNK))
@@ -60,13 +60,13 @@ class HomeView(TemplateView):
     def _get_highlight_event(self, events_qs, today):
         upcoming = events_qs.filter(
             status__in=[Event.Status.UPCOMING, Event.Status.ONGOING],
-        ).order_by("start_date", "-popularity_score")
+        ).order_by("start_date", *Event.POPULARITY_ORDERING)
         highlight = upcoming.first()
         if highlight:
             return highlight
         fallback = (
             events_qs.filter(start_date__lte=today)
-            .order_by("-start_date", "-popularity_score")
+            .order_by("-start_date", *Event.POPULARITY_ORDERING)
             .first()
         )
         return fallback or events_qs.first()
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import AidStation, EventDocument, EventSchedule, RouteSegment
+from .models import AidStation, EventDocument, EventSchedule, RouteSegment, RouteTrack
 
 
 class ScheduleInline(admin.TabularInline):
@@ -45,3 +45,10 @@ class EventDocumentAdmin(admin.ModelAdmin):
     list_display = ("title", "event", "document_type", "uploaded_at")
     list_filter = ("document_type", "event")
     search_fields = ("title", "event__title")
+
+
+@admin.register(RouteTrack)
+class RouteTrackAdmin(admin.ModelAdmin):
+    list_display = ("document", "distance_km", "point_count", "updated_at")
+    search_fields = ("document__title", "document__event__title")
+    readonly_fields = ("distance_km", "point_count", "polylines", "elevation", "source_size", "source_mtime", "updated_at")
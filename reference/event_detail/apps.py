@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class EventDetailConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'event_detail'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,246 @@
+import math
+from decimal import Decimal
+from pathlib import Path
+from typing import IO, Iterator, Optional
+from urllib.parse import unquote, urlparse
+from xml.etree import ElementTree
+
+from django.conf import settings
+
+from .models import EventDocument, RouteTrack
+
+# Zoom level -> Douglas-Peucker tolerance in metres. Each level is simplified
+# from the previous (finer) one, so order matters.
+ZOOM_TOLERANCES = {
+    "detail": 5,
+    "medium": 25,
+    "overview": 100,
+}
+ELEVATION_SAMPLES = 200
+_POINT_TAGS = {"trkpt", "rtept"}
+_METRES_PER_DEGREE_LAT = 110_540
+_METRES_PER_DEGREE_LON = 111_320
+_EARTH_RADIUS_M = 6_371_000
+
+
+class GPXError(ValueError):
+    """The document is not a readable GPX file."""
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _finite(text: str, name: str) -> float:
+    value = float(text)
+    if not math.isfinite(value):
+        raise ValueError(f"{name} is not a finite number: {text.strip()}")
+    return value
+
+
+def iter_track_points(stream: IO[bytes]) -> Iterator[tuple[float, float, Optional[float]]]:
+    """
+    Yield ``(lat, lon, elevation)`` for every track/route point of a GPX file.
+
+    Parsed incrementally with ``iterparse``; each point is dropped from the
+    tree once read, so memory stays flat however long the file is.
+    """
+    stack = []
+    try:
+        for event, element in ElementTree.iterparse(stream, events=("start", "end")):
+            if event == "start":
+                stack.append(element)
+                continue
+            stack.pop()
+            if _local_name(element.tag) not in _POINT_TAGS:
+                continue
+            elevation = None
+            for child in element:
+                if _local_name(child.tag) == "ele" and child.text:
+                    elevation = _finite(child.text, "ele")
+            latitude, longitude = _finite(element.attrib["lat"], "lat"), _finite(element.attrib["lon"], "lon")
+            if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+                raise ValueError(f"coordinates out of range: {latitude}, {longitude}")
+            yield latitude, longitude, elevation
+            if stack:
+                # The point just closed is always its parent's last child.
+                del stack[-1][-1]
+    except (ElementTree.ParseError, KeyError, ValueError) as exc:
+        raise GPXError(f"Invalid GPX: {exc}") from None
+
+
+def haversine_m(a, b) -> float:
+    lat1, lon1, lat2, lon2 = map(math.radians, (a[0], a[1], b[0], b[1]))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * _EARTH_RADIUS_M * math.asin(math.sqrt(h))
+
+
+def _segment_distance_sq(p, a, b) -> float:
+    """Squared distance from ``p`` to segment ``ab`` in projected metres."""
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    if dx or dy:
+        t = ((p[0] - a[0]) * dx + (p[1] - a[1]) * dy) / (dx * dx + dy * dy)
+        t = min(max(t, 0.0), 1.0)
+        x, y = a[0] + t * dx, a[1] + t * dy
+    else:
+        x, y = a
+    return (p[0] - x) ** 2 + (p[1] - y) ** 2
+
+
+def simplify(points: list, tolerance_m: float) -> list:
+    """
+    Douglas-Peucker simplification of ``(lat, lon, ...)`` points.
+
+    Points are projected to local metres (equirectangular around the first
+    point, accurate enough for race-sized tracks) and the split stack is
+    iterative, so long tracks cannot hit the recursion limit.
+    """
+    if len(points) < 3:
+        return list(points)
+    lon_scale = _METRES_PER_DEGREE_LON * math.cos(math.radians(points[0][0]))
+    projected = [(p[1] * lon_scale, p[0] * _METRES_PER_DEGREE_LAT) for p in points]
+    tolerance_sq = tolerance_m * tolerance_m
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        worst, worst_index = 0.0, None
+        for index in range(first + 1, last):
+            distance = _segment_distance_sq(projected[index], projected[first], projected[last])
+            if distance > worst:
+                worst, worst_index = distance, index
+        if worst_index is not None and worst > tolerance_sq:
+            keep[worst_index] = True
+            stack.append((first, worst_index))
+            stack.append((worst_index, last))
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def _radial_filter(points: Iterator, min_distance_m: float) -> list:
+    """Drop points closer than ``min_distance_m`` to the last kept one (cheap pre-pass)."""
+    kept = []
+    for point in points:
+        if not kept or haversine_m(kept[-1], point) >= min_distance_m:
+            kept.append(point)
+    if kept and kept[-1] is not point:
+        kept.append(point)
+    return kept
+
+
+def encode_polyline(points) -> str:
+    """Google encoded-polyline (precision 5) of ``(lat, lon, ...)`` points."""
+    chunks = []
+    previous = (0, 0)
+    for point in points:
+        current = (round(point[0] * 1e5), round(point[1] * 1e5))
+        for delta in (current[0] - previous[0], current[1] - previous[1]):
+            value = ~(delta << 1) if delta < 0 else delta << 1
+            while value >= 0x20:
+                chunks.append(chr((0x20 | (value & 0x1F)) + 63))
+                value >>= 5
+            chunks.append(chr(value + 63))
+        previous = current
+    return "".join(chunks)
+
+
+def elevation_series(points: list, samples: int = ELEVATION_SAMPLES) -> tuple[float, list]:
+    """
+    Total distance (km) and ``[km, metres]`` pairs at ``samples`` evenly spaced
+    distances, linearly interpolated between track points.
+    """
+    distances = [0.0]
+    for previous, point in zip(points, points[1:]):
+        distances.append(distances[-1] + haversine_m(previous, point))
+    total = distances[-1] if points else 0.0
+    profiled = [(distance, point[2]) for distance, point in zip(distances, points) if point[2] is not None]
+    if not profiled or total <= 0:
+        return total / 1000, []
+
+    series, cursor = [], 0
+    for step in range(samples + 1):
+        target = total * step / samples
+        while cursor < len(profiled) - 1 and profiled[cursor + 1][0] < target:
+            cursor += 1
+        (d0, e0), (d1, e1) = profiled[cursor], profiled[min(cursor + 1, len(profiled) - 1)]
+        elevation = e0 if d1 <= d0 else e0 + (e1 - e0) * min(max((target - d0) / (d1 - d0), 0.0), 1.0)
+        series.append([round(target / 1000, 3), round(elevation, 1)])
+    return total / 1000, series
+
+
+def parse_track(stream: IO[bytes]) -> dict:
+    """RouteTrack field values (distance, polylines per zoom level, elevation) for a GPX stream."""
+    finest = min(ZOOM_TOLERANCES.values())
+    points = _radial_filter(iter_track_points(stream), finest / 2)
+    if len(points) < 2:
+        raise GPXError("GPX file has fewer than two track points.")
+    distance_km, elevation = elevation_series(points)
+
+    polylines = {}
+    simplified = points
+    for level, tolerance in sorted(ZOOM_TOLERANCES.items(), key=lambda item: item[1]):
+        simplified = simplify(simplified, tolerance)
+        polylines[level] = encode_polyline(simplified)
+    return {
+        "distance_km": Decimal(str(round(distance_km, 2))),
+        "point_count": len(points),
+        "polylines": polylines,
+        "elevation": elevation,
+    }
+
+
+def media_path(document: EventDocument) -> Optional[Path]:
+    """Local file behind ``document_url`` when it points into MEDIA_ROOT, else ``None``."""
+    media_prefix = urlparse(settings.MEDIA_URL).path.strip("/") + "/"
+    url_path = unquote(urlparse(document.document_url).path).lstrip("/")
+    if not url_path.startswith(media_prefix):
+        return None
+    root = Path(settings.MEDIA_ROOT).resolve()
+    path = (root / url_path[len(media_prefix):]).resolve()
+    if not path.is_relative_to(root) or not path.is_file():
+        return None
+    return path
+
+
+def ingest_gpx(document: EventDocument, *, force: bool = False) -> Optional[RouteTrack]:
+    """
+    Parse a GPX document from MEDIA_ROOT into its RouteTrack.
+
+    Skipped (returning the stored track) when the file's size and mtime are
+    unchanged, unless ``force`` is set. Returns ``None`` for documents that
+    are not GPX files in MEDIA_ROOT.
+    """
+    if document.document_type != EventDocument.DocumentType.GPX:
+        return None
+    path = media_path(document)
+    if path is None:
+        return None
+    stat = path.stat()
+    track = RouteTrack.objects.filter(document=document).first()
+    if track and not force and (track.source_size, track.source_mtime) == (stat.st_size, stat.st_mtime_ns):
+        return track
+    with path.open("rb") as stream:
+        values = parse_track(stream)
+    track, _ = RouteTrack.objects.update_or_create(
+        document=document,
+        defaults={**values, "source_size": stat.st_size, "source_mtime": stat.st_mtime_ns},
+    )
+    return track
+
+
+def serialize_route_track(event) -> Optional[dict]:
+    """The compact track of the event's first ingested GPX document (uses prefetched documents)."""
+    for document in event.documents.all():
+        if document.document_type != EventDocument.DocumentType.GPX:
+            continue
+        try:
+            track = document.route_track
+        except RouteTrack.DoesNotExist:
+            continue
+        return {
+            "document": document.id,
+            "distance_km": float(track.distance_km),
+            "polylines": track.polylines,
+            "elevation": track.elevation,
+        }
+    return None
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from event_detail.gpx import GPXError, ingest_gpx
+from event_detail.models import EventDocument
+
+
+class Command(BaseCommand):
+    help = "Parse GPX documents stored in MEDIA_ROOT into compact route tracks."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--event",
+            action="append",
+            help="Only ingest documents of this event id or slug (repeatable; default: every event).",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-parse files even when their size and modification time are unchanged.",
+        )
+
+    def handle(self, *args, **options):
+        documents = EventDocument.objects.filter(document_type=EventDocument.DocumentType.GPX).order_by("pk")
+        events = options.get("event")
+        if events:
+            ids = [int(ref) for ref in events if ref.isdigit()]
+            slugs = [ref for ref in events if not ref.isdigit()]
+            documents = documents.filter(event_id__in=ids) | documents.filter(event__slug__in=slugs)
+
+        ingested = skipped = failed = 0
+        for document in documents:
+            try:
+                track = ingest_gpx(document, force=options["force"])
+            except GPXError as exc:
+                failed += 1
+                self.stderr.write(f"{document.document_url}: {exc}")
+                continue
+            if track is None:
+                skipped += 1
+            else:
+                ingested += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Ingested {ingested} GPX documents ({skipped} not in MEDIA_ROOT, {failed} failed).")
+        )
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event_detail', '0001_initial'),
+        ('events', '0003_seed_event_categories'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RouteProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_distance_km', models.DecimalField(decimal_places=2, default=0, max_digits=7)),
+                ('total_elevation_gain', models.PositiveIntegerField(default=0)),
+                ('distance_prefix', models.JSONField(default=list)),
+                ('elevation_prefix', models.JSONField(default=list)),
+                ('segments', models.JSONField(default=list)),
+                ('aid_markers', models.JSONField(default=list)),
+                ('aid_stations', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='route_profile', to='events.event')),
+            ],
+        ),
+    ]
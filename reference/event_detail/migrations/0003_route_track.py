@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event_detail', '0002_route_profile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RouteTrack',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('distance_km', models.DecimalField(decimal_places=2, default=0, max_digits=7)),
+                ('point_count', models.PositiveIntegerField(default=0, help_text='Track points kept before simplification.')),
+                ('polylines', models.JSONField(default=dict, help_text='Zoom level -> encoded polyline.')),
+                ('elevation', models.JSONField(default=list, help_text='[km, metres] pairs.')),
+                ('source_size', models.PositiveBigIntegerField(default=0)),
+                ('source_mtime', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('document', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='route_track', to='event_detail.eventdocument')),
+            ],
+        ),
+    ]
@@ -74,3 +74,45 @@ class EventDocument(models.Model):
 
     def __str__(self) -> str:
         return f"{self.title} ({self.get_document_type_display()})"
+
+
+class RouteProfile(models.Model):
+    """
+    Cumulative route profile of an event, rebuilt whenever its segments or
+    aid stations change.
+
+    ``distance_prefix`` and ``elevation_prefix`` are prefix sums over the
+    ordered route segments (``n + 1`` entries, starting at 0), and
+    ``aid_markers`` holds the sorted aid-station kilometer markers, so a
+    kilometer can be located with a binary search instead of a walk over
+    the route.
+    """
+
+    event = models.OneToOneField(Event, on_delete=models.CASCADE, related_name="route_profile")
+    total_distance_km = models.DecimalField(max_digits=7, decimal_places=2, default=0)
+    total_elevation_gain = models.PositiveIntegerField(default=0)
+    distance_prefix = models.JSONField(default=list)
+    elevation_prefix = models.JSONField(default=list)
+    segments = models.JSONField(default=list)
+    aid_markers = models.JSONField(default=list)
+    aid_stations = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.event.title} route profile"
+
+
+class RouteTrack(models.Model):
+    """Compact track parsed from a GPX document: polylines per zoom level and an elevation series."""
+
+    document = models.OneToOneField(EventDocument, on_delete=models.CASCADE, related_name="route_track")
+    distance_km = models.DecimalField(max_digits=7, decimal_places=2, default=0)
+    point_count = models.PositiveIntegerField(default=0, help_text="Track points kept before simplification.")
+    polylines = models.JSONField(default=dict, help_text="Zoom level -> encoded polyline.")
+    elevation = models.JSONField(default=list, help_text="[km, metres] pairs.")
+    source_size = models.PositiveBigIntegerField(default=0)
+    source_mtime = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.document.title} track"
@@ -0,0 +1,126 @@
+from bisect import bisect_left
+from decimal import Decimal
+from typing import Optional
+
+from events.models import Event
+from .models import AidStation, RouteProfile, RouteSegment
+
+
+def build_route_profile(event_id: int) -> dict:
+    """RouteProfile field values for ``event_id``, computed in two queries."""
+    distance_prefix, elevation_prefix = [0.0], [0]
+    total_distance, total_elevation = Decimal("0"), 0
+    segments = []
+    for segment in RouteSegment.objects.filter(event_id=event_id).order_by("order").only(
+        "id", "order", "title", "distance_km", "elevation_gain"
+    ):
+        # Sum in Decimal so long routes do not accumulate float error.
+        total_distance += segment.distance_km
+        total_elevation += segment.elevation_gain
+        distance_prefix.append(float(total_distance))
+        elevation_prefix.append(total_elevation)
+        segments.append(
+            {
+                "id": segment.id,
+                "order": segment.order,
+                "title": segment.title,
+                "distance_km": float(segment.distance_km),
+                "elevation_gain": segment.elevation_gain,
+            }
+        )
+
+    aid_markers, aid_stations = [], []
+    for station in AidStation.objects.filter(event_id=event_id).order_by("kilometer_marker", "id"):
+        aid_markers.append(float(station.kilometer_marker))
+        aid_stations.append(
+            {
+                "id": station.id,
+                "name": station.name,
+                "kilometer_marker": float(station.kilometer_marker),
+                "supplies": station.supplies,
+                "is_medical": station.is_medical,
+            }
+        )
+
+    return {
+        "total_distance_km": total_distance,
+        "total_elevation_gain": total_elevation,
+        "distance_prefix": distance_prefix,
+        "elevation_prefix": elevation_prefix,
+        "segments": segments,
+        "aid_markers": aid_markers,
+        "aid_stations": aid_stations,
+    }
+
+
+def refresh_route_profile(event_id: int) -> RouteProfile:
+    profile, _ = RouteProfile.objects.update_or_create(event_id=event_id, defaults=build_route_profile(event_id))
+    return profile
+
+
+def route_profile_for(event: Event) -> RouteProfile:
+    """The stored profile of ``event``, built on first use for events that predate it."""
+    try:
+        return event.route_profile
+    except RouteProfile.DoesNotExist:
+        return refresh_route_profile(event.pk)
+
+
+def serialize_route_profile(profile: RouteProfile) -> dict:
+    """Cumulative view of the route: where each segment starts and ends, and the climb so far."""
+    return {
+        "total_distance_km": float(profile.total_distance_km),
+        "total_elevation_gain": profile.total_elevation_gain,
+        "segments": [
+            {
+                **segment,
+                "start_km": profile.distance_prefix[index],
+                "end_km": profile.distance_prefix[index + 1],
+                "elevation_gain_before": profile.elevation_prefix[index],
+                "elevation_gain_after": profile.elevation_prefix[index + 1],
+            }
+            for index, segment in enumerate(profile.segments)
+        ],
+    }
+
+
+def _next_station(profile: RouteProfile, km: float, *, medical: bool = False) -> Optional[dict]:
+    index = bisect_left(profile.aid_markers, km)
+    for station in profile.aid_stations[index:]:
+        if not medical or station["is_medical"]:
+            return {**station, "distance_to_go_km": round(station["kilometer_marker"] - km, 3)}
+    return None
+
+
+def locate(profile: RouteProfile, km: float) -> dict:
+    """
+    Resolve kilometer ``km`` to its route segment and the next aid stations.
+
+    The segment is the first one whose cumulative end is at or past ``km``
+    (a segment boundary belongs to the segment it closes), found by bisecting
+    ``distance_prefix``. Climb so far is interpolated linearly within the
+    segment. ``segment`` is ``None`` past the end of the route.
+    """
+    ends = profile.distance_prefix[1:]
+    index = bisect_left(ends, km)
+    segment = None
+    elevation = profile.elevation_prefix[-1] if profile.elevation_prefix else 0
+    if index < len(ends):
+        start, end = profile.distance_prefix[index], ends[index]
+        fraction = (km - start) / (end - start) if end > start else 1.0
+        gain = profile.elevation_prefix[index + 1] - profile.elevation_prefix[index]
+        elevation = profile.elevation_prefix[index] + gain * max(fraction, 0.0)
+        segment = {
+            **profile.segments[index],
+            "start_km": start,
+            "end_km": end,
+            "distance_into_segment_km": round(max(km - start, 0.0), 3),
+        }
+    return {
+        "km": km,
+        "total_distance_km": float(profile.total_distance_km),
+        "segment": segment,
+        "elevation_gain_so_far": round(elevation),
+        "next_aid_station": _next_station(profile, km),
+        "next_medical_station": _next_station(profile, km, medical=True),
+    }
@@ -0,0 +1,35 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from events.models import Event
+from .gpx import GPXError, ingest_gpx
+from .models import AidStation, EventDocument, RouteSegment, RouteTrack
+from .route import refresh_route_profile
+
+
+@receiver(post_save, sender=RouteSegment)
+@receiver(post_delete, sender=RouteSegment)
+@receiver(post_save, sender=AidStation)
+@receiver(post_delete, sender=AidStation)
+def refresh_event_route_profile(sender, instance, origin=None, **kwargs):
+    # Deleting the event takes the profile with it.
+    if isinstance(origin, Event) or getattr(origin, "model", None) is Event:
+        return
+    refresh_route_profile(instance.event_id)
+
+
+@receiver(post_save, sender=EventDocument)
+def ingest_gpx_document(sender, instance, **kwargs):
+    if instance.document_type != EventDocument.DocumentType.GPX:
+        RouteTrack.objects.filter(document=instance).delete()
+        return
+
+    def ingest():
+        try:
+            ingest_gpx(instance)
+        except GPXError:
+            # Keep the previous track; `manage.py ingest_gpx` surfaces the error.
+            pass
+
+    transaction.on_commit(ingest)
@@ -259,6 +259,84 @@ class RouteSegmentModelTests(TestCase):
         self.assertEqual(segment.elevation_gain, 0)
 
 
+class RouteProfileTests(TestCase):
+    """Tests for the precomputed route profile and the km lookup endpoint."""
+
+    def setUp(self):
+        self.today = timezone.localdate()
+        self.event = Event.objects.create(
+            title="Profile Marathon",
+            city="Jakarta",
+            start_date=self.today + timedelta(days=30),
+            registration_deadline=self.today + timedelta(days=20),
+        )
+        for order, (distance, gain) in enumerate([("5.00", 40), ("10.50", 120), ("6.60", 0)], start=1):
+            RouteSegment.objects.create(
+                event=self.event,
+                order=order,
+                title=f"Segment {order}",
+                description="",
+                distance_km=Decimal(distance),
+                elevation_gain=gain,
+            )
+        AidStation.objects.create(event=self.event, name="WS1", kilometer_marker=Decimal("5.00"), supplies="Water")
+        AidStation.objects.create(
+            event=self.event, name="Medic", kilometer_marker=Decimal("15.00"), supplies="Medical", is_medical=True
+        )
+        self.url = reverse("events_api:route-locate", args=[self.event.id])
+
+    def test_profile_is_refreshed_on_segment_changes(self):
+        from event_detail.models import RouteProfile
+
+        profile = RouteProfile.objects.get(event=self.event)
+        self.assertEqual(profile.distance_prefix, [0.0, 5.0, 15.5, 22.1])
+        self.assertEqual(profile.elevation_prefix, [0, 40, 160, 160])
+        self.assertEqual(profile.total_distance_km, Decimal("22.10"))
+        self.assertEqual(profile.aid_markers, [5.0, 15.0])
+
+        RouteSegment.objects.get(event=self.event, order=3).delete()
+        profile.refresh_from_db()
+        self.assertEqual(profile.distance_prefix, [0.0, 5.0, 15.5])
+        self.assertEqual(profile.total_elevation_gain, 160)
+
+    def test_locate_finds_segment_and_next_stations(self):
+        response = self.client.get(self.url, {"km": "10.25"})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["segment"]["order"], 2)
+        self.assertEqual(data["segment"]["start_km"], 5.0)
+        self.assertEqual(data["segment"]["distance_into_segment_km"], 5.25)
+        self.assertEqual(data["elevation_gain_so_far"], 100)
+        self.assertEqual(data["next_aid_station"]["name"], "Medic")
+        self.assertEqual(data["next_aid_station"]["distance_to_go_km"], 4.75)
+        self.assertEqual(data["next_medical_station"]["name"], "Medic")
+
+    def test_locate_boundaries(self):
+        data = self.client.get(self.url, {"km": "5"}).json()
+        self.assertEqual(data["segment"]["order"], 1)
+        self.assertEqual(data["next_aid_station"]["name"], "WS1")
+        self.assertEqual(data["next_aid_station"]["distance_to_go_km"], 0.0)
+
+        data = self.client.get(self.url, {"km": "30"}).json()
+        self.assertIsNone(data["segment"])
+        self.assertIsNone(data["next_aid_station"])
+        self.assertEqual(data["elevation_gain_so_far"], 160)
+
+    def test_locate_rejects_bad_km(self):
+        for value in ("", "abc", "-1", "nan"):
+            self.assertEqual(self.client.get(self.url, {"km": value}).status_code, 400)
+
+    def test_detail_payloads_include_route_profile(self):
+        detail = self.client.get(reverse("events_api:detail-extended", args=[self.event.id])).json()
+        self.assertEqual(detail["route_profile"]["segments"][1]["end_km"], 15.5)
+        self.assertEqual(detail["route_profile"]["segments"][1]["elevation_gain_before"], 40)
+
+        self.event.route_profile.delete()
+        legacy = self.client.get(reverse("event_detail:detail-json", args=[self.event.slug])).json()
+        self.assertEqual(legacy["route_profile"]["total_distance_km"], 22.1)
+
+
 class EventDocumentModelTests(TestCase):
     """Tests for EventDocument model."""
 
@@ -354,6 +432,123 @@ class EventDocumentModelTests(TestCase):
         self.assertIsNotNone(doc.uploaded_at)
 
 
+class GPXIngestionTests(TestCase):
+    """Tests for GPX parsing, simplification and the cached route track."""
+
+    def setUp(self):
+        import tempfile
+
+        self.media = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media.cleanup)
+        self.today = timezone.localdate()
+        self.event = Event.objects.create(
+            title="GPX Marathon",
+            city="Jakarta",
+            start_date=self.today + timedelta(days=30),
+            registration_deadline=self.today + timedelta(days=20),
+        )
+
+    def _write_gpx(self, name="route.gpx", points=2000):
+        import math
+        import os
+
+        rows = []
+        for index in range(points):
+            # ~10 km heading north-east with a gentle wiggle and a 100 m hill.
+            lat = -6.2 + index * 0.00004
+            lon = 106.8 + index * 0.00002 + 0.0003 * math.sin(index / 100)
+            ele = 10 + 100 * math.sin(math.pi * index / points)
+            rows.append(f'<trkpt lat="{lat:.6f}" lon="{lon:.6f}"><ele>{ele:.1f}</ele></trkpt>')
+        os.makedirs(os.path.join(self.media.name, "gpx"), exist_ok=True)
+        with open(os.path.join(self.media.name, "gpx", name), "w") as handle:
+            handle.write(
+                '<?xml version="1.0"?><gpx version="1.1" xmlns="http://www.topografix.com/GPX/1/1">'
+                "<trk><trkseg>" + "".join(rows) + "</trkseg></trk></gpx>"
+            )
+        return f"http://testserver/media/gpx/{name}"
+
+    def _document(self, url, document_type=EventDocument.DocumentType.GPX):
+        with self.captureOnCommitCallbacks(execute=True):
+            return EventDocument.objects.create(
+                event=self.event, title="Course", document_url=url, document_type=document_type
+            )
+
+    def test_encode_polyline_matches_reference(self):
+        from event_detail.gpx import encode_polyline
+
+        points = [(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)]
+        self.assertEqual(encode_polyline(points), "_p~iF~ps|U_ulLnnqC_mqNvxq`@")
+
+    def test_simplify_drops_collinear_points(self):
+        from event_detail.gpx import simplify
+
+        line = [(0.0, index * 0.0001) for index in range(100)]
+        self.assertEqual(simplify(line, 1), [line[0], line[-1]])
+        corner = line + [(index * 0.0001, line[-1][1]) for index in range(1, 50)]
+        self.assertEqual(len(simplify(corner, 1)), 3)
+
+    def test_document_save_ingests_track_into_zoom_levels(self):
+        from django.test import override_settings
+        from event_detail.models import RouteTrack
+
+        with override_settings(MEDIA_ROOT=self.media.name):
+            document = self._document(self._write_gpx())
+
+        track = RouteTrack.objects.get(document=document)
+        self.assertAlmostEqual(float(track.distance_km), 9.9, delta=0.5)
+        self.assertEqual(len(track.elevation), 201)
+        self.assertAlmostEqual(max(ele for _, ele in track.elevation), 110, delta=1)
+        sizes = [len(track.polylines[level]) for level in ("detail", "medium", "overview")]
+        self.assertEqual(sizes, sorted(sizes, reverse=True))
+        self.assertLess(sizes[0], 8 * 1024)
+
+        detail = self.client.get(reverse("events_api:detail-extended", args=[self.event.id])).json()
+        self.assertEqual(detail["route_track"]["polylines"]["overview"], track.polylines["overview"])
+        legacy = self.client.get(reverse("event_detail:detail-json", args=[self.event.slug])).json()
+        self.assertEqual(legacy["route_track"]["document"], document.id)
+
+    def test_unchanged_file_is_not_reparsed(self):
+        from unittest import mock
+        from django.test import override_settings
+        from event_detail.gpx import ingest_gpx
+
+        with override_settings(MEDIA_ROOT=self.media.name):
+            document = self._document(self._write_gpx())
+            with mock.patch("event_detail.gpx.parse_track") as parse:
+                ingest_gpx(document)
+            parse.assert_not_called()
+
+    def test_documents_outside_media_root_are_ignored(self):
+        from django.test import override_settings
+        from event_detail.gpx import ingest_gpx
+
+        self._write_gpx()
+        with override_settings(MEDIA_ROOT=self.media.name):
+            for url in ("https://example.com/route.gpx", "http://testserver/media/../secret.gpx"):
+                document = self._document(url)
+                self.assertIsNone(ingest_gpx(document))
+            self.assertIsNone(
+                ingest_gpx(self._document(self._write_gpx(), EventDocument.DocumentType.GUIDE))
+            )
+
+    def test_invalid_gpx_raises(self):
+        import io
+        from event_detail.gpx import GPXError, parse_track
+
+        with self.assertRaises(GPXError):
+            parse_track(io.BytesIO(b"<gpx><trk><trkseg><trkpt lat='1'></trkpt>"))
+        good = "<trkpt lat='-6.2' lon='106.8'><ele>10</ele></trkpt>"
+        for bad in (
+            "<trkpt lat='nan' lon='106.9'/>",
+            "<trkpt lat='-6.3' lon='inf'/>",
+            "<trkpt lat='-6.3' lon='106.9'><ele>NaN</ele></trkpt>",
+            "<trkpt lat='91' lon='106.9'/>",
+            "<trkpt lat='-6.3' lon='-180.5'/>",
+        ):
+            with self.assertRaises(GPXError, msg=bad):
+                parse_track(io.BytesIO(f"<gpx><trk><trkseg>{good}{bad}</trkseg></trk></gpx>".encode()))
+
+
 class EventDetailViewTests(TestCase):
     """Tests for EventDetailView."""
 
@@ -1,14 +1,18 @@
 from urllib.parse import quote_plus
 
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.views.decorators.http import require_GET
 from django.views.generic import DetailView
 from django.urls import NoReverseMatch, reverse
 
+from core.renderers import FastJsonResponse
 from events.models import Event
+from events.popularity import record_event_view
+from events.similar import similar_events
+from .gpx import serialize_route_track
+from .route import route_profile_for, serialize_route_profile
 
 
 class EventDetailView(LoginRequiredMixin, DetailView):
@@ -31,6 +35,7 @@ class EventDetailView(LoginRequiredMixin, DetailView):
         context = super().get_context_data(**kwargs)
         event = context["event"]
         today = timezone.localdate()
+        record_event_view(event.pk)
 
         schedules = list(event.schedules.all())
         aid_stations = list(event.aid_stations.all())
@@ -80,6 +85,7 @@ class EventDetailView(LoginRequiredMixin, DetailView):
                     {"label": event.title, "url": ""},
                 ],
                 "form": form,
+                "similar_events": similar_events(event.pk),
             }
         )
         return context
@@ -102,11 +108,14 @@ class EventDetailView(LoginRequiredMixin, DetailView):
 @require_GET
 def event_detail_json(request, slug):
     event = get_object_or_404(
-        Event.objects.prefetch_related(
-            "categories", "route_segments", "aid_stations", "schedules", "documents"
+        Event.objects.select_related("route_profile").prefetch_related(
+            "categories", "route_segments", "aid_stations", "schedules", "documents__route_track"
         ),
         slug=slug,
     )
+    # The web detail page fetches this over XHR and has counted its view already.
+    if request.headers.get("X-Requested-With") != "XMLHttpRequest":
+        record_event_view(event.pk)
 
     data = {
         "id": event.id,
@@ -160,6 +169,8 @@ def event_detail_json(request, slug):
             }
             for station in event.aid_stations.all()
         ],
+        "route_profile": serialize_route_profile(route_profile_for(event)),
+        "route_track": serialize_route_track(event),
         "schedules": [
             {
                 "id": item.id,
@@ -183,9 +194,20 @@ def event_detail_json(request, slug):
             }
             for doc in event.documents.all()
         ],
+        "similar_events": [
+            {
+                "id": similar.id,
+                "title": similar.title,
+                "slug": similar.slug,
+                "city": similar.city,
+                "country": similar.country,
+                "start_date": similar.start_date.isoformat(),
+            }
+            for similar in similar_events(event.pk)
+        ],
     }
 
-    return JsonResponse(data)
+    return FastJsonResponse(data)
 
 
 @require_GET
@@ -198,7 +220,7 @@ def event_availability_json(request, slug):
     if capacity:
         capacity_ratio = min(100, round((registered / capacity) * 100))
 
-    return JsonResponse(
+    return FastJsonResponse(
         {
             "event_id": event.id,
             "capacity": capacity,
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Event, EventCategory
+from .models import Event, EventCategory, EventDailyViews, EventRecommendation, SimilarEvent
 
 
 @admin.register(EventCategory)
@@ -28,3 +28,25 @@ class EventAdmin(admin.ModelAdmin):
     @admin.display(boolean=True)
     def is_registration_open(self, obj):
         return obj.is_registration_open
+
+
+@admin.register(EventDailyViews)
+class EventDailyViewsAdmin(admin.ModelAdmin):
+    list_display = ("event", "day", "views")
+    list_filter = ("day",)
+    search_fields = ("event__title",)
+    raw_id_fields = ("event",)
+
+
+@admin.register(EventRecommendation)
+class EventRecommendationAdmin(admin.ModelAdmin):
+    list_display = ("user", "generated_at")
+    search_fields = ("user__username",)
+    raw_id_fields = ("user",)
+
+
+@admin.register(SimilarEvent)
+class SimilarEventAdmin(admin.ModelAdmin):
+    list_display = ("event", "rank", "similar", "score")
+    search_fields = ("event__title",)
+    raw_id_fields = ("event", "similar")
@@ -20,13 +20,21 @@ from rest_framework.decorators import (
 )
 from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.permissions import IsAdminUser
-from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 
-from core.api_helpers import serialize_category, serialize_event
+from core.api_helpers import (
+    EVENT_FIELDS,
+    EVENT_PREFETCH,
+    FieldSet,
+    restrict_queryset,
+    serialize_category,
+    serialize_event,
+)
+from core.renderers import FastJSONRenderer
+from profiles.results import ResultsFormatError, decode_lines, import_results
+from .cache import get_categories
+from .images import BannerImageError, process_banner
 from .models import Event, EventCategory
-from django.conf import settings
-from django.core.files.storage import default_storage
 
 
 def _parse_date_value(value, field_name: str) -> date | None:
@@ -85,24 +93,24 @@ class CsrfExemptSessionAuthentication(SessionAuthentication):
         return
 
 
-def _save_banner_image(file_obj) -> str:
-    upload_path = default_storage.save(f"event_banners/{file_obj.name}", file_obj)
-    base_url = settings.MEDIA_URL or "/media/"
-    if not base_url.endswith("/"):
-        base_url = f"{base_url}/"
-    if not base_url.startswith("/"):
-        base_url = f"/{base_url}"
-    return f"{base_url}{upload_path}"
+def _save_banner_image(file_obj, errors: dict[str, str]) -> tuple[str, dict]:
+    """Store an uploaded banner with its variants, recording a bad upload in ``errors``."""
+    try:
+        return process_banner(file_obj)
+    except BannerImageError as exc:
+        errors["banner_image"] = str(exc)
+        return "", {}
 
 
 @api_view(["GET", "POST"])
 @permission_classes([IsAdminUser])
 @authentication_classes([CsrfExemptSessionAuthentication])
-@renderer_classes([JSONRenderer])
+@renderer_classes([FastJSONRenderer])
 @parser_classes([MultiPartParser, FormParser, JSONParser])
 def admin_events_api(request):
     if request.method == "GET":
-        queryset = Event.objects.prefetch_related("categories").order_by("start_date")
+        fieldset = FieldSet.from_request(request)
+        queryset = Event.objects.order_by("start_date")
         status_filter = request.GET.get("status")
         city = request.GET.get("city")
         search = request.GET.get("q") or request.GET.get("search")
@@ -116,6 +124,7 @@ def admin_events_api(request):
                 Q(title__icontains=search) | Q(description__icontains=search)
             )
 
+        queryset = restrict_queryset(queryset, fieldset, EVENT_FIELDS, prefetch=EVENT_PREFETCH)
         paginator = Paginator(queryset, 20)
         page_number = request.GET.get("page") or 1
         page_obj = paginator.get_page(page_number)
@@ -123,7 +132,7 @@ def admin_events_api(request):
         return Response(
             {
                 "results": [
-                    serialize_event(event, request=request)
+                    serialize_event(event, request=request, fieldset=fieldset)
                     for event in page_obj.object_list
                 ],
                 "pagination": {
@@ -144,7 +153,9 @@ def admin_events_api(request):
     city = (payload.get("city") or "").strip()
     status_value = _validate_status(payload.get("status"))
     popularity_score = max(_parse_int(payload.get("popularity_score"), default=0), 0)
-    banner_image_url = (payload.get("banner_image") or "").strip()
+    # Multipart payloads carry an uploaded banner under the same key.
+    banner_value = payload.get("banner_image")
+    banner_image_url = banner_value.strip() if isinstance(banner_value, str) else ""
 
     try:
         start_date = _parse_date_value(payload.get("start_date"), "start_date")
@@ -177,6 +188,11 @@ def admin_events_api(request):
     if status_value is None:
         errors["status"] = "Select a valid status."
 
+    banner_variants = {}
+    upload = request.FILES.get("banner_image")
+    if upload and not errors:
+        banner_image_url, banner_variants = _save_banner_image(upload, errors)
+
     if errors:
         return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -189,17 +205,10 @@ def admin_events_api(request):
         registration_deadline=registration_deadline,
         status=status_value or Event.Status.UPCOMING,
         popularity_score=popularity_score,
+        banner_image=banner_image_url,
+        banner_variants=banner_variants,
     )
 
-    upload = request.FILES.get("banner_image")
-    if upload:
-        event.banner_image = _save_banner_image(upload)
-    elif banner_image_url:
-        event.banner_image = banner_image_url
-
-    if event.banner_image:
-        event.save(update_fields=["banner_image"])
-
     category_ids = _parse_category_ids(payload.get("categories"))
     if category_ids:
         categories = list(EventCategory.objects.filter(id__in=category_ids))
@@ -211,7 +220,7 @@ def admin_events_api(request):
 @api_view(["GET", "POST", "PUT", "PATCH"])
 @permission_classes([IsAdminUser])
 @authentication_classes([CsrfExemptSessionAuthentication])
-@renderer_classes([JSONRenderer])
+@renderer_classes([FastJSONRenderer])
 @parser_classes([MultiPartParser, FormParser, JSONParser])
 def admin_event_detail_api(request, event_id: int):
     event = get_object_or_404(Event.objects.prefetch_related("categories"), pk=event_id)
@@ -248,10 +257,12 @@ def admin_event_detail_api(request, event_id: int):
             event.status = status_value
     if "popularity_score" in payload:
         event.popularity_score = max(_parse_int(payload.get("popularity_score"), default=0), 0)
-    if "banner_image" in payload:
-        banner_value = (payload.get("banner_image") or "").strip()
-        if banner_value:
+    if isinstance(payload.get("banner_image"), str):
+        banner_value = payload.get("banner_image").strip()
+        if banner_value and banner_value != event.banner_image:
             event.banner_image = banner_value
+            # Variants only exist for uploads.
+            event.banner_variants = {}
 
     if "start_date" in payload:
         try:
@@ -271,13 +282,13 @@ def admin_event_detail_api(request, event_id: int):
         except ValueError as exc:
             errors["registration_deadline"] = str(exc)
 
+    upload = request.FILES.get("banner_image")
+    if upload and not errors:
+        event.banner_image, event.banner_variants = _save_banner_image(upload, errors)
+
     if errors:
         return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
 
-    upload = request.FILES.get("banner_image")
-    if upload:
-        event.banner_image = _save_banner_image(upload)
-
     event.save()
 
     if "categories" in payload:
@@ -291,23 +302,44 @@ def admin_event_detail_api(request, event_id: int):
 @api_view(["POST", "DELETE"])
 @permission_classes([IsAdminUser])
 @authentication_classes([CsrfExemptSessionAuthentication])
-@renderer_classes([JSONRenderer])
+@renderer_classes([FastJSONRenderer])
 def admin_event_delete_api(request, event_id: int):
     event = get_object_or_404(Event, pk=event_id)
     event.delete()
     return Response({"success": True})
 
 
+@api_view(["POST"])
+@permission_classes([IsAdminUser])
+@authentication_classes([CsrfExemptSessionAuthentication])
+@renderer_classes([FastJSONRenderer])
+@parser_classes([MultiPartParser, FormParser])
+def admin_event_results_import_api(request, event_id: int):
+    """Apply an uploaded timing-system CSV (``file``) to the event's race history."""
+    event = get_object_or_404(Event, pk=event_id)
+    upload = request.FILES.get("file")
+    if upload is None:
+        return Response(
+            {"errors": {"file": "Upload the results CSV as 'file'."}},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    try:
+        result = import_results(event, decode_lines(upload))
+    except ResultsFormatError as exc:
+        return Response({"errors": {"file": str(exc)}}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(result.as_dict())
+
+
 @api_view(["GET", "POST"])
 @permission_classes([IsAdminUser])
 @authentication_classes([CsrfExemptSessionAuthentication])
-@renderer_classes([JSONRenderer])
+@renderer_classes([FastJSONRenderer])
 @parser_classes([JSONParser, FormParser, MultiPartParser])
 def admin_event_categories_api(request):
     if request.method == "GET":
-        categories = EventCategory.objects.order_by("distance_km")
         return Response(
-            {"results": [serialize_category(category) for category in categories]}
+            {"results": [serialize_category(category) for category in get_categories()]}
         )
 
     payload = request.data
@@ -6,6 +6,13 @@ app_name = "events_api"
 
 urlpatterns = [
     path("", api_views.events_list_api, name="list"),
+    path("search/", api_views.event_search_api, name="search"),
+    path("calendar/", api_views.event_calendar_api, name="calendar"),
+    path("nearby/", api_views.nearby_events_api, name="nearby"),
+    path("recommended/", api_views.recommended_events_api, name="recommended"),
     path("<int:event_id>/", api_views.event_summary_api, name="detail"),
     path("<int:event_id>/detail/", api_views.event_detail_api, name="detail-extended"),
+    path("<int:event_id>/route/locate/", api_views.route_locate_api, name="route-locate"),
+    path("<int:event_id>/leaderboard/", api_views.event_leaderboard_api, name="leaderboard"),
+    path("leaderboards/<str:distance>/", api_views.distance_leaderboard_api, name="distance-leaderboard"),
 ]
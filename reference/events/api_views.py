@@ -1,12 +1,46 @@
+import math
+
 from django.core.paginator import Paginator
+from django.http import Http404
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
-from core.api_helpers import serialize_event, serialize_event_detail
+from core.api_helpers import (
+    EVENT_FIELDS,
+    EVENT_PREFETCH,
+    FieldSet,
+    restrict_queryset,
+    serialize_distance_leaderboard_entry,
+    serialize_event,
+    serialize_event_detail,
+    serialize_leaderboard_entry,
+)
+from event_detail.route import locate, route_profile_for
+from profiles.leaderboards import (
+    LEADERBOARD_PAGE_SIZE,
+    cached_event_page,
+    distance_labels,
+    distance_leaderboard,
+    distance_rank,
+    event_categories,
+    event_leaderboard,
+    event_rank,
+    parse_distance,
+)
+from profiles.models import UserProfile
+from .cache import EVENT_SEARCH_LIMIT, get_event, get_events, search_event_choices
+from .calendar import month_calendar
 from .forms import EventFilterForm
-from .models import Event
+from .geo import gazetteer
+from .models import Event, EventRecommendation, has_category
+from .nearby import NEARBY_LIMIT, NEARBY_MAX_RADIUS_KM, NEARBY_RADIUS_KM, events_near
+from .popularity import record_event_view
+
+EVENT_SEARCH_MAX_LIMIT = 50
+RECOMMENDED_LIMIT = 10
 
 
 @api_view(["GET"])
@@ -16,7 +50,8 @@ def events_list_api(request):
     Mobile-friendly events listing with filtering and pagination.
     Mirrors the data contract expected by the Flutter models.
     """
-    queryset = Event.objects.prefetch_related("categories").order_by("start_date")
+    fieldset = FieldSet.from_request(request)
+    queryset = Event.objects.order_by("start_date")
     form = EventFilterForm(request.GET or None)
     queryset = form.filter_queryset(queryset)
 
@@ -25,17 +60,21 @@ def events_list_api(request):
     if distance:
         try:
             distance_value = float(distance)
-            queryset = queryset.filter(categories__distance_km=distance_value)
+            queryset = queryset.filter(has_category(distance_km=distance_value))
         except ValueError:
             pass
 
+    queryset = restrict_queryset(queryset, fieldset, EVENT_FIELDS, prefetch=EVENT_PREFETCH)
     paginator = Paginator(queryset, 9)
     page_number = request.GET.get("page") or 1
     page_obj = paginator.get_page(page_number)
 
     return Response(
         {
-            "results": [serialize_event(event) for event in page_obj.object_list],
+            "results": [
+                serialize_event(event, request=request, fieldset=fieldset)
+                for event in page_obj.object_list
+            ],
             "pagination": {
                 "page": page_obj.number,
                 "pages": paginator.num_pages,
@@ -47,12 +86,152 @@ def events_list_api(request):
     )
 
 
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def event_search_api(request):
+    """
+    Search-as-you-type event picker: ``?q=`` matched against titles, at most
+    ``?limit=`` (default 20, max 50) compact ``{id, title}`` rows.
+    """
+    try:
+        limit = int(request.GET.get("limit") or EVENT_SEARCH_LIMIT)
+    except ValueError:
+        return Response({"detail": "limit must be an integer."}, status=400)
+    limit = min(max(limit, 1), EVENT_SEARCH_MAX_LIMIT)
+    choices = search_event_choices(request.GET.get("q", ""), limit)
+    return Response({"results": [{"id": event_id, "title": title} for event_id, title in choices]})
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def event_calendar_api(request):
+    """
+    Race calendar for ``?year=&month=`` (default: this month): per-day event
+    counts and compact stubs of every event on the calendar that month,
+    multi-day events included. ``?status=`` narrows it to one status.
+    """
+    today = timezone.localdate()
+    try:
+        year = int(request.GET.get("year") or today.year)
+        month = int(request.GET.get("month") or today.month)
+    except ValueError:
+        return Response({"detail": "year and month must be integers."}, status=400)
+    if not (1 <= year <= 9999 and 1 <= month <= 12):
+        return Response({"detail": "year must be 1-9999 and month 1-12."}, status=400)
+    status = request.GET.get("status", "")
+    if status and status not in Event.Status.values:
+        return Response({"detail": f"status must be one of {', '.join(Event.Status.values)}."}, status=400)
+    return Response(month_calendar(year, month, status))
+
+
+def _float_param(request, name: str):
+    """A finite float query parameter, ``None`` when absent; ``ValueError`` when malformed."""
+    raw = request.GET.get(name)
+    if raw in (None, ""):
+        return None
+    value = float(raw)
+    if not math.isfinite(value):
+        raise ValueError(name)
+    return value
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def nearby_events_api(request):
+    """
+    "Events near me": events that have not finished within ``?radius=`` km
+    (default 50, max 500) of ``?lat=&lon=``, or of a place from the bundled
+    gazetteer (``?near=<city>[&country=]``), closest first with their
+    ``distance_km``. Events only placed at their country's centroid are left
+    out. At most ``?limit=`` (default 20, max 50) results.
+    """
+    try:
+        latitude, longitude = _float_param(request, "lat"), _float_param(request, "lon")
+        radius = _float_param(request, "radius")
+        limit = int(request.GET.get("limit") or NEARBY_LIMIT)
+    except ValueError:
+        return Response({"detail": "lat, lon and radius must be numbers and limit an integer."}, status=400)
+    if latitude is None or longitude is None:
+        near = request.GET.get("near", "").strip()
+        location = gazetteer().locate(near, request.GET.get("country", "")) if near else None
+        # A country centroid is no place to measure a radius from.
+        if location is None or location.precision != Event.LocationSource.CITY:
+            return Response({"detail": "Pass ?lat=&lon= or the ?near= name of a known city."}, status=400)
+        latitude, longitude, _ = location
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return Response({"detail": "lat must be within -90..90 and lon within -180..180."}, status=400)
+    radius = min(max(radius if radius is not None else NEARBY_RADIUS_KM, 0.1), NEARBY_MAX_RADIUS_KM)
+    limit = min(max(limit, 1), EVENT_SEARCH_MAX_LIMIT)
+
+    fieldset = FieldSet.from_request(request)
+    nearest = events_near(latitude, longitude, radius, Event.objects.exclude(status=Event.Status.COMPLETED))[:limit]
+    events = restrict_queryset(
+        Event.objects.filter(pk__in=[event_id for event_id, _ in nearest]),
+        fieldset,
+        EVENT_FIELDS,
+        prefetch=EVENT_PREFETCH,
+    ).in_bulk()
+    return Response(
+        {
+            "origin": {"latitude": latitude, "longitude": longitude},
+            "radius_km": radius,
+            "results": [
+                {
+                    **serialize_event(events[event_id], request=request, fieldset=fieldset),
+                    "distance_km": round(distance, 2),
+                }
+                for event_id, distance in nearest
+                if event_id in events
+            ],
+        }
+    )
+
+
+@api_view(["GET"])
+def recommended_events_api(request):
+    """
+    "Events for you": the user's precomputed list (``manage.py
+    build_recommendations``), read by primary key, minus events that have
+    started since. Users without a list get popular upcoming events and
+    ``personalized: false``.
+    """
+    try:
+        limit = min(max(int(request.GET.get("limit") or RECOMMENDED_LIMIT), 1), EventRecommendation.MAX_EVENTS)
+    except ValueError:
+        return Response({"detail": "limit must be an integer."}, status=400)
+    fieldset = FieldSet.from_request(request)
+    today = timezone.localdate()
+    stored = EventRecommendation.objects.filter(pk=request.user.pk).first()
+    if stored is not None:
+        events = get_events(stored.event_ids)
+        ranked = [events[event_id] for event_id in stored.event_ids if event_id in events]
+        ranked = [event for event in ranked if event.start_date >= today][:limit]
+    else:
+        ranked = list(
+            restrict_queryset(
+                Event.objects.filter(start_date__gte=today).exclude(status=Event.Status.COMPLETED),
+                fieldset,
+                EVENT_FIELDS,
+                prefetch=EVENT_PREFETCH,
+            ).order_by(*Event.POPULARITY_ORDERING, "start_date")[:limit]
+        )
+    return Response(
+        {
+            "results": [serialize_event(event, request=request, fieldset=fieldset) for event in ranked],
+            "personalized": stored is not None,
+            "generated_at": stored.generated_at.isoformat() if stored else None,
+        }
+    )
+
+
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def event_summary_api(request, event_id: int):
     """Return the base event payload."""
-    event = get_object_or_404(Event.objects.prefetch_related("categories"), pk=event_id)
-    return Response(serialize_event(event))
+    event = get_event(event_id)
+    if event is None:
+        raise Http404("Event not found.")
+    return Response(serialize_event(event, request=request, fieldset=FieldSet.from_request(request)))
 
 
 @api_view(["GET"])
@@ -62,15 +241,109 @@ def event_detail_api(request, event_id: int):
     Extended event detail (schedule, route, docs) merged with the base event.
     """
     event = get_object_or_404(
-        Event.objects.prefetch_related(
+        Event.objects.select_related("route_profile").prefetch_related(
             "categories",
             "route_segments",
             "aid_stations",
             "schedules",
-            "documents",
+            "documents__route_track",
         ),
         pk=event_id,
     )
-    payload = serialize_event(event)
+    record_event_view(event.pk)
+    payload = serialize_event(event, request=request, fieldset=FieldSet.from_request(request))
     payload.update(serialize_event_detail(event))
     return Response(payload)
+
+
+def _page_number(request) -> int:
+    try:
+        return max(int(request.GET.get("page") or 1), 1)
+    except ValueError:
+        return 1
+
+
+def _viewer_profile_id(request):
+    if not request.user.is_authenticated:
+        return None
+    return UserProfile.objects.filter(user=request.user).values_list("pk", flat=True).first()
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def event_leaderboard_api(request, event_id: int):
+    """
+    Finish-time leaderboard for one event category (``?category=``).
+
+    The category may be omitted when the event has a single one. ``me`` holds
+    the authenticated runner's rank, if they finished.
+    """
+    event = get_event(event_id)
+    if event is None:
+        raise Http404("Event not found.")
+    category = request.GET.get("category")
+    if not category:
+        categories = event_categories(event.pk)
+        if len(categories) > 1:
+            return Response(
+                {"detail": "Pass ?category= to choose a leaderboard.", "categories": categories},
+                status=400,
+            )
+        category = categories[0] if categories else ""
+    page_number = _page_number(request)
+
+    def build():
+        page_obj = Paginator(event_leaderboard(event.pk, category), LEADERBOARD_PAGE_SIZE).get_page(page_number)
+        return {
+            "category": category,
+            "results": [serialize_leaderboard_entry(entry) for entry in page_obj.object_list],
+            "total": page_obj.paginator.count,
+            "has_next": page_obj.has_next(),
+        }
+
+    payload = cached_event_page(event, category, page_number, build)
+    profile_id = _viewer_profile_id(request)
+    me = event_rank(event.pk, category, profile_id) if profile_id else None
+    return Response({**payload, "me": me})
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def distance_leaderboard_api(request, distance: str):
+    """Overall leaderboard of personal bests for a distance in km (e.g. ``10`` or ``21.1``)."""
+    distance_km = parse_distance(distance)
+    if distance_km is None:
+        raise Http404("Unknown distance.")
+    labels = distance_labels(distance_km)
+    page_obj = Paginator(distance_leaderboard(labels), LEADERBOARD_PAGE_SIZE).get_page(_page_number(request))
+    rows = list(page_obj.object_list)
+    profiles = UserProfile.objects.select_related("user").in_bulk([row["profile_id"] for row in rows])
+    profile_id = _viewer_profile_id(request)
+    return Response(
+        {
+            "distance_km": float(distance_km),
+            "results": [
+                serialize_distance_leaderboard_entry(row, profiles[row["profile_id"]]) for row in rows
+            ],
+            "total": page_obj.paginator.count,
+            "has_next": page_obj.has_next(),
+            "me": distance_rank(labels, profile_id) if profile_id else None,
+        }
+    )
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def route_locate_api(request, event_id: int):
+    """
+    Where kilometer ``?km=`` falls on the event route: its segment, the climb
+    so far and the next (medical) aid station.
+    """
+    event = get_object_or_404(Event.objects.select_related("route_profile"), pk=event_id)
+    try:
+        km = float(request.GET.get("km", ""))
+    except ValueError:
+        km = None
+    if km is None or not math.isfinite(km) or km < 0:
+        return Response({"detail": "Pass ?km= as a non-negative number."}, status=400)
+    return Response(locate(route_profile_for(event), km))
@@ -0,0 +1,98 @@
+import hashlib
+from typing import Iterable, Optional
+
+from django.db import transaction
+from django.db.models import Case, Value, When
+
+from core.cache import TwoTierCache
+from .models import Event, EventCategory
+
+# Event rows are scoped by id; category changes bump the whole namespace
+# because every cached event embeds its categories. Title searches span all
+# events, so they live in their own scope that every event write bumps.
+event_cache = TwoTierCache("events", maxsize=512)
+_MISSING = object()
+_TITLES = "titles"
+EVENT_SEARCH_LIMIT = 20
+
+
+def get_event(event_id) -> Optional[Event]:
+    """The event with its categories prefetched, or ``None`` when it does not exist."""
+    return event_cache.get_or_set(
+        "event",
+        lambda: Event.objects.prefetch_related("categories").filter(pk=event_id).first(),
+        scope=int(event_id),
+    )
+
+
+def get_events(event_ids: Iterable) -> dict[int, Event]:
+    """Existing events among ``event_ids`` by id; misses are fetched in one query."""
+    events, missing = {}, set()
+    for event_id in {int(event_id) for event_id in event_ids}:
+        event = event_cache.get("event", _MISSING, scope=event_id)
+        if event is _MISSING:
+            missing.add(event_id)
+        elif event is not None:
+            events[event_id] = event
+    if missing:
+        for event in Event.objects.prefetch_related("categories").filter(pk__in=missing):
+            event_cache.set("event", event, scope=event.pk)
+            events[event.pk] = event
+    return events
+
+
+def get_categories() -> list[EventCategory]:
+    """Every category, ordered by distance."""
+    return event_cache.get_or_set("categories", lambda: list(EventCategory.objects.order_by("distance_km")))
+
+
+def category_choices() -> tuple[tuple[int, str], ...]:
+    """``(id, display_name)`` of every category, ordered by distance, for dropdowns."""
+    return event_cache.get_or_set(
+        "category_choices",
+        lambda: tuple(EventCategory.objects.order_by("distance_km").values_list("id", "display_name")),
+    )
+
+
+def search_event_choices(query: str, limit: int = EVENT_SEARCH_LIMIT) -> tuple[tuple[int, str], ...]:
+    """
+    ``(id, title)`` of up to ``limit`` events whose title contains ``query``,
+    titles starting with it first, then alphabetically.
+    """
+    query = " ".join(query.split())
+    key = "search:" + hashlib.md5(f"{limit}:{query.casefold()}".encode()).hexdigest()
+
+    def build():
+        queryset = Event.objects.all()
+        if query:
+            queryset = queryset.filter(title__icontains=query).annotate(
+                prefix=Case(When(title__istartswith=query, then=Value(0)), default=Value(1))
+            ).order_by("prefix", "title", "id")
+        else:
+            queryset = queryset.order_by("title", "id")
+        return tuple(queryset.values_list("id", "title")[:limit])
+
+    return event_cache.get_or_set(key, build, scope=_TITLES)
+
+
+def _bump(event_ids) -> None:
+    if event_ids is None:
+        event_cache.invalidate()
+    else:
+        event_cache.invalidate(*event_ids, _TITLES)
+
+
+def invalidate_events(event_ids: Optional[Iterable] = None) -> None:
+    """
+    Drop cached lookups for ``event_ids``, or for every event and category
+    when ``None``.
+
+    Bumped immediately and again on commit, so a reader that rebuilt from
+    pre-commit data in between does not keep serving it.
+    """
+    if event_ids is not None:
+        event_ids = {int(event_id) for event_id in event_ids}
+        if not event_ids:
+            return
+    _bump(event_ids)
+    transaction.on_commit(lambda: _bump(event_ids))
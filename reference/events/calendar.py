@@ -0,0 +1,108 @@
+import calendar
+from datetime import date, timedelta
+from typing import Iterable, Optional
+
+from django.db import transaction
+from django.db.models import DurationField, ExpressionWrapper, F, Max, Q
+
+from core.cache import TwoTierCache
+from .models import Event
+
+# One scope per month ("2026-10"), bumped when an event in that month is
+# saved or deleted; the longest event span lives in its own scope.
+calendar_cache = TwoTierCache("calendar", maxsize=48)
+_SPAN = "span"
+
+
+def month_scope(year: int, month: int) -> str:
+    return f"{year:04d}-{month:02d}"
+
+
+def months_between(start: date, end: Optional[date]) -> Iterable[tuple[int, int]]:
+    """``(year, month)`` of every month from ``start`` to ``end`` (or ``start``)."""
+    year, month = start.year, start.month
+    last = end if end and end > start else start
+    while (year, month) <= (last.year, last.month):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def longest_event_days() -> int:
+    """Days between the start and end of the longest multi-day event."""
+
+    def build():
+        span = Event.objects.filter(end_date__isnull=False).aggregate(
+            longest=Max(ExpressionWrapper(F("end_date") - F("start_date"), output_field=DurationField()))
+        )["longest"]
+        return max(span.days, 0) if span else 0
+
+    return calendar_cache.get_or_set("longest", build, scope=_SPAN)
+
+
+def month_calendar(year: int, month: int, status: str = "") -> dict:
+    """
+    Events overlapping a month: per-day counts and compact event stubs.
+
+    The events starting in the month, plus multi-day events that started at
+    most ``longest_event_days()`` before it, are one range scan of the
+    ``(status, start_date)`` index; ``end_date`` then keeps only the earlier
+    ones still running on the 1st. Cached per month and status.
+    """
+
+    def build():
+        first = date(year, month, 1)
+        last = date(year, month, calendar.monthrange(year, month)[1])
+        # An explicit status list lets the composite index serve the
+        # unfiltered calendar too.
+        statuses = [status] if status else Event.Status.values
+        # Clamped so a month near year 1 does not step below date.min.
+        lookback = min(longest_event_days(), (first - date.min).days)
+        events = list(
+            Event.objects.filter(
+                Q(start_date__gte=first) | Q(end_date__gte=first),
+                status__in=statuses,
+                start_date__range=(first - timedelta(days=lookback), last),
+            )
+            .order_by("start_date", "title", "pk")
+            .values("id", "title", "slug", "city", "country", "status", "start_date", "end_date")
+        )
+        counts = [0] * last.day
+        for event in events:
+            begin = max(event["start_date"], first)
+            end = min(event["end_date"] or event["start_date"], last)
+            for day in range(begin.day, end.day + 1):
+                counts[day - 1] += 1
+            event["start_date"] = event["start_date"].isoformat()
+            event["end_date"] = event["end_date"].isoformat() if event["end_date"] else None
+        return {
+            "year": year,
+            "month": month,
+            "days": [
+                {"date": (first + timedelta(days=offset)).isoformat(), "count": count}
+                for offset, count in enumerate(counts)
+            ],
+            "events": events,
+        }
+
+    return calendar_cache.get_or_set(f"month:{status or 'all'}", build, scope=month_scope(year, month))
+
+
+def _bump(scopes) -> None:
+    calendar_cache.invalidate(*scopes)
+
+
+def invalidate_calendar(date_ranges: Iterable[tuple[Optional[date], Optional[date]]]) -> None:
+    """
+    Drop the cached months covered by each ``(start_date, end_date)``.
+
+    Event saves and deletes call this from a signal with the event's old and
+    new dates; set-based writes that change dates or listed fields must call
+    it themselves. Bumped immediately and again on commit, like
+    ``invalidate_events``.
+    """
+    scopes = {_SPAN}
+    for start, end in date_ranges:
+        if start:
+            scopes.update(month_scope(year, month) for year, month in months_between(start, end))
+    _bump(scopes)
+    transaction.on_commit(lambda: _bump(scopes))
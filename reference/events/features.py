@@ -0,0 +1,130 @@
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from .models import Event
+
+# Category distance (km) -> bucket. Upper bounds are exclusive; the names
+# match UserProfile.favorite_distance.
+DISTANCE_BUCKETS = (
+    ("5K", 7.5),
+    ("10K", 15),
+    ("21K", 30),
+    ("42K", 43),
+    ("ULTRA", math.inf),
+)
+# Event length in days: 1, 2, 3 or more.
+DURATION_BUCKETS = ("1", "2", "3+")
+_BUCKET_BOUNDS = np.array([bound for _, bound in DISTANCE_BUCKETS[:-1]])
+
+
+def distance_buckets(distances_km) -> np.ndarray:
+    """Bucket index of each distance."""
+    return np.searchsorted(_BUCKET_BOUNDS, np.asarray(distances_km, dtype=float), side="right")
+
+
+@dataclass
+class EventFeatures:
+    """
+    Event feature matrix: one float32 row per event, in ``ids`` order.
+
+    Columns are grouped into blocks (``blocks`` maps a block name to its
+    column slice) so callers can build matching query vectors.
+    """
+
+    ids: np.ndarray
+    matrix: np.ndarray
+    blocks: dict[str, slice]
+    countries: list[str]
+    cities: list[str]
+    start_dates: list
+
+    def rows(self, event_ids) -> np.ndarray:
+        """Row index of each id in ``event_ids`` (all must be present)."""
+        return np.searchsorted(self.ids, np.asarray(event_ids, dtype=self.ids.dtype))
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length; all-zero rows stay zero."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def encode_events(
+    queryset=None,
+    weights: dict[str, float] | None = None,
+    blocks: tuple[str, ...] = ("distance", "country", "month", "popularity"),
+) -> EventFeatures:
+    """
+    Encode events as feature blocks, one row per event:
+
+    - ``distance``: multi-hot of the categories' distance buckets
+    - ``country``: one-hot country
+    - ``month``: one-hot start month
+    - ``season``: start month on the unit circle (December sits next to January)
+    - ``duration``: one-hot of 1, 2 or 3+ days
+    - ``popularity``: log-scaled ``popularity_score`` in [0, 1]
+
+    Reads the events and their category distances in two queries. Each
+    block is scaled by ``weights[block]`` (default 1) before the rows are
+    normalized, so dot products between rows are cosine similarities.
+    """
+    weights = weights or {}
+    queryset = (queryset if queryset is not None else Event.objects.all()).order_by("pk")
+    rows = list(queryset.values_list("pk", "country", "city", "start_date", "end_date", "popularity_score"))
+    ids = np.array([row[0] for row in rows], dtype=np.int64)
+    countries = sorted({row[1] for row in rows})
+    country_index = {country: index for index, country in enumerate(countries)}
+
+    widths = {
+        "distance": len(DISTANCE_BUCKETS),
+        "country": len(countries),
+        "month": 12,
+        "season": 2,
+        "duration": len(DURATION_BUCKETS),
+        "popularity": 1,
+    }
+    columns, offset = {}, 0
+    for name in blocks:
+        columns[name] = slice(offset, offset + widths[name])
+        offset += widths[name]
+    matrix = np.zeros((len(rows), offset), dtype=np.float32)
+    features = EventFeatures(
+        ids=ids,
+        matrix=matrix,
+        blocks=columns,
+        countries=countries,
+        cities=[row[2] for row in rows],
+        start_dates=[row[3] for row in rows],
+    )
+    if not rows:
+        return features
+
+    positions = np.arange(len(rows))
+    months = np.array([row[3].month - 1 for row in rows])
+    if "distance" in columns:
+        through = Event.categories.through.objects.filter(event_id__in=queryset.values("pk"))
+        pairs = np.array(list(through.values_list("event_id", "eventcategory__distance_km")), dtype=float)
+        if len(pairs):
+            event_rows = np.searchsorted(ids, pairs[:, 0].astype(np.int64))
+            matrix[event_rows, columns["distance"].start + distance_buckets(pairs[:, 1])] = 1
+    if "country" in columns:
+        matrix[positions, columns["country"].start + np.array([country_index[row[1]] for row in rows])] = 1
+    if "month" in columns:
+        matrix[positions, columns["month"].start + months] = 1
+    if "season" in columns:
+        angle = months * (2 * np.pi / 12)
+        matrix[:, columns["season"]] = np.column_stack([np.cos(angle), np.sin(angle)])
+    if "duration" in columns:
+        days = np.array([(row[4] - row[3]).days + 1 if row[4] else 1 for row in rows])
+        matrix[positions, columns["duration"].start + np.minimum(np.maximum(days, 1), len(DURATION_BUCKETS)) - 1] = 1
+    if "popularity" in columns:
+        popularity = np.log1p(np.array([row[5] for row in rows], dtype=np.float32))
+        if popularity.max() > 0:
+            matrix[:, columns["popularity"].start] = popularity / popularity.max()
+
+    for name, block in columns.items():
+        matrix[:, block] *= weights.get(name, 1.0)
+    features.matrix = normalize_rows(matrix)
+    return features
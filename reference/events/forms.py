@@ -1,6 +1,7 @@
 from django import forms
 from django.db import models
-from .models import Event, EventCategory
+from .cache import category_choices
+from .models import Event, has_category
 
 
 class EventFilterForm(forms.Form):
@@ -32,12 +33,7 @@ class EventFilterForm(forms.Form):
         status_choices = [("", "Any status")] + list(Event.Status.choices)
         self.fields["status"].choices = status_choices
 
-        category_choices = [("", "All distances")]
-        category_choices.extend(
-            (category.id, category.display_name)
-            for category in EventCategory.objects.order_by("distance_km")
-        )
-        self.fields["category"].choices = category_choices
+        self.fields["category"].choices = [("", "All distances"), *category_choices()]
 
         for field in self.fields.values():
             existing_class = field.widget.attrs.get("class", "")
@@ -62,13 +58,13 @@ class EventFilterForm(forms.Form):
         if status:
             queryset = queryset.filter(status=status)
         if category:
-            queryset = queryset.filter(categories__id=category)
+            queryset = queryset.filter(has_category(id=category))
 
         if sort == "popularity":
-            queryset = queryset.order_by("-popularity_score", "start_date")
+            queryset = queryset.order_by(*Event.POPULARITY_ORDERING, "start_date")
         elif sort == "soonest":
             queryset = queryset.order_by("start_date")
         elif sort == "latest":
             queryset = queryset.order_by("-start_date")
 
-        return queryset.distinct()
+        return queryset
@@ -0,0 +1,164 @@
+import csv
+import math
+import re
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+GAZETTEER_DIR = Path(__file__).resolve().parent / "data" / "gazetteer"
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+# Stored on Event; ~5 m cells, more than any radius query needs.
+GEOHASH_PRECISION = 9
+# A radius query scans at most this many geohash ranges; wider areas use
+# coarser (shorter) prefixes.
+MAX_COVER_CELLS = 32
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Standard base-32 geohash of a point."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        interval, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def _cell_size(precision: int) -> tuple[float, float]:
+    """Height and width in degrees of a geohash cell."""
+    lat_bits = 5 * precision // 2
+    lon_bits = 5 * precision - lat_bits
+    return 180 / 2 ** lat_bits, 360 / 2 ** lon_bits
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> tuple[float, float, float, float]:
+    """``(min_lat, max_lat, min_lon, max_lon)`` around a circle; longitudes may pass +-180."""
+    delta_lat = radius_km / KM_PER_DEGREE
+    min_lat, max_lat = max(latitude - delta_lat, -90.0), min(latitude + delta_lat, 90.0)
+    widest = max(abs(min_lat), abs(max_lat))
+    if widest >= 90:
+        return min_lat, max_lat, -180.0, 180.0
+    delta_lon = min(radius_km / (KM_PER_DEGREE * math.cos(math.radians(widest))), 180.0)
+    return min_lat, max_lat, longitude - delta_lon, longitude + delta_lon
+
+
+def covering_prefixes(latitude: float, longitude: float, radius_km: float) -> list[str]:
+    """
+    Geohash prefixes whose cells together cover the circle's bounding box.
+
+    Picks the longest prefix length that needs at most ``MAX_COVER_CELLS``
+    cells, so a query is a handful of index range scans. Wraps around the
+    antimeridian. An empty list means the circle covers (nearly) the globe.
+    """
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = _cell_size(precision)
+        rows = range(int((min_lat + 90) // height), min(int((max_lat + 90) // height), int(180 / height) - 1) + 1)
+        columns = range(int((min_lon + 180) // width), int((max_lon + 180) // width) + 1)
+        columns_total = int(360 / width)
+        if len(columns) >= columns_total:
+            columns = range(columns_total)
+        if len(rows) * len(columns) > MAX_COVER_CELLS:
+            continue
+        return sorted(
+            {
+                encode_geohash(-90 + (row + 0.5) * height, -180 + (column % columns_total + 0.5) * width, precision)
+                for row in rows
+                for column in columns
+            }
+        )
+    return []
+
+
+def haversine_km(latitude: float, longitude: float, latitudes, longitudes) -> np.ndarray:
+    """Great-circle distance from one point to arrays of points."""
+    lat1, lon1 = math.radians(latitude), math.radians(longitude)
+    lat2, lon2 = np.radians(np.asarray(latitudes, dtype=float)), np.radians(np.asarray(longitudes, dtype=float))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _normalize(name: str) -> str:
+    text = unicodedata.normalize("NFKD", name or "").encode("ascii", "ignore").decode()
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", text.casefold()).split())
+
+
+class Location(NamedTuple):
+    latitude: float
+    longitude: float
+    # "city" for a city's own coordinates, "country" for a country centroid.
+    precision: str
+
+
+class Gazetteer:
+    """
+    Offline place lookup from the CSV files bundled in ``events/data/gazetteer``.
+
+    ``cities.csv`` holds city coordinates, ``countries.csv`` country centroids
+    with their ISO/IOC codes as aliases. Add rows there to cover more places.
+    """
+
+    def __init__(self, directory: Path = GAZETTEER_DIR):
+        self.countries: dict[str, str] = {}
+        self.country_points: dict[str, tuple[float, float]] = {}
+        self.cities: dict[tuple[str, str], tuple[float, float]] = {}
+        self._city_names: dict[str, list[str]] = {}
+        with open(directory / "countries.csv", newline="", encoding="utf-8") as handle:
+            for row in csv.DictReader(handle):
+                key = _normalize(row["country"])
+                self.country_points[key] = (float(row["latitude"]), float(row["longitude"]))
+                for alias in [row["country"], *filter(None, row["aliases"].split("|"))]:
+                    self.countries[_normalize(alias)] = key
+        with open(directory / "cities.csv", newline="", encoding="utf-8") as handle:
+            for row in csv.DictReader(handle):
+                country = self.countries.get(_normalize(row["country"]), _normalize(row["country"]))
+                city = _normalize(row["city"])
+                self.cities[(city, country)] = (float(row["latitude"]), float(row["longitude"]))
+                self._city_names.setdefault(country, []).append(city)
+        # Longest names first so "ho chi minh city" wins over a shorter match.
+        self._city_patterns = {
+            country: re.compile(r"\b(%s)\b" % "|".join(map(re.escape, sorted(names, key=len, reverse=True))))
+            for country, names in self._city_names.items()
+        }
+
+    def locate(self, city: str, country: str = "") -> Optional[Location]:
+        """
+        Where a place is: the city itself, else a known city named in the
+        text (``"Two Oceans Marathon Cape Town"``), else the country's
+        centroid (``precision="country"``). ``None`` when nothing matches.
+        """
+        city_key = _normalize(city)
+        country_key = self.countries.get(_normalize(country), _normalize(country))
+        if country_key:
+            if (city_key, country_key) in self.cities:
+                return Location(*self.cities[city_key, country_key], "city")
+            pattern = self._city_patterns.get(country_key)
+            match = pattern.search(city_key) if pattern and city_key else None
+            if match:
+                return Location(*self.cities[match.group(1), country_key], "city")
+            point = self.country_points.get(country_key)
+            return Location(*point, "country") if point else None
+        # No country: only an unambiguous city name will do.
+        matches = [point for (name, _), point in self.cities.items() if name == city_key]
+        return Location(*matches[0], "city") if len(matches) == 1 else None
+
+
+@lru_cache(maxsize=1)
+def gazetteer() -> Gazetteer:
+    return Gazetteer()
@@ -0,0 +1,132 @@
+import hashlib
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils.text import get_valid_filename
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - Pillow is optional; originals are stored as-is
+    Image = ImageOps = None
+
+BANNER_DIR = "event_banners"
+# Variant -> bounding box. Images are scaled to fit (never upscaled), keeping
+# their aspect ratio.
+BANNER_VARIANTS = {
+    "thumb": (320, 180),
+    "card": (800, 450),
+    "hero": (1600, 900),
+}
+# Format -> (file extension, Pillow save options).
+BANNER_FORMATS = {
+    "webp": ("webp", {"quality": 80, "method": 4}),
+    "jpeg": ("jpg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+BANNER_MAX_PIXELS = 40_000_000
+# Detected format -> extension of the stored original, where the format name
+# is not the usual extension.
+_ORIGINAL_EXTENSIONS = {"JPEG": "jpg", "TIFF": "tif"}
+
+# Pillow releases the GIL while resampling and encoding, so variants encode in
+# parallel. Shared by every upload to bound the CPU an admin burst can take.
+_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, "BANNER_IMAGE_WORKERS", min(4, os.cpu_count() or 1)),
+    thread_name_prefix="banner-images",
+)
+
+
+class BannerImageError(ValueError):
+    """The upload is not an image Pillow can read."""
+
+
+def media_url(path: str) -> str:
+    """Site-relative URL of a file saved to ``default_storage``."""
+    base_url = settings.MEDIA_URL or "/media/"
+    if not base_url.endswith("/"):
+        base_url = f"{base_url}/"
+    if not base_url.startswith("/"):
+        base_url = f"/{base_url}"
+    return f"{base_url}{path}"
+
+
+def _hashed_name(stem: str, content: bytes, extension: str) -> str:
+    # Content-hashed names never change meaning, so they can be cached forever.
+    digest = hashlib.sha256(content).hexdigest()[:16]
+    return f"{BANNER_DIR}/{stem}-{digest}.{extension}"
+
+
+def _store(name: str, content: bytes) -> str:
+    if not default_storage.exists(name):
+        name = default_storage.save(name, ContentFile(content))
+    return media_url(name)
+
+
+def _encode_variant(image, size: tuple[int, int]) -> dict:
+    resized = image.copy()
+    resized.thumbnail(size, Image.Resampling.LANCZOS)
+    encoded = {}
+    for fmt, (extension, options) in BANNER_FORMATS.items():
+        buffer = io.BytesIO()
+        resized.save(buffer, format=fmt.upper(), **options)
+        encoded[fmt] = (extension, buffer.getvalue())
+    return {"width": resized.width, "height": resized.height, "encoded": encoded}
+
+
+def _open(content: bytes):
+    """``(image as RGB, extension for the detected format)``."""
+    try:
+        image = Image.open(io.BytesIO(content))
+        detected = image.format or ""
+        if image.width * image.height > BANNER_MAX_PIXELS:
+            raise BannerImageError("Banner image is too large.")
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    except (OSError, Image.DecompressionBombError) as exc:
+        raise BannerImageError(f"Unreadable banner image: {exc}") from None
+    if image.mode not in ("RGB", "L"):
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        if image.mode in ("RGBA", "LA") or "transparency" in image.info:
+            rgba = image.convert("RGBA")
+            background.paste(rgba, mask=rgba.getchannel("A"))
+        else:
+            background.paste(image.convert("RGB"))
+        image = background
+    return image.convert("RGB"), _ORIGINAL_EXTENSIONS.get(detected, detected.lower() or "bin")
+
+
+def process_banner(file_obj) -> tuple[str, dict]:
+    """
+    Store an uploaded banner and its resized variants.
+
+    Returns ``(original_url, variants)`` where ``variants`` maps each
+    ``BANNER_VARIANTS`` name to its size and one URL per ``BANNER_FORMATS``
+    entry. Every file name carries a hash of its bytes, so re-uploading the
+    same image reuses the stored files. The original's extension follows the
+    format Pillow detected, not the uploaded name. Without Pillow only the
+    original is stored (under the uploaded extension) and ``variants`` is
+    empty.
+    """
+    content = file_obj.read()
+    name = PurePosixPath(file_obj.name or "banner")
+    stem = get_valid_filename(name.stem or "banner")[:60]
+    if Image is None:
+        return _store(_hashed_name(stem, content, name.suffix.lstrip(".").lower() or "bin"), content), {}
+    image, extension = _open(content)
+    original = _store(_hashed_name(stem, content, extension), content)
+
+    futures = {
+        variant: _executor.submit(_encode_variant, image, size) for variant, size in BANNER_VARIANTS.items()
+    }
+    variants = {}
+    for variant, future in futures.items():
+        result = future.result()
+        entry = {"width": result["width"], "height": result["height"]}
+        for fmt, (extension, data) in result["encoded"].items():
+            entry[fmt] = _store(_hashed_name(f"{stem}-{variant}", data, extension), data)
+        variants[variant] = entry
+    return original, variants
@@ -0,0 +1,97 @@
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from events.models import Event, EventCategory, has_category
+
+PAGE_SIZE = 9
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the event list's category filter as JOIN + DISTINCT versus a correlated "
+        "EXISTS: query plan and median time of one page plus its count. Synthetic events "
+        "are created inside a transaction that is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--events", type=int, default=100_000, help="Synthetic events (default: 100000).")
+        parser.add_argument("--categories", type=int, default=10, help="Synthetic categories (default: 10).")
+        parser.add_argument("--runs", type=int, default=5, help="Timed runs per query (default: 5).")
+
+    def handle(self, *args, **options):
+        if options["events"] < 1 or options["categories"] < 1 or options["runs"] < 1:
+            raise CommandError("--events, --categories and --runs must be positive.")
+
+        with transaction.atomic():
+            category = self._seed(options["events"], options["categories"])
+            listing = Event.objects.order_by("start_date")
+            variants = {
+                "join + distinct": listing.filter(categories__id=category.id).distinct(),
+                "exists": listing.filter(has_category(id=category.id)),
+                "unfiltered + distinct": listing.distinct(),
+                "unfiltered": listing,
+            }
+            self.stdout.write(f"{connection.vendor}, {options['events']} events, {options['runs']} runs")
+            for label, queryset in variants.items():
+                self._report(label, queryset, options["runs"])
+            transaction.set_rollback(True)
+
+    def _seed(self, event_count: int, category_count: int) -> EventCategory:
+        categories = EventCategory.objects.bulk_create(
+            EventCategory(
+                name=f"benchmark-{index}",
+                display_name=f"Benchmark {index}",
+                distance_km=Decimal(5 + index),
+            )
+            for index in range(category_count)
+        )
+        start = date.today()
+        rng = random.Random(0)
+        events = Event.objects.bulk_create(
+            (
+                Event(
+                    title=f"Benchmark Run {index}",
+                    slug=f"benchmark-run-{index}",
+                    description="Synthetic event. " * 20,
+                    city=f"City {index % 500}",
+                    start_date=start + timedelta(days=index % 720),
+                    registration_deadline=start + timedelta(days=index % 720),
+                )
+                for index in range(event_count)
+            ),
+            batch_size=2000,
+        )
+        # One to three categories per event: the JOIN has duplicates to remove.
+        through = Event.categories.through
+        through.objects.bulk_create(
+            (
+                through(event_id=event.pk, eventcategory_id=category.pk)
+                for event in events
+                for category in rng.sample(categories, min(rng.randint(1, 3), len(categories)))
+            ),
+            batch_size=5000,
+        )
+        return categories[0]
+
+    def _report(self, label: str, queryset, runs: int) -> None:
+        def page():
+            list(queryset[:PAGE_SIZE])
+            return queryset.count()
+
+        total = page()  # warm-up
+        timings = []
+        for _ in range(runs):
+            began = time.perf_counter()
+            page()
+            timings.append(time.perf_counter() - began)
+        self.stdout.write(
+            self.style.SUCCESS(f"{label}: {statistics.median(timings) * 1000:.1f} ms median ({total} matches)")
+        )
+        for line in queryset[:PAGE_SIZE].explain().splitlines():
+            self.stdout.write(f"    {line}")
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from events.models import EventRecommendation
+from events.recommendations import USER_BATCH_SIZE, build_recommendations
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild every user's precomputed event recommendations served by "
+        "/api/events/recommended/. Run periodically (e.g. nightly, or after refresh_popularity)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--count",
+            type=int,
+            default=EventRecommendation.MAX_EVENTS,
+            help=f"Events stored per user (default and maximum: {EventRecommendation.MAX_EVENTS}).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=USER_BATCH_SIZE,
+            help=f"Users scored per matrix product (default: {USER_BATCH_SIZE}).",
+        )
+
+    def handle(self, *args, **options):
+        if not 1 <= options["count"] <= EventRecommendation.MAX_EVENTS or options["batch_size"] < 1:
+            raise CommandError(f"--count must be 1-{EventRecommendation.MAX_EVENTS} and --batch-size positive.")
+        stored = build_recommendations(options["count"], options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Stored recommendations for {stored} users."))
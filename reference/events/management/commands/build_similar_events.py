@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from events.models import SimilarEvent
+from events.similar import EVENT_BATCH_SIZE, NEIGHBOURS, build_similar_events
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the similar-events index shown on event detail pages. "
+        "Run periodically (e.g. nightly, or after importing events)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--neighbours",
+            type=int,
+            default=NEIGHBOURS,
+            help=f"Similar events stored per event (default: {NEIGHBOURS}, maximum: {SimilarEvent.MAX_NEIGHBOURS}).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=EVENT_BATCH_SIZE,
+            help=f"Events scored per matrix product (default: {EVENT_BATCH_SIZE}).",
+        )
+
+    def handle(self, *args, **options):
+        if not 1 <= options["neighbours"] <= SimilarEvent.MAX_NEIGHBOURS or options["batch_size"] < 1:
+            raise CommandError(f"--neighbours must be 1-{SimilarEvent.MAX_NEIGHBOURS} and --batch-size positive.")
+        stored = build_similar_events(options["neighbours"], options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Stored {stored} similar-event links."))
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from events.cache import invalidate_events
+from events.geo import encode_geohash, gazetteer
+from events.models import Event
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill event coordinates from the bundled offline gazetteer (events/data/gazetteer). "
+        "Run after importing events or extending the gazetteer. Coordinates entered by hand "
+        "are never replaced."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--overwrite",
+            action="store_true",
+            help="Re-locate every geocoded event, not only those without coordinates.",
+        )
+
+    def handle(self, *args, **options):
+        events = Event.objects.only(
+            "id", "city", "country", "latitude", "longitude", "location_source", "geohash"
+        ).exclude(location_source=Event.LocationSource.MANUAL)
+        if not options["overwrite"]:
+            events = events.filter(latitude__isnull=True)
+        places = gazetteer()
+        changed, missing = [], 0
+        for event in events.iterator(chunk_size=2000):
+            location = places.locate(event.city, event.country)
+            if location is None:
+                missing += 1
+                continue
+            if (event.latitude, event.longitude, event.location_source) != location:
+                event.latitude, event.longitude, event.location_source = location
+                event.geohash = encode_geohash(location.latitude, location.longitude)
+                changed.append(event)
+        Event.objects.bulk_update(
+            changed, ["latitude", "longitude", "location_source", "geohash"], batch_size=500
+        )
+        # bulk_update skips the post_save hook that drops cached events.
+        invalidate_events(event.pk for event in changed)
+        self.stdout.write(self.style.SUCCESS(f"Located {len(changed)} events; {missing} not in the gazetteer."))
@@ -13,6 +13,7 @@ from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 from django.utils.text import slugify
 
+from core.slugs import assign_slugs
 from events.models import Event, EventCategory
 
 
@@ -410,6 +411,14 @@ class Command(BaseCommand):
         updated = 0
         dry_run_messages = []
         category_cache: dict[str, EventCategory] = {}
+        # Slugs for every new event come from one collision query up front
+        # instead of a lookup per insert.
+        new_events: dict[str, Event] = {}
+        if not dry_run:
+            titles = {record.title for record in aggregated_events.values()}
+            existing_titles = set(Event.objects.filter(title__in=titles).values_list("title", flat=True))
+            new_events = {title: Event(title=title) for title in sorted(titles - existing_titles)}
+            assign_slugs(Event, new_events.values(), Event.slug_base)
 
         for record in aggregated_events.values():
             (
@@ -458,7 +467,7 @@ class Command(BaseCommand):
                     event = events_qs.first()
                     created_flag = False
                 else:
-                    event = Event(title=record.title)
+                    event = new_events.pop(record.title, None) or Event(title=record.title)
                     created_flag = True
 
                 for field, value in event_data.items():
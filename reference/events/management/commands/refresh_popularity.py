@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from events.popularity import POPULARITY_HALF_LIFE_DAYS, refresh_popularity
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Event.activity_score from recent registrations, detail-page views and "
+        f"forum activity, decayed with a {POPULARITY_HALF_LIFE_DAYS}-day half-life. Only events "
+        "whose score changed are written; schedule it every few minutes (e.g. cron */5)."
+    )
+
+    def handle(self, *args, **options):
+        changed = refresh_popularity()
+        self.stdout.write(self.style.SUCCESS(f"Updated popularity of {len(changed)} events."))
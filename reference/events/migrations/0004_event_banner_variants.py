@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_seed_event_categories'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='banner_variants',
+            field=models.JSONField(blank=True, default=dict, help_text='Resized copies of an uploaded banner: variant -> {width, height, webp, jpeg}.'),
+        ),
+    ]
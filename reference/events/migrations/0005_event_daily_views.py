@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_event_banner_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventDailyViews',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_views', to='events.event')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day'], name='events_even_day_8ebf82_idx')],
+                'constraints': [models.UniqueConstraint(fields=('event', 'day'), name='eventdailyviews_unique_event_day')],
+            },
+        ),
+    ]
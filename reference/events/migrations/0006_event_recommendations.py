@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('events', '0005_event_daily_views'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventRecommendation',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='event_recommendation', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('event_ids', models.JSONField(default=list)),
+                ('generated_at', models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:16
+
+from django.db import migrations, models
+
+
+def geocode_existing_events(apps, schema_editor):
+    from events.geo import encode_geohash, gazetteer
+
+    Event = apps.get_model("events", "Event")
+    located = []
+    for event in Event.objects.only("id", "city", "country").iterator(chunk_size=2000):
+        location = gazetteer().locate(event.city, event.country)
+        # Country centroids are recorded (and kept out of radius search) by 0011.
+        if location and location.precision == "city":
+            event.latitude, event.longitude = location.latitude, location.longitude
+            event.geohash = encode_geohash(location.latitude, location.longitude)
+            located.append(event)
+    Event.objects.bulk_update(located, ["latitude", "longitude", "geohash"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_similar_events'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='geohash',
+            field=models.CharField(blank=True, editable=False, max_length=12),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='latitude',
+            field=models.FloatField(blank=True, help_text='Leave latitude and longitude empty to look the city up in the bundled gazetteer.', null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['geohash'], name='events_even_geohash_c56732_idx'),
+        ),
+        migrations.RunPython(geocode_existing_events, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0009_event_status_start_date_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='activity_score',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
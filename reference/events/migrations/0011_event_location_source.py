@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:17
+
+from django.db import migrations, models
+
+
+def record_location_sources(apps, schema_editor):
+    """
+    Mark coordinates that match the gazetteer as geocoded (city or country
+    centroid) and any others as entered by hand; geocode events still
+    without coordinates.
+    """
+    from events.geo import encode_geohash, gazetteer
+
+    Event = apps.get_model("events", "Event")
+    changed = []
+    events = Event.objects.only("id", "city", "country", "latitude", "longitude", "geohash")
+    for event in events.iterator(chunk_size=2000):
+        location = gazetteer().locate(event.city, event.country)
+        if event.latitude is None or event.longitude is None:
+            if location is None:
+                continue
+            event.latitude, event.longitude = location.latitude, location.longitude
+            event.geohash = encode_geohash(location.latitude, location.longitude)
+        if location and (event.latitude, event.longitude) == (location.latitude, location.longitude):
+            event.location_source = location.precision
+        else:
+            event.location_source = "manual"
+        changed.append(event)
+    Event.objects.bulk_update(changed, ["latitude", "longitude", "location_source", "geohash"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0010_event_activity_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='location_source',
+            field=models.CharField(blank=True, choices=[('manual', 'Entered by hand'), ('city', 'Gazetteer city'), ('country', 'Gazetteer country centroid')], editable=False, max_length=10),
+        ),
+        migrations.RunPython(record_location_sources, migrations.RunPython.noop),
+    ]
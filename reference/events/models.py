@@ -1,7 +1,11 @@
+from django.conf import settings
 from django.db import models
 from django.urls import NoReverseMatch, reverse
 from django.utils.text import slugify
 
+from core.slugs import save_with_unique_slug
+from .geo import encode_geohash, gazetteer
+
 
 class EventCategory(models.Model):
     """Represents a single race category inside an event (e.g., 5K, 21K)."""
@@ -25,12 +29,26 @@ class Event(models.Model):
         ONGOING = "ongoing", "Ongoing"
         COMPLETED = "completed", "Completed"
 
+    class LocationSource(models.TextChoices):
+        MANUAL = "manual", "Entered by hand"
+        CITY = "city", "Gazetteer city"
+        COUNTRY = "country", "Gazetteer country centroid"
+
     title = models.CharField(max_length=200)
     slug = models.SlugField(max_length=220, unique=True, editable=False)
     description = models.TextField()
     city = models.CharField(max_length=120)
     country = models.CharField(max_length=120, default="Indonesia")
     venue = models.CharField(max_length=150, blank=True)
+    latitude = models.FloatField(
+        blank=True,
+        null=True,
+        help_text="Leave latitude and longitude empty to look the city up in the bundled gazetteer.",
+    )
+    longitude = models.FloatField(blank=True, null=True)
+    # Empty while the event has no coordinates.
+    location_source = models.CharField(max_length=10, choices=LocationSource.choices, blank=True, editable=False)
+    geohash = models.CharField(max_length=12, blank=True, editable=False)
     start_date = models.DateField()
     end_date = models.DateField(blank=True, null=True)
     registration_open_date = models.DateField(blank=True, null=True)
@@ -40,11 +58,19 @@ class Event(models.Model):
         choices=Status.choices,
         default=Status.UPCOMING,
     )
+    # Baseline set by the race importer or an admin (e.g. past finishers).
     popularity_score = models.PositiveIntegerField(default=0)
+    # Decayed recent activity, maintained by events.popularity.refresh_popularity.
+    activity_score = models.PositiveIntegerField(default=0, editable=False)
     participant_limit = models.PositiveIntegerField(default=0)
     registered_count = models.PositiveIntegerField(default=0)
     featured = models.BooleanField(default=False)
     banner_image = models.URLField(blank=True)
+    banner_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Resized copies of an uploaded banner: variant -> {width, height, webp, jpeg}.",
+    )
     categories = models.ManyToManyField(EventCategory, related_name="events", blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -52,24 +78,78 @@ class Event(models.Model):
     class Meta:
         ordering = ["start_date", "title"]
         indexes = [
-            models.Index(fields=["status"]),
+            models.Index(fields=["status", "start_date"]),
             models.Index(fields=["start_date"]),
             models.Index(fields=["city"]),
+            models.Index(fields=["geohash"]),
         ]
 
+    # "Most popular first": recent activity, the baseline breaking ties.
+    POPULARITY_ORDERING = ("-activity_score", "-popularity_score")
+
+    LOCATION_FIELDS_ORDER = ("city", "country", "latitude", "longitude")
+    LOCATION_FIELDS = frozenset(LOCATION_FIELDS_ORDER)
+
     def __str__(self) -> str:
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        event = super().from_db(db, field_names, values)
+        # Dates as loaded, so saving a moved event can also invalidate the
+        # calendar months it left (events.signals).
+        event._loaded_dates = (event.__dict__.get("start_date"), event.__dict__.get("end_date"))
+        event._remember_location()
+        return event
+
+    def _remember_location(self) -> None:
+        # Location as loaded or last saved, so locate() can tell a moved
+        # event from coordinates typed in by hand.
+        if self.LOCATION_FIELDS.issubset(self.__dict__):
+            self._loaded_location = tuple(self.__dict__[field] for field in self.LOCATION_FIELDS_ORDER)
+
+    def slug_base(self) -> str:
+        return slugify(self.title) or "event"
+
+    def locate(self) -> None:
+        """
+        Keep coordinates, ``location_source`` and ``geohash`` in sync.
+
+        Coordinates set or changed by hand are kept (``MANUAL``). Missing
+        ones are looked up in the gazetteer, and geocoded ones are looked up
+        again when the city or country changes.
+        """
+        loaded = getattr(self, "_loaded_location", None)
+        point = (self.latitude, self.longitude)
+        if None in point:
+            self.location_source = ""
+        elif (loaded is None and self._state.adding) or (loaded is not None and point != loaded[2:]):
+            self.location_source = self.LocationSource.MANUAL
+        elif (
+            self.location_source != self.LocationSource.MANUAL
+            and loaded is not None
+            and (self.city, self.country) != loaded[:2]
+        ):
+            point = (None, None)
+        if None in point:
+            location = gazetteer().locate(self.city, self.country)
+            self.latitude, self.longitude, self.location_source = location or (None, None, "")
+        if self.latitude is None or self.longitude is None:
+            self.geohash = ""
+        else:
+            self.geohash = encode_geohash(self.latitude, self.longitude)
+
     def save(self, *args, **kwargs):
-        if not self.slug:
-            base_slug = slugify(self.title)
-            slug = base_slug
-            counter = 1
-            while Event.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or self.LOCATION_FIELDS.intersection(update_fields):
+            self.locate()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "latitude", "longitude", "location_source", "geohash"}
+        if self.slug:
+            super().save(*args, **kwargs)
+        else:
+            save_with_unique_slug(self, self.slug_base(), lambda: super(Event, self).save(*args, **kwargs))
+        self._remember_location()
 
     def get_absolute_url(self):
         try:
@@ -94,3 +174,73 @@ class Event(models.Model):
             return (self.end_date - self.start_date).days + 1
         return None
 
+
+class EventDailyViews(models.Model):
+    """Detail-page views of an event per day, an input to its popularity score."""
+
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="daily_views")
+    day = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["event", "day"], name="eventdailyviews_unique_event_day"),
+        ]
+        indexes = [models.Index(fields=["day"])]
+
+    def __str__(self) -> str:
+        return f"{self.event_id} {self.day}: {self.views}"
+
+
+class EventRecommendation(models.Model):
+    """A user's precomputed "events for you" list, best first (see events.recommendations)."""
+
+    MAX_EVENTS = 20
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="event_recommendation",
+    )
+    event_ids = models.JSONField(default=list)
+    generated_at = models.DateTimeField()
+
+    def __str__(self) -> str:
+        return f"{self.user_id}: {len(self.event_ids)} events"
+
+
+class SimilarEvent(models.Model):
+    """One of an event's precomputed nearest neighbours (see events.similar)."""
+
+    MAX_NEIGHBOURS = 12
+
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="similar_links")
+    similar = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="+")
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ["event", "rank"]
+        constraints = [
+            models.UniqueConstraint(fields=["event", "rank"], name="similarevent_unique_event_rank"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.event_id} #{self.rank}: {self.similar_id} ({self.score:.2f})"
+
+
+def has_category(**lookups) -> models.Exists:
+    """
+    Correlated ``EXISTS`` over an event's categories, for ``.filter()``.
+
+    Unlike ``filter(categories__...)`` it cannot duplicate events with several
+    matching categories, so list queries need no ``DISTINCT`` over every
+    selected column. Lookups are relative to the category, e.g.
+    ``has_category(id=3)`` or ``has_category(distance_km=10)``.
+    """
+    lookups = {
+        "eventcategory_id" if key in ("id", "pk") else f"eventcategory__{key}": value
+        for key, value in lookups.items()
+    }
+    return models.Exists(Event.categories.through.objects.filter(event_id=models.OuterRef("pk"), **lookups))
@@ -0,0 +1,62 @@
+from functools import reduce
+from operator import or_
+
+import numpy as np
+from django.db.models import Q
+
+from .geo import GEOHASH_ALPHABET, bounding_box, covering_prefixes, haversine_km
+from .models import Event
+
+NEARBY_RADIUS_KM = 50
+NEARBY_MAX_RADIUS_KM = 500
+NEARBY_LIMIT = 20
+
+
+def _prefix_range(prefix: str) -> Q:
+    """
+    ``geohash`` values starting with ``prefix`` as a plain range, which any
+    B-tree index (and any collation) serves, unlike ``LIKE 'prefix%'``.
+    """
+    stem = prefix.rstrip(GEOHASH_ALPHABET[-1])
+    if not stem:
+        return Q(geohash__gte=prefix)
+    upper = stem[:-1] + GEOHASH_ALPHABET[GEOHASH_ALPHABET.index(stem[-1]) + 1]
+    return Q(geohash__gte=prefix, geohash__lt=upper)
+
+
+def _within_box(latitude: float, longitude: float, radius_km: float) -> Q:
+    """Bounding box of the circle, split in two where it crosses the antimeridian."""
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+    box = Q(latitude__range=(min_lat, max_lat))
+    if min_lon < -180:
+        return box & (Q(longitude__gte=min_lon + 360) | Q(longitude__lte=max_lon))
+    if max_lon > 180:
+        return box & (Q(longitude__gte=min_lon) | Q(longitude__lte=max_lon - 360))
+    return box & Q(longitude__range=(min_lon, max_lon))
+
+
+def events_near(latitude: float, longitude: float, radius_km: float, queryset=None) -> list[tuple[int, float]]:
+    """
+    ``(event_id, distance_km)`` of the events within ``radius_km``, closest first.
+
+    The geohash index narrows the search to a few cells around the point
+    and the bounding box trims the cells' corners in the same query; exact
+    great-circle distances are then computed for those candidates only. Works the same on SQLite and PostgreSQL, no spatial extension
+    needed. Events without coordinates, or placed at a country's centroid
+    for want of a known city, never match.
+    """
+    queryset = (queryset if queryset is not None else Event.objects.all()).exclude(
+        location_source=Event.LocationSource.COUNTRY
+    )
+    prefixes = covering_prefixes(latitude, longitude, radius_km)
+    cover = reduce(or_, map(_prefix_range, prefixes)) if prefixes else ~Q(geohash="")
+    candidates = queryset.filter(cover, _within_box(latitude, longitude, radius_km)).order_by()
+    rows = list(candidates.values_list("pk", "latitude", "longitude"))
+    if not rows:
+        return []
+    ids = np.array([row[0] for row in rows])
+    points = np.array([row[1:] for row in rows], dtype=float)
+    distances = haversine_km(latitude, longitude, points[:, 0], points[:, 1])
+    inside = np.flatnonzero(distances <= radius_km)
+    order = inside[np.lexsort((ids[inside], distances[inside]))]
+    return [(int(ids[index]), float(distances[index])) for index in order]
@@ -0,0 +1,112 @@
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from forum.models import ForumPost, ForumThread
+from registrations.models import EventRegistration
+from .cache import invalidate_events
+from .models import Event, EventDailyViews
+
+# Points per signal before decay: a registration outweighs a thread, which
+# outweighs a reply, which outweighs a page view.
+POPULARITY_WEIGHTS = {
+    "registrations": 10,
+    "threads": 4,
+    "posts": 2,
+    "views": 1,
+}
+# Activity loses half its weight every half-life; after WINDOW_HALF_LIVES it
+# counts for less than 1/16 and is ignored.
+POPULARITY_HALF_LIFE_DAYS = getattr(settings, "POPULARITY_HALF_LIFE_DAYS", 7)
+WINDOW_HALF_LIVES = 4
+
+
+def record_event_view(event_id: int) -> None:
+    """Count one detail-page view of ``event_id`` for today."""
+    day = timezone.localdate()
+    views = EventDailyViews.objects.filter(event_id=event_id, day=day)
+    if views.update(views=F("views") + 1):
+        return
+    try:
+        with transaction.atomic():
+            EventDailyViews.objects.create(event_id=event_id, day=day, views=1)
+    except IntegrityError:
+        # Another request created today's row first.
+        views.update(views=F("views") + 1)
+
+
+def _daily(queryset, event_field: str, timestamp_field: str, value=Count("pk")):
+    """``(event_id, day, amount)`` rows, aggregated in the database."""
+    return (
+        queryset.annotate(day=TruncDate(timestamp_field))
+        .values_list(event_field, "day")
+        .annotate(amount=value)
+        .order_by()
+    )
+
+
+def compute_scores(today: Optional[date] = None, half_life_days: float = POPULARITY_HALF_LIFE_DAYS) -> dict[int, int]:
+    """
+    Decayed popularity of every event with activity in the scoring window.
+
+    Each signal is aggregated per event and day in one query; a day's total
+    is weighted by ``0.5 ** (age_in_days / half_life_days)``.
+    """
+    today = today or timezone.localdate()
+    since = today - timedelta(days=int(half_life_days * WINDOW_HALF_LIVES))
+    start = timezone.make_aware(datetime.combine(since, time.min))
+    signals = {
+        "registrations": _daily(
+            EventRegistration.objects.filter(created_at__gte=start).exclude(
+                status__in=[EventRegistration.Status.CANCELLED, EventRegistration.Status.REJECTED]
+            ),
+            "event_id",
+            "created_at",
+        ),
+        "threads": _daily(ForumThread.objects.filter(created_at__gte=start), "event_id", "created_at"),
+        "posts": _daily(ForumPost.objects.filter(created_at__gte=start), "thread__event_id", "created_at"),
+        "views": (
+            EventDailyViews.objects.filter(day__gte=since)
+            .values_list("event_id", "day")
+            .annotate(amount=Sum("views"))
+            .order_by()
+        ),
+    }
+    scores = defaultdict(float)
+    for signal, rows in signals.items():
+        weight = POPULARITY_WEIGHTS[signal]
+        for event_id, day, amount in rows:
+            age = max((today - day).days, 0)
+            scores[event_id] += weight * amount * 0.5 ** (age / half_life_days)
+    return {event_id: round(score) for event_id, score in scores.items()}
+
+
+def refresh_popularity(today: Optional[date] = None) -> list[int]:
+    """
+    Recompute ``Event.activity_score`` and return the ids that changed.
+
+    ``popularity_score`` (the importer's or an admin's baseline) is left
+    alone; popularity ordering uses both (``Event.POPULARITY_ORDERING``).
+
+    Only events with activity in the window, or with a score left to decay
+    to zero, are loaded, and only changed rows are written (``bulk_update``),
+    so the job is cheap enough to run every few minutes.
+    """
+    scores = compute_scores(today)
+    changed = []
+    candidates = Event.objects.filter(Q(pk__in=list(scores)) | Q(activity_score__gt=0))
+    for event in candidates.only("id", "activity_score").iterator(chunk_size=2000):
+        score = scores.get(event.pk, 0)
+        if event.activity_score != score:
+            event.activity_score = score
+            changed.append(event)
+    Event.objects.bulk_update(changed, ["activity_score"], batch_size=500)
+    # bulk_update skips the post_save hook that drops cached events.
+    invalidate_events(event.pk for event in changed)
+    return [event.pk for event in changed]
@@ -0,0 +1,140 @@
+from collections import defaultdict
+
+import numpy as np
+from django.utils import timezone
+
+from forum.models import ForumPost, ForumThread
+from profiles.models import UserProfile, UserRaceHistory
+from registrations.models import EventRegistration
+from .features import DISTANCE_BUCKETS, encode_events, normalize_rows
+from .models import Event, EventRecommendation
+
+# Relative pull of each signal on a user's taste vector.
+SIGNAL_WEIGHTS = {
+    "favorite_distance": 1.0,
+    "history": 1.0,
+    "forum": 0.5,
+    "country": 0.5,
+    "popularity": 0.3,
+}
+# Added to the cosine score of events in the runner's own city.
+CITY_BONUS = 0.15
+USER_BATCH_SIZE = 512
+
+
+def _mean_rows(features, pairs, user_index) -> np.ndarray:
+    """Per-user mean of the feature rows of the ``(user_id, event_id)`` pairs."""
+    sums = np.zeros((len(user_index), features.matrix.shape[1]), dtype=np.float32)
+    pairs = [(user_index[user_id], event_id) for user_id, event_id in pairs if user_id in user_index]
+    if not pairs:
+        return sums
+    users, events = np.array(pairs).T
+    np.add.at(sums, users, features.matrix[features.rows(events)])
+    counts = np.bincount(users, minlength=len(user_index)).astype(np.float32)[:, None]
+    return np.divide(sums, counts, out=sums, where=counts > 0)
+
+
+def _taste_vectors(features, profiles: list[tuple], user_index) -> np.ndarray:
+    """One unit-length taste vector per user, in the event feature space."""
+    width = features.matrix.shape[1]
+    favorite = np.zeros((len(profiles), width), dtype=np.float32)
+    country = np.zeros((len(profiles), width), dtype=np.float32)
+    bucket_index = {name: index for index, (name, _) in enumerate(DISTANCE_BUCKETS)}
+    country_index = {name.casefold(): index for index, name in enumerate(features.countries)}
+    for row, (_, favorite_distance, _, profile_country) in enumerate(profiles):
+        if favorite_distance in bucket_index:
+            favorite[row, features.blocks["distance"].start + bucket_index[favorite_distance]] = 1
+        if profile_country and profile_country.casefold() in country_index:
+            country[row, features.blocks["country"].start + country_index[profile_country.casefold()]] = 1
+
+    history = UserRaceHistory.objects.values_list("profile__user_id", "event_id")
+    forum = set(ForumThread.objects.values_list("author_id", "event_id"))
+    forum.update(ForumPost.objects.values_list("author_id", "thread__event_id"))
+
+    taste = (
+        SIGNAL_WEIGHTS["favorite_distance"] * favorite
+        + SIGNAL_WEIGHTS["history"] * _mean_rows(features, history, user_index)
+        + SIGNAL_WEIGHTS["forum"] * _mean_rows(features, forum, user_index)
+        + SIGNAL_WEIGHTS["country"] * country
+    )
+    has_signal = taste.any(axis=1)
+    taste[:, features.blocks["popularity"]] += SIGNAL_WEIGHTS["popularity"]
+    taste = normalize_rows(taste)
+    # Users with no signal at all are left to the endpoint's popular fallback.
+    taste[~has_signal] = 0
+    return taste
+
+
+def build_recommendations(count: int = EventRecommendation.MAX_EVENTS, batch_size: int = USER_BATCH_SIZE) -> int:
+    """
+    Recompute every user's top ``count`` upcoming events and store them.
+
+    Users and events are both encoded as vectors in one feature space; a
+    batch of users is scored against all candidate events with one matrix
+    product, events the user already entered are masked out and the top
+    ``count`` are picked with ``argpartition``. Returns the number of users
+    stored.
+    """
+    today = timezone.localdate()
+    features = encode_events()
+    candidates = Event.objects.filter(start_date__gte=today).exclude(status=Event.Status.COMPLETED)
+    candidate_rows = features.rows(np.array(sorted(candidates.values_list("pk", flat=True)), dtype=np.int64))
+    if not len(candidate_rows):
+        EventRecommendation.objects.all().delete()
+        return 0
+    candidate_ids = features.ids[candidate_rows]
+    candidate_matrix = features.matrix[candidate_rows]
+    candidate_column = {int(event_id): column for column, event_id in enumerate(candidate_ids)}
+    columns_by_city = defaultdict(list)
+    for column, row in enumerate(candidate_rows):
+        columns_by_city[features.cities[row].casefold()].append(column)
+
+    profiles = list(UserProfile.objects.values_list("user_id", "favorite_distance", "city", "country"))
+    user_index = {profile[0]: index for index, profile in enumerate(profiles)}
+    taste = _taste_vectors(features, profiles, user_index)
+
+    entered = defaultdict(set)
+    for rows in (
+        EventRegistration.objects.filter(event__in=candidates).values_list("user_id", "event_id"),
+        UserRaceHistory.objects.filter(event__in=candidates).values_list("profile__user_id", "event_id"),
+    ):
+        for user_id, event_id in rows:
+            entered[user_id].add(event_id)
+
+    now = timezone.now()
+    stored = []
+    top = min(count, len(candidate_ids))
+    for start in range(0, len(profiles), batch_size):
+        batch = profiles[start:start + batch_size]
+        batch_taste = taste[start:start + batch_size]
+        active = batch_taste.any(axis=1)
+        scores = batch_taste @ candidate_matrix.T
+        for offset, (user_id, _, city, _) in enumerate(batch):
+            if not active[offset]:
+                continue
+            if city:
+                scores[offset, columns_by_city.get(city.casefold(), [])] += CITY_BONUS
+            taken = [candidate_column[event_id] for event_id in entered.get(user_id, ())]
+            scores[offset, taken] = -np.inf
+        best = np.argpartition(-scores, top - 1, axis=1)[:, :top]
+        best_scores = np.take_along_axis(scores, best, axis=1)
+        ranked = np.take_along_axis(best, np.argsort(-best_scores, axis=1, kind="stable"), axis=1)
+        for offset, (user_id, _, _, _) in enumerate(batch):
+            if not active[offset]:
+                continue
+            row = ranked[offset]
+            row = row[np.isfinite(scores[offset, row])]
+            stored.append(
+                EventRecommendation(user_id=user_id, event_ids=candidate_ids[row].tolist(), generated_at=now)
+            )
+
+    EventRecommendation.objects.bulk_create(
+        stored,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=["event_ids", "generated_at"],
+    )
+    # Users who lost every signal since the last run.
+    EventRecommendation.objects.filter(generated_at__lt=now).delete()
+    return len(stored)
@@ -0,0 +1,39 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_events
+from .calendar import invalidate_calendar
+from .models import Event, EventCategory
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_event_cache(sender, instance, **kwargs):
+    invalidate_events([instance.pk])
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_event_calendar(sender, instance, **kwargs):
+    dates = (instance.start_date, instance.end_date)
+    invalidate_calendar([dates, getattr(instance, "_loaded_dates", (None, None))])
+    instance._loaded_dates = dates
+
+
+@receiver(m2m_changed, sender=Event.categories.through)
+def invalidate_event_categories_cache(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        invalidate_events([instance.pk])
+    elif pk_set:
+        invalidate_events(pk_set)
+    else:
+        # category.events.clear(): the affected events are gone from pk_set.
+        invalidate_events()
+
+
+@receiver(post_save, sender=EventCategory)
+@receiver(post_delete, sender=EventCategory)
+def invalidate_category_cache(sender, instance, **kwargs):
+    invalidate_events()
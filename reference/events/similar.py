@@ -0,0 +1,75 @@
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from .features import encode_events
+from .models import Event, SimilarEvent
+
+# Feature blocks compared between events; popularity is left out so that
+# small races still surface next to big ones.
+SIMILARITY_BLOCKS = ("distance", "country", "duration", "season")
+SIMILARITY_WEIGHTS = {
+    "distance": 1.0,
+    "country": 0.8,
+    "duration": 0.4,
+    "season": 0.6,
+}
+NEIGHBOURS = 6
+EVENT_BATCH_SIZE = 1024
+
+
+def build_similar_events(k: int = NEIGHBOURS, batch_size: int = EVENT_BATCH_SIZE) -> int:
+    """
+    Recompute every event's ``k`` most similar upcoming events and store them.
+
+    Events are encoded once into a unit-length feature matrix; a batch of
+    ``batch_size`` events is scored against all candidates with one matrix
+    product (cosine similarity), each event's own column is masked and the
+    top ``k`` are picked with ``argpartition``, so memory stays at
+    ``batch_size x candidates`` floats. The table is replaced in one
+    transaction. Returns the number of rows stored.
+    """
+    features = encode_events(weights=SIMILARITY_WEIGHTS, blocks=SIMILARITY_BLOCKS)
+    candidates = Event.objects.filter(start_date__gte=timezone.localdate()).exclude(status=Event.Status.COMPLETED)
+    candidate_rows = features.rows(np.array(sorted(candidates.values_list("pk", flat=True)), dtype=np.int64))
+    candidate_ids = features.ids[candidate_rows]
+    candidate_matrix = features.matrix[candidate_rows]
+    # Column of each event among the candidates, or -1.
+    candidate_column = np.full(len(features.ids), -1)
+    candidate_column[candidate_rows] = np.arange(len(candidate_rows))
+
+    stored = []
+    top = min(k, len(candidate_ids))
+    for start in range(0, len(features.ids) if top > 0 else 0, batch_size):
+        stop = min(start + batch_size, len(features.ids))
+        scores = features.matrix[start:stop] @ candidate_matrix.T
+        own = candidate_column[start:stop]
+        is_candidate = own >= 0
+        scores[np.flatnonzero(is_candidate), own[is_candidate]] = -np.inf
+        best = np.argpartition(-scores, top - 1, axis=1)[:, :top]
+        best_scores = np.take_along_axis(scores, best, axis=1)
+        order = np.argsort(-best_scores, axis=1, kind="stable")
+        best = np.take_along_axis(best, order, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        for offset, event_id in enumerate(features.ids[start:stop].tolist()):
+            for rank, (column, score) in enumerate(zip(best[offset].tolist(), best_scores[offset].tolist()), 1):
+                # Drops the masked self-match and unrelated events.
+                if score > 0:
+                    stored.append(
+                        SimilarEvent(event_id=event_id, similar_id=int(candidate_ids[column]), rank=rank, score=score)
+                    )
+
+    with transaction.atomic():
+        SimilarEvent.objects.all().delete()
+        SimilarEvent.objects.bulk_create(stored, batch_size=1000)
+    return len(stored)
+
+
+def similar_events(event_id: int, limit: int = NEIGHBOURS) -> list[Event]:
+    """An event's stored neighbours, most similar first, in one query."""
+    links = (
+        SimilarEvent.objects.filter(event_id=event_id)
+        .select_related("similar")
+        .order_by("rank")[:limit]
+    )
+    return [link.similar for link in links]
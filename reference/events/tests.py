@@ -1,7 +1,9 @@
-from datetime import timedelta
+from datetime import date, timedelta
 from decimal import Decimal
+from io import StringIO
 
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.test import TestCase
 from django.urls import reverse
 from django.utils import timezone
@@ -12,6 +14,20 @@ from events.models import Event, EventCategory
 User = get_user_model()
 
 
+def _event(title, category=None, days=30, **extra):
+    """An event ``days`` from today, open for registration until ten days before."""
+    start = extra.pop("start_date", None) or timezone.localdate() + timedelta(days=days)
+    event = Event.objects.create(
+        title=title,
+        start_date=start,
+        registration_deadline=start - timedelta(days=10),
+        **{"description": "Run", "city": "Jakarta", **extra},
+    )
+    if category is not None:
+        event.categories.add(category)
+    return event
+
+
 class EventCategoryModelTests(TestCase):
     """Tests for EventCategory model."""
 
@@ -799,3 +815,727 @@ class EventFilterFormTests(TestCase):
         )
 
 
+class LeaderboardApiTests(TestCase):
+    """Tests for the event and distance leaderboard endpoints."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from core.cache import TwoTierCache
+        from profiles.models import UserProfile, UserRaceHistory
+
+        cache.clear()
+        TwoTierCache.clear_all_local()
+        self.today = timezone.localdate()
+        self.category = EventCategory.objects.create(
+            name="board-10k", display_name="Board 10K", distance_km=Decimal("10.00")
+        )
+        self.event = Event.objects.create(
+            title="Board Run",
+            city="Jakarta",
+            start_date=self.today - timedelta(days=7),
+            registration_deadline=self.today - timedelta(days=14),
+            status=Event.Status.COMPLETED,
+        )
+        self.other_event = Event.objects.create(
+            title="Board Run II",
+            city="Jakarta",
+            start_date=self.today - timedelta(days=3),
+            registration_deadline=self.today - timedelta(days=10),
+        )
+        self.profiles = []
+        for index, minutes in enumerate([50, 45, 45, 60]):
+            user = User.objects.create_user(username=f"boardrunner{index}", password="password123")
+            profile = UserProfile.objects.get(user=user)
+            self.profiles.append(profile)
+            UserRaceHistory.objects.create(
+                profile=profile,
+                event=self.event,
+                category="Board 10K",
+                status=UserRaceHistory.Status.COMPLETED,
+                finish_time=timedelta(minutes=minutes),
+            )
+        # A non-finisher never appears on the board.
+        UserRaceHistory.objects.create(
+            profile=self.profiles[0],
+            event=self.other_event,
+            category="Board 10K",
+            status=UserRaceHistory.Status.DNF,
+        )
+        self.url = reverse("events_api:leaderboard", args=[self.event.id])
+
+    def test_event_leaderboard_ranks_with_ties(self):
+        response = self.client.get(self.url, {"category": "Board 10K"})
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(
+            [(row["rank"], row["username"]) for row in payload["results"]],
+            [(1, "boardrunner1"), (1, "boardrunner2"), (3, "boardrunner0"), (4, "boardrunner3")],
+        )
+        self.assertEqual(payload["total"], 4)
+        self.assertIsNone(payload["me"])
+
+    def test_event_leaderboard_paginates_and_reports_my_rank(self):
+        from unittest.mock import patch
+
+        self.client.login(username="boardrunner3", password="password123")
+        with patch("events.api_views.LEADERBOARD_PAGE_SIZE", 2):
+            payload = self.client.get(self.url, {"page": 2}).json()
+
+        self.assertEqual(payload["category"], "Board 10K")
+        self.assertEqual([row["rank"] for row in payload["results"]], [3, 4])
+        self.assertFalse(payload["has_next"])
+        self.assertEqual(payload["me"], {"rank": 4, "finish_time": 3600.0})
+
+    def test_completed_event_pages_are_cached_and_invalidated(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from profiles.models import UserRaceHistory
+
+        self.client.get(self.url, {"category": "Board 10K"})
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(self.url, {"category": "Board 10K"})
+        self.assertFalse(any("profiles_userracehistory" in q["sql"] for q in ctx.captured_queries))
+
+        UserRaceHistory.objects.filter(profile=self.profiles[3], event=self.event).get().delete()
+        payload = self.client.get(self.url, {"category": "Board 10K"}).json()
+        self.assertEqual(payload["total"], 3)
+
+    def test_distance_leaderboard_uses_personal_bests(self):
+        from profiles.models import UserRaceHistory
+
+        UserRaceHistory.objects.create(
+            profile=self.profiles[3],
+            event=self.other_event,
+            category="Board 10K",
+            status=UserRaceHistory.Status.COMPLETED,
+            finish_time=timedelta(minutes=40),
+        )
+        self.client.login(username="boardrunner0", password="password123")
+        response = self.client.get(reverse("events_api:distance-leaderboard", args=["10"]))
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(
+            [(row["rank"], row["username"]) for row in payload["results"]],
+            [(1, "boardrunner3"), (2, "boardrunner1"), (2, "boardrunner2"), (4, "boardrunner0")],
+        )
+        self.assertEqual(payload["me"], {"rank": 4, "finish_time": 3000.0})
+        for distance in ("abc", "nan", "inf", "-Infinity", "sNaN"):
+            self.assertEqual(
+                self.client.get(reverse("events_api:distance-leaderboard", args=[distance])).status_code, 404
+            )
+
+
+def _png_bytes(width=40, height=20):
+    """A minimal solid-colour RGB PNG, built without Pillow."""
+    import struct
+    import zlib
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    rows = b"".join(b"\x00" + b"\xcc\x33\x00" * width for _ in range(height))
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b"")
+
+
+class BannerImageTests(TestCase):
+    """Tests for banner uploads: content-hashed originals and resized variants."""
+
+    def setUp(self):
+        import tempfile
+
+        from django.test import override_settings
+
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        User.objects.create_user(username="banneradmin", password="password123", is_staff=True)
+        self.client.login(username="banneradmin", password="password123")
+        self.payload = {
+            "title": "Banner Run",
+            "description": "With a banner",
+            "city": "Jakarta",
+            "status": "upcoming",
+            "start_date": (timezone.localdate() + timedelta(days=30)).isoformat(),
+            "registration_deadline": (timezone.localdate() + timedelta(days=10)).isoformat(),
+        }
+
+    def _create(self, content, name="Banner Photo.png"):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        upload = SimpleUploadedFile(name, content, content_type="image/png")
+        return self.client.post(reverse("events_admin_api:events"), {**self.payload, "banner_image": upload})
+
+    def test_upload_uses_content_hashed_names(self):
+        import re
+
+        from events.images import Image
+
+        first = self._create(_png_bytes())
+        second = self._create(_png_bytes())
+
+        self.assertEqual(first.status_code, 201)
+        banner = first.json()["banner_image"]
+        self.assertRegex(banner, r"/media/event_banners/Banner_Photo-[0-9a-f]{16}\.png$")
+        # Same bytes, same file: the URL can be cached as immutable.
+        self.assertEqual(second.json()["banner_image"], banner)
+
+        variants = first.json()["banner_variants"]
+        if Image is None:
+            self.assertEqual(variants, {})
+        else:
+            self.assertEqual(set(variants), {"thumb", "card", "hero"})
+            self.assertEqual((variants["thumb"]["width"], variants["thumb"]["height"]), (40, 20))
+            self.assertTrue(re.search(r"-thumb-[0-9a-f]{16}\.webp$", variants["thumb"]["webp"]))
+            self.assertTrue(variants["hero"]["jpeg"].startswith("http://testserver/media/"))
+
+    def test_variants_are_downscaled_to_fit(self):
+        from events.images import Image
+
+        if Image is None:
+            self.skipTest("Pillow is not installed.")
+        variants = self._create(_png_bytes(2000, 1000)).json()["banner_variants"]
+        self.assertEqual((variants["thumb"]["width"], variants["thumb"]["height"]), (320, 160))
+        self.assertEqual((variants["card"]["width"], variants["card"]["height"]), (800, 400))
+        self.assertEqual((variants["hero"]["width"], variants["hero"]["height"]), (1600, 800))
+
+    def test_original_is_named_after_its_detected_format(self):
+        from events.images import Image
+
+        if Image is None:
+            self.skipTest("Pillow is not installed.")
+        banner = self._create(_png_bytes(), name="banner.jpg").json()["banner_image"]
+        self.assertRegex(banner, r"/event_banners/banner-[0-9a-f]{16}\.png$")
+
+    def test_unreadable_upload_is_rejected(self):
+        from events.images import Image
+
+        if Image is None:
+            self.skipTest("Pillow is not installed.")
+        response = self._create(b"not an image")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("banner_image", response.json()["errors"])
+        self.assertFalse(Event.objects.filter(title="Banner Run").exists())
+
+    def test_external_banner_url_clears_variants(self):
+        event = Event.objects.create(
+            title="Variant Run",
+            city="Jakarta",
+            start_date=timezone.localdate() + timedelta(days=30),
+            registration_deadline=timezone.localdate() + timedelta(days=10),
+            banner_image="/media/event_banners/old.png",
+            banner_variants={"thumb": {"width": 320, "height": 180, "webp": "/media/event_banners/old-thumb.webp"}},
+        )
+
+        summary = self.client.get(reverse("events_api:detail", args=[event.id])).json()
+        self.assertEqual(
+            summary["banner_variants"]["thumb"]["webp"], "http://testserver/media/event_banners/old-thumb.webp"
+        )
+
+        response = self.client.patch(
+            reverse("events_admin_api:event-detail", args=[event.id]),
+            data='{"banner_image": "https://cdn.example.com/banner.jpg"}',
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        event.refresh_from_db()
+        self.assertEqual(event.banner_image, "https://cdn.example.com/banner.jpg")
+        self.assertEqual(event.banner_variants, {})
+
+
+class EventChoicesTests(TestCase):
+    """Dropdown choices come from the event cache; the event picker searches server-side."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from core.cache import TwoTierCache
+
+        cache.clear()
+        TwoTierCache.clear_all_local()
+        self.today = timezone.localdate()
+        for title in ("Borobudur Marathon", "Bali Marathon", "Jakarta Run", "Marathon Bromo"):
+            Event.objects.create(
+                title=title,
+                city="Jakarta",
+                start_date=self.today + timedelta(days=30),
+                registration_deadline=self.today + timedelta(days=20),
+            )
+        self.url = reverse("events_api:search")
+
+    def test_filter_form_category_choices_are_cached(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from events.forms import EventFilterForm
+
+        category = EventCategory.objects.create(
+            name="choices-8k", distance_km=Decimal("8.00"), display_name="Choices 8K"
+        )
+        self.assertIn((category.id, "Choices 8K"), EventFilterForm().fields["category"].choices)
+        with CaptureQueriesContext(connection) as ctx:
+            EventFilterForm()
+        self.assertEqual(ctx.captured_queries, [])
+
+        category.display_name = "Choices 8K Run"
+        category.save()
+        self.assertIn((category.id, "Choices 8K Run"), EventFilterForm().fields["category"].choices)
+
+    def test_search_ranks_prefix_matches_first(self):
+        response = self.client.get(self.url, {"q": "marathon"})
+        self.assertEqual(response.status_code, 200)
+        titles = [row["title"] for row in response.json()["results"]]
+        self.assertEqual(titles, ["Marathon Bromo", "Bali Marathon", "Borobudur Marathon"])
+        self.assertEqual(set(response.json()["results"][0]), {"id", "title"})
+
+    def test_search_limit_and_validation(self):
+        results = self.client.get(self.url, {"limit": 2}).json()["results"]
+        self.assertEqual([row["title"] for row in results], ["Bali Marathon", "Borobudur Marathon"])
+        self.assertEqual(self.client.get(self.url, {"limit": "many"}).status_code, 400)
+
+    def test_search_sees_new_and_renamed_events(self):
+        self.assertEqual(self.client.get(self.url, {"q": "toba"}).json()["results"], [])
+        event = Event.objects.create(
+            title="Lake Toba Trail",
+            city="Medan",
+            start_date=self.today + timedelta(days=30),
+            registration_deadline=self.today + timedelta(days=20),
+        )
+        self.assertEqual(
+            self.client.get(self.url, {"q": "toba"}).json()["results"], [{"id": event.id, "title": "Lake Toba Trail"}]
+        )
+        event.title = "Samosir Trail"
+        event.save()
+        self.assertEqual(self.client.get(self.url, {"q": "toba"}).json()["results"], [])
+
+
+class CategoryFilterTests(TestCase):
+    """Category filters use EXISTS, so list queries need no DISTINCT."""
+
+    def setUp(self):
+        self.today = timezone.localdate()
+        self.short = EventCategory.objects.create(
+            name="exists-5k", distance_km=Decimal("5.00"), display_name="Exists 5K"
+        )
+        self.fun = EventCategory.objects.create(
+            name="exists-fun-5k", distance_km=Decimal("5.00"), display_name="Exists Fun 5K"
+        )
+        self.event = Event.objects.create(
+            title="Exists Run",
+            city="Jakarta",
+            start_date=self.today + timedelta(days=30),
+            registration_deadline=self.today + timedelta(days=20),
+        )
+        self.event.categories.add(self.short, self.fun)
+
+    def test_form_filter_uses_exists_without_distinct(self):
+        from events.forms import EventFilterForm
+
+        form = EventFilterForm({"category": str(self.short.id)})
+        queryset = form.filter_queryset(Event.objects.order_by("start_date"))
+        sql = str(queryset.query).upper()
+        self.assertIn("EXISTS", sql)
+        self.assertNotIn("DISTINCT", sql)
+        self.assertEqual(list(queryset), [self.event])
+        self.assertNotIn("DISTINCT", str(EventFilterForm({}).filter_queryset(Event.objects.all()).query).upper())
+
+    def test_distance_filter_does_not_duplicate_events(self):
+        response = self.client.get(reverse("events_api:list"), {"distance": "5"})
+        results = response.json()["results"]
+        self.assertEqual([row["id"] for row in results], [self.event.id])
+        self.assertEqual(response.json()["pagination"]["total"], 1)
+
+    def test_benchmark_command_reports_each_variant(self):
+        out = StringIO()
+        call_command("benchmark_event_filters", "--events", "30", "--categories", "3", "--runs", "1", stdout=out)
+        output = out.getvalue()
+        for label in ("join + distinct:", "exists:", "unfiltered + distinct:", "unfiltered:"):
+            self.assertIn(label, output)
+        self.assertFalse(Event.objects.filter(slug__startswith="benchmark-run-").exists())
+
+
+class PopularityTests(TestCase):
+    """Popularity scores are recomputed from decayed recent activity."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from core.cache import TwoTierCache
+
+        cache.clear()
+        TwoTierCache.clear_all_local()
+        self.today = timezone.localdate()
+        self.user = User.objects.create_user(username="popular", password="pw")
+        self.hot = _event("Hot Run")
+        self.quiet = _event("Quiet Run")
+
+    def test_views_are_counted_per_day(self):
+        from events.models import EventDailyViews
+
+        self.client.login(username="popular", password="pw")
+        self.client.get(reverse("event_detail:detail", kwargs={"slug": self.hot.slug}))
+        self.client.get(reverse("events_api:detail-extended", args=[self.hot.id]))
+        # The detail page's own XHR fetch is not a second view.
+        json_url = reverse("event_detail:detail-json", kwargs={"slug": self.hot.slug})
+        self.client.get(json_url, HTTP_X_REQUESTED_WITH="XMLHttpRequest")
+        self.client.get(json_url)
+
+        row = EventDailyViews.objects.get(event=self.hot)
+        self.assertEqual((row.day, row.views), (self.today, 3))
+
+    def test_scores_combine_signals_with_decay(self):
+        from events.models import EventDailyViews
+        from events.popularity import compute_scores
+        from forum.models import ForumPost, ForumThread
+        from registrations.models import EventRegistration
+
+        EventRegistration.objects.create(
+            user=self.user,
+            event=self.hot,
+            phone_number="0812",
+            emergency_contact_name="A",
+            emergency_contact_phone="0813",
+        )
+        thread = ForumThread.objects.create(event=self.hot, author=self.user, title="Pacing", body="x")
+        ForumPost.objects.create(thread=thread, author=self.user, content="Negative split")
+        EventDailyViews.objects.create(event=self.hot, day=self.today, views=5)
+        # Two half-lives old: counts a quarter.
+        EventDailyViews.objects.create(event=self.quiet, day=self.today - timedelta(days=14), views=40)
+        # Outside the window: ignored.
+        EventDailyViews.objects.create(event=self.quiet, day=self.today - timedelta(days=60), views=1000)
+
+        scores = compute_scores(self.today, half_life_days=7)
+        self.assertEqual(scores, {self.hot.id: 10 + 4 + 2 + 5, self.quiet.id: 10})
+
+    def test_refresh_writes_changed_scores_and_decays_stale_ones(self):
+        from events.cache import get_event
+        from events.models import EventDailyViews
+        from events.popularity import refresh_popularity
+
+        imported = _event("Imported Run", popularity_score=500)
+        stale = _event("Last Month's Run")
+        Event.objects.filter(pk=stale.pk).update(activity_score=30)
+        EventDailyViews.objects.create(event=self.hot, day=self.today, views=7)
+        self.assertEqual(get_event(self.hot.id).activity_score, 0)
+
+        out = StringIO()
+        call_command("refresh_popularity", stdout=out)
+        self.assertIn("Updated popularity of 2 events.", out.getvalue())
+        self.assertEqual(get_event(self.hot.id).activity_score, 7)
+        stale.refresh_from_db()
+        self.assertEqual(stale.activity_score, 0)
+        # The importer's baseline is kept; recent activity ranks first.
+        imported.refresh_from_db()
+        self.assertEqual((imported.popularity_score, imported.activity_score), (500, 0))
+        self.assertEqual(Event.objects.order_by(*Event.POPULARITY_ORDERING).first(), self.hot)
+
+        with self.assertNumQueries(5):
+            # Four aggregate queries and one candidate read; nothing changed, nothing written.
+            self.assertEqual(refresh_popularity(), [])
+
+
+class RecommendationTests(TestCase):
+    """Per-user recommendations are precomputed offline and served by primary key."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from core.cache import TwoTierCache
+        from profiles.models import UserProfile
+
+        cache.clear()
+        TwoTierCache.clear_all_local()
+        self.user = User.objects.create_user(username="recommend", password="pw")
+        self.profile = UserProfile.objects.get(user=self.user)
+        self.profile.favorite_distance = "42K"
+        self.profile.city = "Yogyakarta"
+        self.profile.save()
+        self.marathon = EventCategory.objects.create(
+            name="rec-42k", distance_km=Decimal("42.20"), display_name="Rec Marathon"
+        )
+        self.five = EventCategory.objects.create(name="rec-5k", distance_km=Decimal("5.00"), display_name="Rec 5K")
+        self.full = _event("Full Distance", self.marathon, city="Semarang")
+        self.local = _event("Local Full", self.marathon, city="Yogyakarta")
+        self.fun = _event("Fun Run", self.five, city="Semarang")
+        self.past = _event("Old Full", self.marathon, days=-30, status=Event.Status.COMPLETED)
+
+    def test_build_ranks_matching_upcoming_events(self):
+        from events.models import EventRecommendation
+
+        out = StringIO()
+        call_command("build_recommendations", stdout=out)
+        self.assertIn("Stored recommendations for 1 users.", out.getvalue())
+        stored = EventRecommendation.objects.get(pk=self.user.pk)
+        # Same distance and city first; the past event is never a candidate.
+        self.assertEqual(stored.event_ids, [self.local.id, self.full.id, self.fun.id])
+
+    def test_entered_events_are_excluded(self):
+        from events.models import EventRecommendation
+        from events.recommendations import build_recommendations
+        from registrations.models import EventRegistration
+
+        EventRegistration.objects.create(
+            user=self.user,
+            event=self.local,
+            phone_number="0812",
+            emergency_contact_name="A",
+            emergency_contact_phone="0813",
+        )
+        build_recommendations(count=2)
+        self.assertEqual(EventRecommendation.objects.get(pk=self.user.pk).event_ids, [self.full.id, self.fun.id])
+
+    def test_endpoint_serves_stored_list_then_falls_back_to_popular(self):
+        from events.models import EventRecommendation
+
+        url = reverse("events_api:recommended")
+        self.assertEqual(self.client.get(url).status_code, 401)
+        self.client.login(username="recommend", password="pw")
+
+        Event.objects.filter(pk=self.fun.pk).update(popularity_score=50)
+        payload = self.client.get(url).json()
+        self.assertFalse(payload["personalized"])
+        self.assertEqual(payload["results"][0]["id"], self.fun.id)
+
+        EventRecommendation.objects.create(
+            user=self.user, event_ids=[self.past.id, self.full.id, 999999, self.fun.id], generated_at=timezone.now()
+        )
+        payload = self.client.get(url, {"limit": 1}).json()
+        self.assertTrue(payload["personalized"])
+        self.assertEqual([event["id"] for event in payload["results"]], [self.full.id])
+        self.assertEqual(self.client.get(url, {"limit": "x"}).status_code, 400)
+
+
+class SimilarEventTests(TestCase):
+    """Nearest-neighbour events are built offline and read back in one query."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="similar", password="pw")
+        self.marathon = EventCategory.objects.create(
+            name="sim-42k", distance_km=Decimal("42.20"), display_name="Sim Marathon"
+        )
+        self.five = EventCategory.objects.create(name="sim-5k", distance_km=Decimal("5.00"), display_name="Sim 5K")
+        self.source = _event("Source Marathon", self.marathon)
+        self.twin = _event("Twin Marathon", self.marathon, days=37)
+        self.abroad = _event("Abroad Marathon", self.marathon, country="Japan")
+        self.fun = _event("Fun Run", self.five, days=200, country="Japan")
+        self.past = _event("Past Marathon", self.marathon, days=-30, status=Event.Status.COMPLETED)
+
+    def test_build_ranks_neighbours_by_cosine_similarity(self):
+        from events.similar import similar_events
+
+        out = StringIO()
+        call_command("build_similar_events", "--neighbours", "2", "--batch-size", "2", stdout=out)
+        self.assertIn("similar-event links", out.getvalue())
+        # Same distance and country first; an event never lists itself and
+        # completed events are never suggested.
+        self.assertEqual(similar_events(self.source.pk), [self.twin, self.abroad])
+        self.assertIn(similar_events(self.past.pk)[0], [self.source, self.twin])
+        self.assertNotIn(self.past, similar_events(self.twin.pk))
+
+    def test_rebuild_replaces_previous_rows(self):
+        from events.models import SimilarEvent
+        from events.similar import build_similar_events
+
+        build_similar_events(k=3)
+        first = SimilarEvent.objects.count()
+        self.twin.delete()
+        build_similar_events(k=3)
+        self.assertLess(SimilarEvent.objects.count(), first)
+        self.assertFalse(SimilarEvent.objects.filter(similar_id=self.twin.pk).exists())
+
+    def test_detail_views_read_neighbours_in_one_query(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from events.similar import build_similar_events
+
+        build_similar_events(k=2)
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("event_detail:detail-json", kwargs={"slug": self.source.slug}))
+        self.assertEqual(
+            [item["id"] for item in response.json()["similar_events"]], [self.twin.id, self.abroad.id]
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("event_detail:detail", kwargs={"slug": self.source.slug}))
+        self.assertContains(response, "Twin Marathon")
+        self.assertEqual(sum("events_similarevent" in query["sql"] for query in queries.captured_queries), 1)
+
+
+class NearbyEventsTests(TestCase):
+    """Coordinates come from the bundled gazetteer; radius search runs off the geohash index."""
+
+    def setUp(self):
+        self.jakarta = _event("Jakarta Run", city="Jakarta")
+        self.bogor = _event("Bogor Trail", city="Bogor")
+        self.bandung = _event("Bandung Marathon", city="Bandung")
+        self.finished = _event("Old Jakarta Run", city="Jakarta", status=Event.Status.COMPLETED)
+        self.unknown = _event("Mystery Run", city="Atlantis", country="Nowhere")
+
+    def test_geohash_and_cover(self):
+        from events.geo import covering_prefixes, encode_geohash
+
+        self.assertEqual(encode_geohash(57.64911, 10.40744, 11), "u4pruydqqvj")
+        self.assertTrue(any(self.jakarta.geohash.startswith(p) for p in covering_prefixes(-6.2, 106.8, 50)))
+        # Cells on both sides of the antimeridian.
+        prefixes = covering_prefixes(0, 179.9, 100)
+        self.assertTrue(any(p.startswith(("r", "x")) for p in prefixes))
+        self.assertTrue(any(p.startswith(("0", "2", "8")) for p in prefixes))
+
+    def test_gazetteer_fallbacks(self):
+        from events.geo import gazetteer
+
+        places = gazetteer()
+        self.assertEqual(places.locate("Cape Town", "South Africa"), (-33.9249, 18.4241, "city"))
+        # IOC code and a city named inside the race name.
+        self.assertEqual(places.locate("Two Oceans Marathon Cape Town", "RSA"), (-33.9249, 18.4241, "city"))
+        # Unknown city: the country's centroid.
+        self.assertEqual(places.locate("Spartathlon", "GRE"), (*places.country_points["greece"], "country"))
+        self.assertIsNone(places.locate("Atlantis", "Nowhere"))
+
+    def test_save_fills_coordinates_and_geohash(self):
+        from events.geo import encode_geohash
+
+        self.assertEqual((self.jakarta.latitude, self.jakarta.longitude), (-6.2088, 106.8456))
+        self.assertEqual(self.jakarta.geohash, encode_geohash(-6.2088, 106.8456))
+        self.assertIsNone(self.unknown.latitude)
+        self.assertEqual(self.unknown.geohash, "")
+
+        self.unknown.latitude, self.unknown.longitude = -6.3, 106.9
+        self.unknown.save(update_fields=["latitude", "longitude"])
+        self.unknown.refresh_from_db()
+        self.assertEqual(self.unknown.geohash, encode_geohash(-6.3, 106.9))
+        self.assertEqual(self.unknown.location_source, Event.LocationSource.MANUAL)
+
+    def test_location_changes_relocate_geocoded_events_only(self):
+        self.assertEqual(self.jakarta.location_source, Event.LocationSource.CITY)
+        event = Event.objects.get(pk=self.jakarta.pk)
+        event.city = "Bandung"
+        event.save(update_fields=["city"])
+        event.refresh_from_db()
+        self.assertEqual((event.latitude, event.longitude), (self.bandung.latitude, self.bandung.longitude))
+
+        # Hand-entered coordinates survive a change of city.
+        self.unknown.latitude, self.unknown.longitude = -6.3, 106.9
+        self.unknown.save()
+        event = Event.objects.get(pk=self.unknown.pk)
+        event.city, event.country = "Jakarta", "Indonesia"
+        event.save()
+        event.refresh_from_db()
+        self.assertEqual((event.latitude, event.longitude, event.location_source), (-6.3, 106.9, "manual"))
+
+    def test_country_centroids_are_left_out_of_radius_search(self):
+        from events.geo import gazetteer
+
+        latitude, longitude = gazetteer().country_points["indonesia"]
+        centroid = _event("Somewhere Ultra", city="Unlisted Village")
+        self.assertEqual(
+            (centroid.latitude, centroid.longitude, centroid.location_source), (latitude, longitude, "country")
+        )
+        response = self.client.get(reverse("events_api:nearby"), {"lat": latitude, "lon": longitude, "radius": "500"})
+        self.assertNotIn(centroid.id, [item["id"] for item in response.json()["results"]])
+        # Nor is a centroid a place to search around.
+        self.assertEqual(
+            self.client.get(reverse("events_api:nearby"), {"near": "Unlisted Village", "country": "Indonesia"}).status_code,
+            400,
+        )
+
+    def test_radius_search_ranks_by_distance(self):
+        response = self.client.get(
+            reverse("events_api:nearby"), {"lat": "-6.2", "lon": "106.8", "radius": "100", "fields": "id,title"}
+        )
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        # Bandung is ~120 km away; finished events are left out.
+        self.assertEqual([item["id"] for item in results], [self.jakarta.id, self.bogor.id])
+        self.assertLess(results[0]["distance_km"], results[1]["distance_km"])
+        self.assertEqual(set(results[0]), {"id", "title", "distance_km"})
+
+        wider = self.client.get(reverse("events_api:nearby"), {"near": "Jakarta", "radius": "200"}).json()
+        self.assertEqual([item["id"] for item in wider["results"]], [self.jakarta.id, self.bogor.id, self.bandung.id])
+        self.assertEqual(wider["origin"], {"latitude": -6.2088, "longitude": 106.8456})
+
+    def test_antimeridian(self):
+        fiji = _event("Date Line Run", city="Taveuni", country="Fiji", latitude=-16.8, longitude=179.95)
+        response = self.client.get(reverse("events_api:nearby"), {"lat": "-16.8", "lon": "-179.95"})
+        self.assertEqual([item["id"] for item in response.json()["results"]], [fiji.id])
+
+    def test_invalid_input(self):
+        url = reverse("events_api:nearby")
+        self.assertEqual(self.client.get(url).status_code, 400)
+        self.assertEqual(self.client.get(url, {"lat": "x", "lon": "1"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"lat": "91", "lon": "1"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"near": "Atlantis"}).status_code, 400)
+
+    def test_geocode_command(self):
+        Event.objects.filter(pk=self.bogor.pk).update(latitude=None, longitude=None, geohash="")
+        out = StringIO()
+        call_command("geocode_events", stdout=out)
+        self.assertIn("Located 1 events; 1 not in the gazetteer.", out.getvalue())
+        self.bogor.refresh_from_db()
+        self.assertEqual(self.bogor.latitude, -6.5950)
+
+
+class EventCalendarTests(TestCase):
+    """The month calendar is one index range scan, cached per month."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from core.cache import TwoTierCache
+
+        cache.clear()
+        TwoTierCache.clear_all_local()
+        self.url = reverse("events_api:calendar")
+        self.spill = _event("Spill Over Ultra", start_date=date(2026, 9, 29), end_date=date(2026, 10, 2))
+        self.single = _event("October 10K", start_date=date(2026, 10, 2))
+        self.done = _event("Done Run", start_date=date(2026, 10, 31), status=Event.Status.COMPLETED)
+        self.other = _event("November Run", start_date=date(2026, 11, 1))
+
+    def test_month_counts_and_stubs(self):
+        data = self.client.get(self.url, {"year": 2026, "month": 10}).json()
+        self.assertEqual(len(data["days"]), 31)
+        counts = {day["date"]: day["count"] for day in data["days"]}
+        self.assertEqual(counts["2026-10-01"], 1)
+        self.assertEqual(counts["2026-10-02"], 2)
+        self.assertEqual(counts["2026-10-03"], 0)
+        self.assertEqual(counts["2026-10-31"], 1)
+        self.assertEqual([event["id"] for event in data["events"]], [self.spill.id, self.single.id, self.done.id])
+        self.assertEqual(
+            set(data["events"][0]), {"id", "title", "slug", "city", "country", "status", "start_date", "end_date"}
+        )
+
+        upcoming = self.client.get(self.url, {"year": 2026, "month": 10, "status": "upcoming"}).json()
+        self.assertEqual([event["id"] for event in upcoming["events"]], [self.spill.id, self.single.id])
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get(self.url, {"year": "x"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"year": 2026, "month": 13}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"status": "bogus"}).status_code, 400)
+
+    def test_first_month_of_year_one(self):
+        # The multi-day lookback must not step below date.min.
+        response = self.client.get(self.url, {"year": 1, "month": 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["events"], [])
+
+    def test_months_are_cached_and_invalidated_by_their_events(self):
+        from events.calendar import month_calendar
+
+        month_calendar(2026, 10)
+        with self.assertNumQueries(0):
+            month_calendar(2026, 10)
+
+        # A change in another month leaves October cached.
+        self.other.title = "November Trail"
+        self.other.save()
+        with self.assertNumQueries(0):
+            month_calendar(2026, 10)
+
+        # Moving an event out of October invalidates the month it left.
+        moved = Event.objects.get(pk=self.single.pk)
+        moved.start_date = date(2026, 11, 5)
+        moved.save()
+        october = month_calendar(2026, 10)
+        self.assertNotIn(self.single.id, [event["id"] for event in october["events"]])
+        november = month_calendar(2026, 11)
+        self.assertIn(self.single.id, [event["id"] for event in november["events"]])
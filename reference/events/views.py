@@ -1,11 +1,11 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.paginator import Paginator
 from django.db import models
-from django.http import JsonResponse
 from django.utils import timezone
 from django.views.decorators.http import require_GET
 from django.views.generic import ListView
 
+from core.renderers import FastJsonResponse
 from .forms import EventFilterForm
 from .models import Event
 
@@ -81,7 +81,7 @@ def events_json(request):
             }
         )
 
-    return JsonResponse(
+    return FastJsonResponse(
         {
             "results": events_payload,
             "pagination": {
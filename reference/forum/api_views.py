@@ -5,7 +5,17 @@ from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
-from core.api_helpers import serialize_post, serialize_thread
+from core.api_helpers import (
+    POST_FIELDS,
+    POST_SOURCES,
+    THREAD_FIELDS,
+    THREAD_RELATED,
+    THREAD_SOURCES,
+    FieldSet,
+    restrict_queryset,
+    serialize_post,
+    serialize_thread,
+)
 from events.models import Event
 from .models import ForumPost, ForumThread
 
@@ -17,10 +27,8 @@ def threads_api(request):
     Supports filtering by event, searching, and sorting (recent|popular|latest).
     """
     if request.method == "GET":
-        queryset = (
-            ForumThread.objects.select_related("event", "author")
-            .annotate(post_count=Count("posts", distinct=True))
-        )
+        fieldset = FieldSet.from_request(request)
+        queryset = ForumThread.objects.annotate(post_count=Count("posts", distinct=True))
 
         event_filter = request.GET.get("event")
         search_term = request.GET.get("q", "")
@@ -40,13 +48,22 @@ def threads_api(request):
         else:
             queryset = queryset.order_by("-is_pinned", "-last_activity_at")
 
+        queryset = restrict_queryset(
+            queryset,
+            fieldset,
+            THREAD_FIELDS,
+            sources=THREAD_SOURCES,
+            related=THREAD_RELATED,
+        )
         paginator = Paginator(queryset, 20)
         page_number = request.GET.get("page") or 1
         page_obj = paginator.get_page(page_number)
 
         return Response(
             {
-                "results": [serialize_thread(thread) for thread in page_obj.object_list],
+                "results": [
+                    serialize_thread(thread, fieldset=fieldset) for thread in page_obj.object_list
+                ],
                 "total": paginator.count,
                 "has_next": page_obj.has_next(),
             }
@@ -78,7 +95,15 @@ def threads_api(request):
 def posts_api(request, thread_id: int):
     """List posts for a thread."""
     thread = get_object_or_404(ForumThread, pk=thread_id)
-    queryset = thread.posts.select_related("author", "thread", "parent").prefetch_related("likes")
+    fieldset = FieldSet.from_request(request)
+    queryset = restrict_queryset(
+        thread.posts.all(),
+        fieldset,
+        POST_FIELDS,
+        sources=POST_SOURCES,
+        related=("author",),
+        prefetch={"likes_count": "likes"},
+    )
 
     paginator = Paginator(queryset, 30)
     page_number = request.GET.get("page") or 1
@@ -87,7 +112,8 @@ def posts_api(request, thread_id: int):
     return Response(
         {
             "results": [
-                serialize_post(post, user=request.user) for post in page_obj.object_list
+                serialize_post(post, user=request.user, fieldset=fieldset)
+                for post in page_obj.object_list
             ],
             "total": paginator.count,
             "has_next": page_obj.has_next(),
@@ -1,9 +1,23 @@
 from django import forms
+from django.urls import reverse
 
+from events.cache import get_event
 from events.models import Event
 from .models import ForumPost, ForumThread
 
 
+def selected_event_choices(value) -> list[tuple[int, str]]:
+    """
+    ``(id, title)`` of the selected event only. Event pickers are filled by
+    the search endpoint as the user types instead of listing every event.
+    """
+    try:
+        event = get_event(int(value)) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        event = None
+    return [(event.id, event.title)] if event else []
+
+
 class ThreadForm(forms.ModelForm):
     class Meta:
         model = ForumThread
@@ -16,7 +30,11 @@ class ThreadForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields["event"].queryset = Event.objects.order_by("title")
+        field = self.fields["event"]
+        field.queryset = Event.objects.all()
+        selected = self.data.get(self.add_prefix("event")) if self.is_bound else self.initial.get("event")
+        field.widget.choices = [("", field.empty_label), *selected_event_choices(selected)]
+        field.widget.attrs["data-event-search"] = reverse("events_api:search")
 
 
 class PostForm(forms.ModelForm):
@@ -3,6 +3,7 @@ from django.db import models
 from django.utils import timezone
 from django.utils.text import slugify
 
+from core.slugs import save_with_unique_slug
 from events.models import Event
 
 
@@ -33,18 +34,14 @@ class ForumThread(models.Model):
     def __str__(self) -> str:
         return self.title
 
+    def slug_base(self) -> str:
+        return slugify(self.title)[:130] or "thread"
+
     def save(self, *args, **kwargs):
-        if not self.slug:
-            base_slug = slugify(self.title)[:130]
-            slug = base_slug or "thread"
-            counter = 1
-            while ForumThread.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
+        if self.slug:
+            super().save(*args, **kwargs)
         else:
-            slug = self.slug
-        self.slug = slug
-        super().save(*args, **kwargs)
+            save_with_unique_slug(self, self.slug_base(), lambda: super(ForumThread, self).save(*args, **kwargs))
 
     def touch(self):
         self.last_activity_at = timezone.now()
@@ -265,6 +265,25 @@ class ForumIndexViewTests(TestCase):
         self.assertEqual(threads[0], thread1)
 
 
+    def test_event_picker_lists_only_the_selected_event(self):
+        """The event dropdown is filled by search; only the active event is rendered."""
+        other = Event.objects.create(
+            title="Other Marathon",
+            city="Bandung",
+            start_date=self.today + timedelta(days=30),
+            registration_deadline=self.today + timedelta(days=20),
+        )
+        self.client.login(username='testuser', password='testpass123')
+
+        response = self.client.get(reverse('forum:index'))
+        self.assertEqual(response.context['event_choices'], [])
+        self.assertContains(response, f'data-event-search="{reverse("events_api:search")}"')
+
+        response = self.client.get(reverse('forum:index'), {'event': other.id})
+        self.assertEqual(response.context['event_choices'], [(other.id, "Other Marathon")])
+        self.assertNotContains(response, "Test Marathon</option>")
+
+
 class ThreadCreateViewTests(TestCase):
     """Tests for ThreadCreateView."""
 
@@ -1039,6 +1058,21 @@ class ThreadFormTests(TestCase):
             registration_deadline=self.today + timedelta(days=20),
         )
 
+    def test_thread_form_renders_only_selected_event(self):
+        """Any event validates, but only the chosen one is rendered as an option."""
+        Event.objects.create(
+            title="Unlisted Marathon",
+            city="Bandung",
+            start_date=self.today + timedelta(days=30),
+            registration_deadline=self.today + timedelta(days=20),
+        )
+        self.assertEqual(len(ThreadForm().fields['event'].widget.choices), 1)
+
+        form = ThreadForm(data={'event': self.event.id, 'title': 'Picked', 'body': 'Body'})
+        self.assertTrue(form.is_valid())
+        self.assertEqual([label for _, label in form.fields['event'].widget.choices][1:], ["Test Marathon"])
+        self.assertNotIn("Unlisted Marathon", str(form['event']))
+
     def test_thread_form_valid_data(self):
         """Test form with valid data."""
         form = ThreadForm(data={
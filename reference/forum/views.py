@@ -1,7 +1,7 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import Http404, JsonResponse
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
 from django.utils import timezone
@@ -12,8 +12,9 @@ from django.db.models import Count, Q, F
 from django.views.decorators.csrf import csrf_exempt
 import json
 
+from core.renderers import FastJsonResponse
 from events.models import Event
-from .forms import PostForm, ThreadForm
+from .forms import PostForm, ThreadForm, selected_event_choices
 from .models import ForumPost, ForumThread, PostReport
 
 
@@ -49,7 +50,7 @@ class ForumIndexView(LoginRequiredMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["events"] = Event.objects.order_by("title")
+        context["event_choices"] = selected_event_choices(self.event_filter)
         context["active_event"] = self.event_filter
         context["search_term"] = self.search_term
         context["sort"] = self.sort
@@ -158,7 +159,7 @@ def threads_json(request):
         }
         for thread in queryset[:50]
     ]
-    return JsonResponse({"results": threads_payload})
+    return FastJsonResponse({"results": threads_payload})
 
 @require_GET
 def api_thread_posts(request, slug):
@@ -187,7 +188,7 @@ def api_thread_posts(request, slug):
         for post in page_obj
     ]
 
-    return JsonResponse({
+    return FastJsonResponse({
         "results": posts_data,
         "total": paginator.count,
         "has_next": page_obj.has_next()
@@ -204,7 +205,7 @@ def create_thread_json(request):
         body = data.get('body')
 
         if not all([event_id, title, body]):
-            return JsonResponse({'status': False, 'message': 'Semua field harus diisi'}, status=400)
+            return FastJsonResponse({'status': False, 'message': 'Semua field harus diisi'}, status=400)
 
         event = get_object_or_404(Event, pk=event_id)
         
@@ -216,7 +217,7 @@ def create_thread_json(request):
         )
 
         # Return full thread data to match ForumThread.fromJson in Flutter
-        return JsonResponse({
+        return FastJsonResponse({
             "id": thread.id,
             "event": thread.event.id,
             "event_title": thread.event.title,
@@ -235,7 +236,7 @@ def create_thread_json(request):
         }, status=201)
 
     except Exception as e:
-        return JsonResponse({'status': False, 'message': str(e)}, status=500)
+        return FastJsonResponse({'status': False, 'message': str(e)}, status=500)
 
 @csrf_exempt # Tambahkan ini
 @login_required
@@ -269,7 +270,7 @@ def create_post(request, slug):
         thread.touch()
         
         # Return JSON Data Post Lengkap
-        return JsonResponse({
+        return FastJsonResponse({
             "success": True,
             "post_id": post.id, # Keep for backward compatibility
             "parent_id": post.parent_id,
@@ -286,7 +287,7 @@ def create_post(request, slug):
             "is_liked_by_user": False
         })
 
-    return JsonResponse({"success": False, "errors": form.errors}, status=400)
+    return FastJsonResponse({"success": False, "errors": form.errors}, status=400)
 
 
 @login_required
@@ -299,7 +300,7 @@ def toggle_like(request, post_id):
     else:
         post.likes.add(request.user)
         liked = True
-    return JsonResponse({"success": True, "liked": liked, "like_count": post.like_count})
+    return FastJsonResponse({"success": True, "liked": liked, "like_count": post.like_count})
 
 
 @login_required
@@ -308,7 +309,7 @@ def report_post(request, post_id):
     post = get_object_or_404(ForumPost, pk=post_id)
     reason = request.POST.get("reason", "").strip()
     if not reason:
-        return JsonResponse({"success": False, "message": "Reason is required."}, status=400)
+        return FastJsonResponse({"success": False, "message": "Reason is required."}, status=400)
 
     report, created = PostReport.objects.get_or_create(
         post=post,
@@ -316,8 +317,8 @@ def report_post(request, post_id):
         defaults={"reason": reason},
     )
     if not created:
-        return JsonResponse({"success": False, "message": "You already reported this post."}, status=400)
-    return JsonResponse({"success": True, "message": "Report submitted. Thank you for keeping the forum safe."})
+        return FastJsonResponse({"success": False, "message": "You already reported this post."}, status=400)
+    return FastJsonResponse({"success": True, "message": "Report submitted. Thank you for keeping the forum safe."})
 
 @csrf_exempt
 @login_required
@@ -328,18 +329,18 @@ def delete_thread_api(request, slug):
         
         # Cek permission: Author atau Admin
         if request.user != thread.author and not request.user.is_staff and not request.user.is_superuser:
-             return JsonResponse({
+             return FastJsonResponse({
                 'status': False,
                 'message': 'Anda tidak memiliki izin untuk menghapus thread ini.'
             }, status=403)
             
         thread.delete()
-        return JsonResponse({
+        return FastJsonResponse({
             'status': True,
             'message': 'Thread berhasil dihapus'
         })
     except Exception as e:
-        return JsonResponse({
+        return FastJsonResponse({
             'status': False,
             'message': str(e)
         }, status=500)
@@ -353,18 +354,18 @@ def delete_post_api(request, post_id):
         
         # Cek permission: Author atau Admin
         if request.user != post.author and not request.user.is_staff and not request.user.is_superuser:
-             return JsonResponse({
+             return FastJsonResponse({
                 'status': False,
                 'message': 'Anda tidak memiliki izin untuk menghapus post ini.'
             }, status=403)
             
         post.delete()
-        return JsonResponse({
+        return FastJsonResponse({
             'status': True,
             'message': 'Post berhasil dihapus'
         })
     except Exception as e:
-        return JsonResponse({
+        return FastJsonResponse({
             'status': False,
             'message': str(e)
         }, status=500)
@@ -395,4 +396,4 @@ def api_thread_detail(request, slug):
         "is_locked": thread.is_locked,
         "view_count": thread.view_count,
     }
-    return JsonResponse(thread_data)
+    return FastJsonResponse(thread_data)
@@ -5,7 +5,12 @@ from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
-from core.api_helpers import serialize_notification
+from core.api_helpers import (
+    NOTIFICATION_FIELDS,
+    FieldSet,
+    restrict_queryset,
+    serialize_notification,
+)
 from .models import Notification
 
 
@@ -17,6 +22,8 @@ def notifications_api(request):
     if unread_only in {"true", "1", "yes"}:
         queryset = queryset.filter(is_read=False)
 
+    fieldset = FieldSet.from_request(request)
+    queryset = restrict_queryset(queryset, fieldset, NOTIFICATION_FIELDS)
     paginator = Paginator(queryset, 20)
     page_number = request.GET.get("page") or 1
     page_obj = paginator.get_page(page_number)
@@ -25,7 +32,9 @@ def notifications_api(request):
 
     return Response(
         {
-            "results": [serialize_notification(note) for note in page_obj.object_list],
+            "results": [
+                serialize_notification(note, fieldset=fieldset) for note in page_obj.object_list
+            ],
             "total": paginator.count,
             "has_next": page_obj.has_next(),
             "unread_count": unread_count,
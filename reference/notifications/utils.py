@@ -3,6 +3,15 @@ from django.urls import reverse
 from .models import Notification
 
 
+def _resolve_link(url_name: str | None, url_kwargs: dict | None, link_url: str | None) -> str:
+    if url_name and not link_url:
+        try:
+            link_url = reverse(url_name, kwargs=url_kwargs or {})
+        except Exception:
+            link_url = None
+    return link_url or ""
+
+
 def send_notification(
     *,
     recipient,
@@ -15,16 +24,36 @@ def send_notification(
 ) -> Notification:
     """Create a notification entry for the given recipient."""
 
-    if url_name and not link_url:
-        try:
-            link_url = reverse(url_name, kwargs=url_kwargs or {})
-        except Exception:
-            link_url = None
-
     return Notification.objects.create(
         recipient=recipient,
         title=title,
         message=message,
         category=category,
-        link_url=link_url or "",
+        link_url=_resolve_link(url_name, url_kwargs, link_url),
     )
+
+
+def send_notifications_bulk(entries, *, batch_size: int = 500) -> list[Notification]:
+    """
+    Create many notifications with batched INSERTs.
+
+    Each entry is a dict accepting the keyword arguments of ``send_notification``,
+    except that ``recipient_id`` may be given instead of ``recipient``.
+    """
+    notifications = []
+    for entry in entries:
+        recipient_id = entry.get("recipient_id")
+        if recipient_id is None:
+            recipient_id = entry["recipient"].pk
+        notifications.append(
+            Notification(
+                recipient_id=recipient_id,
+                title=entry["title"],
+                message=entry["message"],
+                category=entry.get("category", Notification.Category.SYSTEM),
+                link_url=_resolve_link(
+                    entry.get("url_name"), entry.get("url_kwargs"), entry.get("link_url")
+                ),
+            )
+        )
+    return Notification.objects.bulk_create(notifications, batch_size=batch_size)
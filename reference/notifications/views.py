@@ -1,11 +1,11 @@
 
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
 from django.views.decorators.http import require_GET, require_POST
 from django.views.generic import ListView
 
+from core.renderers import FastJsonResponse
 from .models import Notification
 
 
@@ -31,7 +31,7 @@ def notifications_json(request):
     base_qs = Notification.objects.filter(recipient=request.user).order_by("-created_at")
     notifications = list(base_qs[:50])
     unread_count = base_qs.filter(is_read=False).count()
-    return JsonResponse(
+    return FastJsonResponse(
         {
             "results": [
                 {
@@ -55,11 +55,11 @@ def notifications_json(request):
 def mark_notification_read(request, pk):
     note = get_object_or_404(Notification, pk=pk, recipient=request.user)
     note.mark_read()
-    return JsonResponse({"success": True})
+    return FastJsonResponse({"success": True})
 
 
 @login_required
 @require_POST
 def mark_all_notifications_read(request):
     Notification.objects.filter(recipient=request.user, is_read=False).update(is_read=True)
-    return JsonResponse({"success": True})
+    return FastJsonResponse({"success": True})
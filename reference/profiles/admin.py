@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import RunnerAchievement, UserProfile, UserRaceHistory
+from .models import BibSequence, RunnerAchievement, RunnerStats, UserProfile, UserRaceHistory
 
 
 class RunnerAchievementInline(admin.TabularInline):
@@ -33,3 +33,27 @@ class RunnerAchievementAdmin(admin.ModelAdmin):
     list_display = ("profile", "title", "achieved_on")
     list_filter = ("achieved_on",)
     search_fields = ("profile__user__username", "title")
+
+
+@admin.register(RunnerStats)
+class RunnerStatsAdmin(admin.ModelAdmin):
+    list_display = ("profile", "completed_races", "total_distance_km", "average_pace_seconds", "updated_at")
+    search_fields = ("profile__user__username",)
+    readonly_fields = (
+        "total_races",
+        "completed_races",
+        "upcoming_races",
+        "total_distance_km",
+        "total_time",
+        "average_pace_seconds",
+        "personal_bests",
+        "yearly",
+        "updated_at",
+    )
+
+
+@admin.register(BibSequence)
+class BibSequenceAdmin(admin.ModelAdmin):
+    list_display = ("event", "category", "prefix", "start", "end", "next_value")
+    list_filter = ("event",)
+    search_fields = ("event__title", "category")
@@ -6,6 +6,7 @@ app_name = "profiles_api"
 
 urlpatterns = [
     path("", api_views.profile_api, name="profile"),
+    path("history/", api_views.history_api, name="history"),
     path("achievements/", api_views.achievements_api, name="achievements"),
     path("achievements/<int:achievement_id>/", api_views.delete_achievement_api, name="achievement-delete"),
 ]
@@ -5,19 +5,50 @@ from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
-from core.api_helpers import serialize_achievement, serialize_profile
+from core.api_helpers import (
+    FieldSet,
+    paginate_history,
+    serialize_achievement,
+    serialize_history,
+    serialize_profile,
+)
+from .cache import (
+    cached_profile_document,
+    client_has_version,
+    get_profile_version,
+    not_modified,
+    with_version,
+)
 from .forms import ProfileAchievementForm
 from .models import RunnerAchievement, UserProfile
 
 
 @api_view(["GET", "PUT"])
 def profile_api(request):
-    """Retrieve or update the authenticated user's profile."""
-    profile, _ = UserProfile.objects.get_or_create(user=request.user)
+    """
+    Retrieve or update the authenticated user's profile.
 
+    GET responses carry a ``version`` (also sent as the ETag); sending it back
+    via ``?version=`` or ``If-None-Match`` yields a 304 until the profile,
+    its history or its achievements change.
+    """
     if request.method == "GET":
-        return Response(serialize_profile(profile))
+        version = get_profile_version(request.user.pk)
+        if client_has_version(request, version):
+            return not_modified(version)
+        fieldset = FieldSet.from_request(request)
+        if fieldset.is_full:
+            payload = cached_profile_document(
+                request.user.pk,
+                "api",
+                lambda: serialize_profile(UserProfile.load_for(request.user)),
+            )
+        else:
+            profile = UserProfile.load_for(request.user, achievements=fieldset.includes("achievements"))
+            payload = serialize_profile(profile, fieldset=fieldset)
+        return with_version(Response({**payload, "version": version}), version)
 
+    profile = UserProfile.load_for(request.user, achievements=False)
     payload = request.data
     updatable_fields = [
         "display_name",
@@ -46,7 +77,23 @@ def profile_api(request):
             )
 
     profile.save()
-    return Response(serialize_profile(profile))
+    version = get_profile_version(request.user.pk)
+    return with_version(Response({**serialize_profile(profile), "version": version}), version)
+
+
+@api_view(["GET"])
+def history_api(request):
+    """Paginated race history for the authenticated user."""
+    profile = UserProfile.load_for(request.user, achievements=False)
+    fieldset = FieldSet.from_request(request)
+    page_obj = paginate_history(profile, request.GET.get("page") or 1, fieldset=fieldset)
+    return Response(
+        {
+            "results": [serialize_history(item, fieldset=fieldset) for item in page_obj.object_list],
+            "total": page_obj.paginator.count,
+            "has_next": page_obj.has_next(),
+        }
+    )
 
 
 @api_view(["GET", "POST"])
@@ -54,7 +101,15 @@ def achievements_api(request):
     """List or create achievements for the authenticated user."""
     profile, _ = UserProfile.objects.get_or_create(user=request.user)
     if request.method == "GET":
-        return Response({"results": [serialize_achievement(ach) for ach in profile.achievements.all()]})
+        fieldset = FieldSet.from_request(request)
+        return Response(
+            {
+                "results": [
+                    serialize_achievement(ach, fieldset=fieldset)
+                    for ach in profile.achievements.all()
+                ]
+            }
+        )
 
     form = ProfileAchievementForm(request.data)
     if form.is_valid():
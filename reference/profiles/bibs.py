@@ -0,0 +1,95 @@
+from collections import defaultdict
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import F
+
+from .models import BibSequence, UserRaceHistory
+
+# Bibs per "already taken?" lookup, well under SQLite's parameter limit.
+TAKEN_LOOKUP_CHUNK = 500
+
+
+class BibRangeExhausted(ValueError):
+    """A category's bib range has no room left for the requested block."""
+
+
+def _sequence_for(event_id: int, category: str) -> BibSequence:
+    """The category's own range when one is configured, else the event-wide counter."""
+    sequences = {
+        sequence.category: sequence
+        for sequence in BibSequence.objects.filter(event_id=event_id, category__in={category, ""})
+    }
+    sequence = sequences.get(category) or sequences.get("")
+    if sequence is None:
+        sequence, _ = BibSequence.objects.get_or_create(event_id=event_id, category="")
+    return sequence
+
+
+def allocate_bibs(event_id: int, count: int, category: str = "") -> list[str]:
+    """
+    Reserve ``count`` consecutive bibs for ``event_id`` (and ``category``).
+
+    The block is claimed with a single ``next_value = next_value + count``
+    UPDATE, which row-locks the sequence until the caller's transaction ends,
+    so concurrent confirmations get disjoint blocks and a rolled-back
+    allocation hands its numbers back. Numbers already held in the event
+    (legacy bibs, another range) are skipped and more are claimed instead.
+    """
+    if count <= 0:
+        return []
+    with transaction.atomic():
+        sequence = _sequence_for(event_id, category)
+        bibs = []
+        while len(bibs) < count:
+            wanted = count - len(bibs)
+            BibSequence.objects.filter(pk=sequence.pk).update(next_value=F("next_value") + wanted)
+            next_value = BibSequence.objects.filter(pk=sequence.pk).values_list("next_value", flat=True).get()
+            first = next_value - wanted
+            if sequence.end is not None and next_value - 1 > sequence.end:
+                raise BibRangeExhausted(
+                    f"Bib range {sequence.format(sequence.start)}-{sequence.format(sequence.end)} "
+                    f"has {max(sequence.end - first + 1, 0)} free numbers left, {wanted} more requested."
+                )
+            block = [sequence.format(number) for number in range(first, next_value)]
+            taken = _taken_bibs(event_id, block)
+            bibs.extend(bib for bib in block if bib not in taken)
+        return bibs
+
+
+def _taken_bibs(event_id: int, bibs: list[str]) -> set[str]:
+    taken = set()
+    for start in range(0, len(bibs), TAKEN_LOOKUP_CHUNK):
+        taken.update(
+            UserRaceHistory.objects.filter(event_id=event_id, bib_number__in=bibs[start:start + TAKEN_LOOKUP_CHUNK])
+            .order_by()
+            .values_list("bib_number", flat=True)
+        )
+    return taken
+
+
+def assign_bibs(history: Iterable[UserRaceHistory]) -> list[UserRaceHistory]:
+    """
+    Give every row without a bib the next number of its event/category.
+
+    Rows are grouped so each (event, category) takes one block, in the order
+    given, and the numbers are written with one ``bulk_update``.
+    A group whose range cannot fit its block keeps no bib (the other groups
+    are still numbered). Returns the rows that received a bib.
+    """
+    groups = defaultdict(list)
+    for row in history:
+        if not row.bib_number:
+            groups[(row.event_id, row.category)].append(row)
+    assigned = []
+    with transaction.atomic():
+        for (event_id, category), rows in groups.items():
+            try:
+                bibs = allocate_bibs(event_id, len(rows), category)
+            except BibRangeExhausted:
+                continue
+            for row, bib in zip(rows, bibs):
+                row.bib_number = bib
+                assigned.append(row)
+        UserRaceHistory.objects.bulk_update(assigned, ["bib_number"], batch_size=500)
+    return assigned
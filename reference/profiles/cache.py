@@ -0,0 +1,67 @@
+from typing import Callable, Iterable
+
+from django.db import transaction
+from django.http import HttpResponseNotModified
+
+from core.cache import TwoTierCache
+
+# Documents are keyed by a per-user version, so invalidation is a single
+# counter bump and a stale rebuild can never overwrite a fresh document. The
+# timeout bounds staleness from edits that do not bump the version (e.g. an
+# event renamed after the runner raced it).
+PROFILE_CACHE_TIMEOUT = 15 * 60
+profile_cache = TwoTierCache("profiles", timeout=PROFILE_CACHE_TIMEOUT)
+
+
+def get_profile_version(user_id) -> int:
+    """Return the current cache version for ``user_id``'s profile documents."""
+    return profile_cache.version(user_id)
+
+
+def invalidate_profiles(user_ids: Iterable) -> None:
+    """
+    Drop the cached profile documents of ``user_ids``.
+
+    The version is bumped immediately and again once the surrounding
+    transaction commits, so a reader that rebuilt from pre-commit data in
+    between does not keep serving it.
+    """
+    user_ids = set(user_ids)
+    if not user_ids:
+        return
+    profile_cache.invalidate(*user_ids)
+    transaction.on_commit(lambda: profile_cache.invalidate(*user_ids))
+
+
+def invalidate_profile(user_id) -> None:
+    invalidate_profiles([user_id])
+
+
+def cached_profile_document(user_id, kind: str, builder: Callable[[], dict]) -> dict:
+    """Return the current ``kind`` document for ``user_id``, building it on a miss."""
+    return profile_cache.get_or_set(f"doc:{kind}", builder, scope=user_id)
+
+
+def etag_for(version: int) -> str:
+    return f'"{version}"'
+
+
+def client_has_version(request, version: int) -> bool:
+    """True when the client sent back ``version`` via ``?version=`` or ``If-None-Match``."""
+    if request.GET.get("version") == str(version):
+        return True
+    header = request.headers.get("If-None-Match", "")
+    # Compression middleware may have weakened the ETag; compare opaque values.
+    sent = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag_for(version) in sent or "*" in sent
+
+
+def not_modified(version: int) -> HttpResponseNotModified:
+    response = HttpResponseNotModified()
+    response["ETag"] = etag_for(version)
+    return response
+
+
+def with_version(response, version: int):
+    response["ETag"] = etag_for(version)
+    return response
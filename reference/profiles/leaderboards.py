@@ -0,0 +1,137 @@
+import hashlib
+from decimal import Decimal, InvalidOperation
+from typing import Iterable, Optional
+
+from django.db import transaction
+from django.db.models import F, Min, Window
+from django.db.models.functions import Rank
+
+from core.cache import TwoTierCache
+from events.models import Event, EventCategory
+from .models import UserRaceHistory
+
+LEADERBOARD_PAGE_SIZE = 50
+LEADERBOARD_CACHE_TIMEOUT = 60 * 60
+# Pages are scoped by event id; every history write for an event bumps it.
+leaderboard_cache = TwoTierCache("leaderboards", maxsize=256, timeout=LEADERBOARD_CACHE_TIMEOUT)
+
+
+def finishers(history=None):
+    """Completed history rows that carry a finish time."""
+    if history is None:
+        history = UserRaceHistory.objects.all()
+    return history.filter(status=UserRaceHistory.Status.COMPLETED, finish_time__isnull=False)
+
+
+def event_leaderboard(event_id: int, category: str):
+    """
+    Finishers of one event category ranked by finish time (ties share a rank).
+
+    Served by the (event, category, finish_time) index; the rank is computed in
+    SQL so pages can be sliced without loading the whole field.
+    """
+    return (
+        finishers(UserRaceHistory.objects.filter(event_id=event_id, category=category))
+        .select_related("profile__user")
+        .annotate(rank=Window(Rank(), order_by=F("finish_time").asc()))
+        .order_by("finish_time", "id")
+    )
+
+
+def event_rank(event_id: int, category: str, profile_id: int) -> Optional[dict]:
+    """A runner's rank on an event board: one index seek plus a range count."""
+    mine = (
+        finishers(UserRaceHistory.objects.filter(event_id=event_id, category=category, profile_id=profile_id))
+        .order_by("finish_time")
+        .values("finish_time")
+        .first()
+    )
+    if mine is None:
+        return None
+    ahead = finishers(
+        UserRaceHistory.objects.filter(event_id=event_id, category=category, finish_time__lt=mine["finish_time"])
+    ).count()
+    return {"rank": ahead + 1, "finish_time": mine["finish_time"].total_seconds()}
+
+
+def event_categories(event_id: int) -> list[str]:
+    """Category labels that have at least one finisher for the event."""
+    return list(
+        finishers(UserRaceHistory.objects.filter(event_id=event_id))
+        .order_by("category")
+        .values_list("category", flat=True)
+        .distinct()
+    )
+
+
+def parse_distance(value) -> Optional[Decimal]:
+    try:
+        distance = Decimal(str(value).lower().removesuffix("k"))
+    except InvalidOperation:
+        return None
+    return distance if distance.is_finite() and distance > 0 else None
+
+
+def distance_labels(distance_km: Decimal) -> list[str]:
+    """History labels (category display names) that denote ``distance_km``."""
+    return list(EventCategory.objects.filter(distance_km=distance_km).values_list("display_name", flat=True))
+
+
+def distance_leaderboard(labels: Iterable[str]):
+    """
+    Each runner's best time over every race of a distance, ranked.
+
+    Rows are ``{"profile_id", "best_time", "rank"}`` dicts grouped in SQL, so
+    a runner appears once however many times they raced the distance.
+    """
+    return (
+        finishers(UserRaceHistory.objects.filter(category__in=list(labels)))
+        .order_by()
+        .values("profile_id")
+        .annotate(best_time=Min("finish_time"))
+        .annotate(rank=Window(Rank(), order_by=Min("finish_time").asc()))
+        .order_by("best_time", "profile_id")
+    )
+
+
+def distance_rank(labels: Iterable[str], profile_id: int) -> Optional[dict]:
+    """A runner's rank by personal best: anyone with a faster race is ahead."""
+    labels = list(labels)
+    best = finishers(UserRaceHistory.objects.filter(category__in=labels, profile_id=profile_id)).aggregate(
+        best=Min("finish_time")
+    )["best"]
+    if best is None:
+        return None
+    ahead = (
+        finishers(UserRaceHistory.objects.filter(category__in=labels, finish_time__lt=best))
+        .values("profile_id")
+        .distinct()
+        .count()
+    )
+    return {"rank": ahead + 1, "finish_time": best.total_seconds()}
+
+
+def invalidate_leaderboards(event_ids: Iterable[int]) -> None:
+    """
+    Drop cached pages of ``event_ids``; bumped immediately and again on
+    commit, like the event and profile caches.
+    """
+    event_ids = {int(event_id) for event_id in event_ids}
+    if not event_ids:
+        return
+    leaderboard_cache.invalidate(*event_ids)
+    transaction.on_commit(lambda: leaderboard_cache.invalidate(*event_ids))
+
+
+def cached_event_page(event: Event, category: str, page_number, builder):
+    """
+    Cache leaderboard pages of completed events, whose results are final.
+
+    Pages live in the event's scope of ``leaderboard_cache``, which every
+    history write for that event invalidates, so corrected results show up
+    immediately.
+    """
+    if event.status != Event.Status.COMPLETED:
+        return builder()
+    category_key = hashlib.md5(category.encode()).hexdigest()
+    return leaderboard_cache.get_or_set(f"event:{category_key}:{page_number}", builder, scope=event.pk)
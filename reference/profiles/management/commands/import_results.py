@@ -0,0 +1,63 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from events.models import Event
+from profiles.results import RESULTS_BATCH_SIZE, ResultsFormatError, decode_lines, import_results
+
+
+class Command(BaseCommand):
+    help = "Import race results (bib, finish time, status) from a timing-system CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_path", type=str, help="Path to the results CSV file.")
+        parser.add_argument(
+            "--event",
+            type=str,
+            required=True,
+            help="Event id or slug the results belong to.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=RESULTS_BATCH_SIZE,
+            help=f"History rows written per bulk update (default: {RESULTS_BATCH_SIZE}).",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["csv_path"])
+        if not path.exists():
+            raise CommandError(f"File not found: {path}")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+
+        event_ref = options["event"]
+        lookup = {"pk": int(event_ref)} if event_ref.isdigit() else {"slug": event_ref}
+        event = Event.objects.filter(**lookup).first()
+        if event is None:
+            raise CommandError(f"Event not found: {event_ref}")
+
+        started = time.monotonic()
+        with path.open("rb") as handle:
+            try:
+                result = import_results(event, decode_lines(handle), batch_size=options["batch_size"])
+            except ResultsFormatError as exc:
+                raise CommandError(str(exc)) from exc
+        elapsed = time.monotonic() - started
+
+        for error in result.errors:
+            self.stderr.write(f"Line {error['line']}: {error['error']}")
+        if result.unmatched_bibs:
+            self.stderr.write(
+                self.style.WARNING(
+                    f"{len(result.unmatched_bibs)} unmatched bibs: {', '.join(result.unmatched_bibs)}"
+                )
+            )
+        if result.duplicate_bibs:
+            self.stderr.write(
+                self.style.WARNING(f"Duplicate bibs ignored: {', '.join(result.duplicate_bibs)}")
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"Updated {result.updated} results for {event.title} in {elapsed:.1f}s.")
+        )
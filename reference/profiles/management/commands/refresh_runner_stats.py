@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from profiles.models import UserProfile
+from profiles.stats import STATS_BATCH_SIZE, refresh_runner_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild cached runner statistics from race history."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            action="append",
+            help="Only refresh this username (repeatable; default: every profile).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=STATS_BATCH_SIZE,
+            help=f"Profiles aggregated per query (default: {STATS_BATCH_SIZE}).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+
+        profiles = UserProfile.objects.order_by("pk")
+        usernames = options.get("user")
+        if usernames:
+            profiles = profiles.filter(user__username__in=usernames)
+            missing = set(usernames) - set(profiles.values_list("user__username", flat=True))
+            if missing:
+                raise CommandError(f"Unknown user(s): {', '.join(sorted(missing))}")
+
+        profile_ids = list(profiles.values_list("pk", flat=True))
+        for start in range(0, len(profile_ids), batch_size):
+            refresh_runner_stats(profile_ids[start:start + batch_size])
+
+        self.stdout.write(self.style.SUCCESS(f"Refreshed stats for {len(profile_ids)} profiles."))
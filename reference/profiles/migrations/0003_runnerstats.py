@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:47
+
+import datetime
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0002_alter_userracehistory_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RunnerStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_races', models.PositiveIntegerField(default=0)),
+                ('completed_races', models.PositiveIntegerField(default=0)),
+                ('upcoming_races', models.PositiveIntegerField(default=0)),
+                ('total_distance_km', models.DecimalField(decimal_places=2, default=0, max_digits=9)),
+                ('total_time', models.DurationField(default=datetime.timedelta)),
+                ('average_pace_seconds', models.FloatField(blank=True, help_text='Seconds per km over completed races with a finish time and known distance.', null=True)),
+                ('personal_bests', models.JSONField(blank=True, default=list)),
+                ('yearly', models.JSONField(blank=True, default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('profile', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='profiles.userprofile')),
+            ],
+            options={
+                'verbose_name_plural': 'runner stats',
+                'indexes': [models.Index(fields=['-total_distance_km'], name='runnerstats_distance_idx'), models.Index(fields=['-completed_races'], name='runnerstats_completed_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_seed_event_categories'),
+        ('profiles', '0003_runnerstats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userracehistory',
+            index=models.Index(fields=['event', 'category', 'finish_time'], name='history_event_board_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userracehistory',
+            index=models.Index(fields=['category', 'finish_time'], name='history_distance_board_idx'),
+        ),
+    ]
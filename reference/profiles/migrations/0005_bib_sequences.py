@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def clear_duplicate_bibs(apps, schema_editor):
+    # Legacy bibs were random and could repeat within an event; keep the
+    # earliest holder so the unique constraint can be added.
+    UserRaceHistory = apps.get_model("profiles", "UserRaceHistory")
+    seen = set()
+    duplicates = []
+    rows = UserRaceHistory.objects.exclude(bib_number="").order_by("id").values_list("id", "event_id", "bib_number")
+    for pk, event_id, bib_number in rows.iterator():
+        if (event_id, bib_number) in seen:
+            duplicates.append(pk)
+        else:
+            seen.add((event_id, bib_number))
+    UserRaceHistory.objects.filter(pk__in=duplicates).update(bib_number="")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_seed_event_categories'),
+        ('profiles', '0004_history_leaderboard_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BibSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(blank=True, max_length=50)),
+                ('prefix', models.CharField(blank=True, max_length=8)),
+                ('start', models.PositiveIntegerField(default=1)),
+                ('end', models.PositiveIntegerField(blank=True, help_text='Last number in the range; blank for no limit.', null=True)),
+                ('width', models.PositiveSmallIntegerField(default=4, help_text='Numbers are zero-padded to this many digits.')),
+                ('next_value', models.PositiveIntegerField(default=1)),
+            ],
+            options={
+                'ordering': ['event', 'category'],
+            },
+        ),
+        migrations.RunPython(clear_duplicate_bibs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='userracehistory',
+            constraint=models.UniqueConstraint(condition=models.Q(('bib_number', ''), _negated=True), fields=('event', 'bib_number'), name='history_unique_event_bib'),
+        ),
+        migrations.AddField(
+            model_name='bibsequence',
+            name='event',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bib_sequences', to='events.event'),
+        ),
+        migrations.AddConstraint(
+            model_name='bibsequence',
+            constraint=models.UniqueConstraint(fields=('event', 'category'), name='bibsequence_unique_event_category'),
+        ),
+    ]
@@ -1,5 +1,9 @@
+from datetime import timedelta
+
 from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Q
 from django.utils import timezone
 
 from events.models import Event
@@ -49,9 +53,51 @@ class UserProfile(models.Model):
         full_name = self.user.get_full_name()
         return full_name or self.user.username
 
+    @classmethod
+    def load_for(cls, user, *, history: bool = False, achievements: bool = True) -> "UserProfile":
+        """
+        Fetch (or create) ``user``'s profile with its related rows preloaded.
+
+        History comes with its events and their categories, so serializing a
+        profile costs a fixed number of queries however many races it holds.
+        The user is attached from the argument rather than re-fetched.
+        """
+        try:
+            profile = cls.objects.select_related("stats").get(user=user)
+        except cls.DoesNotExist:
+            profile, _ = cls.objects.get_or_create(user=user)
+        profile.user = user
+
+        lookups = []
+        if history:
+            lookups.append(
+                models.Prefetch(
+                    "history",
+                    queryset=UserRaceHistory.objects.select_related("event").prefetch_related(
+                        "event__categories"
+                    ),
+                )
+            )
+        if achievements:
+            lookups.append("achievements")
+        if lookups:
+            models.prefetch_related_objects([profile], *lookups)
+        return profile
+
     @property
     def completed_races(self) -> int:
-        return self.history.filter(status=UserRaceHistory.Status.COMPLETED).count()
+        return self.runner_stats.completed_races
+
+    @property
+    def runner_stats(self) -> "RunnerStats":
+        """Cached aggregates for this runner, computed on first access."""
+        try:
+            return self.stats
+        except RunnerStats.DoesNotExist:
+            from .stats import refresh_runner_stats
+
+            refresh_runner_stats([self.pk])
+            return RunnerStats.objects.get(profile=self)
 
 
 class UserRaceHistory(models.Model):
@@ -87,6 +133,18 @@ class UserRaceHistory(models.Model):
     class Meta:
         ordering = ["-registration_date"]
         unique_together = ("profile", "event", "category")
+        indexes = [
+            # Leaderboards: per event/category and overall per distance label.
+            models.Index(fields=["event", "category", "finish_time"], name="history_event_board_idx"),
+            models.Index(fields=["category", "finish_time"], name="history_distance_board_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["event", "bib_number"],
+                condition=~Q(bib_number=""),
+                name="history_unique_event_bib",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.profile.full_display_name} - {self.event.title}"
@@ -112,3 +170,90 @@ class RunnerAchievement(models.Model):
         return f"{self.profile.full_display_name} - {self.title}"
 
 
+class RunnerStats(models.Model):
+    """Per-runner aggregates over UserRaceHistory, refreshed when history changes."""
+
+    profile = models.OneToOneField(
+        UserProfile,
+        on_delete=models.CASCADE,
+        related_name="stats",
+    )
+    total_races = models.PositiveIntegerField(default=0)
+    completed_races = models.PositiveIntegerField(default=0)
+    upcoming_races = models.PositiveIntegerField(default=0)
+    total_distance_km = models.DecimalField(max_digits=9, decimal_places=2, default=0)
+    total_time = models.DurationField(default=timedelta)
+    average_pace_seconds = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Seconds per km over completed races with a finish time and known distance.",
+    )
+    personal_bests = models.JSONField(default=list, blank=True)
+    yearly = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "runner stats"
+        indexes = [
+            models.Index(fields=["-total_distance_km"], name="runnerstats_distance_idx"),
+            models.Index(fields=["-completed_races"], name="runnerstats_completed_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.profile.full_display_name} stats"
+
+
+class BibSequence(models.Model):
+    """
+    Bib counter for an event, optionally scoped to one category's range.
+
+    ``category`` matches ``UserRaceHistory.category``; the blank category is the
+    event-wide fallback used when a category has no range of its own.
+    """
+
+    event = models.ForeignKey(
+        Event,
+        on_delete=models.CASCADE,
+        related_name="bib_sequences",
+    )
+    category = models.CharField(max_length=50, blank=True)
+    prefix = models.CharField(max_length=8, blank=True)
+    start = models.PositiveIntegerField(default=1)
+    end = models.PositiveIntegerField(null=True, blank=True, help_text="Last number in the range; blank for no limit.")
+    width = models.PositiveSmallIntegerField(default=4, help_text="Numbers are zero-padded to this many digits.")
+    next_value = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        ordering = ["event", "category"]
+        constraints = [
+            models.UniqueConstraint(fields=["event", "category"], name="bibsequence_unique_event_category"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.event} {self.category or 'all categories'} bibs"
+
+    def clean(self):
+        super().clean()
+        if self.end is not None and self.end < self.start:
+            raise ValidationError({"end": "The range must end at or after its start."})
+        if self.event_id is None:
+            return
+        # Same prefix and width format the same bibs; their ranges must not meet.
+        others = BibSequence.objects.filter(event_id=self.event_id, prefix=self.prefix, width=self.width).exclude(
+            pk=self.pk
+        )
+        for other in others:
+            if (self.end is None or other.start <= self.end) and (other.end is None or self.start <= other.end):
+                raise ValidationError(
+                    f"Bibs {self.format(self.start)}-{self.format(self.end) if self.end is not None else ''} "
+                    f"overlap the range of {other.category or 'all categories'}; "
+                    "use another prefix or a range that does not overlap."
+                )
+
+    def save(self, *args, **kwargs):
+        if self._state.adding and self.next_value < self.start:
+            self.next_value = self.start
+        super().save(*args, **kwargs)
+
+    def format(self, number: int) -> str:
+        return f"{self.prefix}{number:0{self.width}d}"
@@ -0,0 +1,234 @@
+import csv
+import math
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Iterable, Iterator, Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import invalidate_profiles
+from .leaderboards import invalidate_leaderboards
+from .models import UserRaceHistory
+from .stats import refresh_runner_stats
+
+RESULTS_BATCH_SIZE = 1000
+
+# Header aliases used by common timing-system exports.
+_COLUMN_ALIASES = {
+    "bib": ("bib", "bib_number", "bib_no", "bib number"),
+    "finish_time": ("finish_time", "chip_time", "net_time", "time"),
+    "status": ("status", "result"),
+    "medal": ("medal", "medal_awarded"),
+}
+_STATUS_ALIASES = {
+    "": UserRaceHistory.Status.COMPLETED,
+    "completed": UserRaceHistory.Status.COMPLETED,
+    "finished": UserRaceHistory.Status.COMPLETED,
+    "finisher": UserRaceHistory.Status.COMPLETED,
+    "fin": UserRaceHistory.Status.COMPLETED,
+    "ok": UserRaceHistory.Status.COMPLETED,
+    "dnf": UserRaceHistory.Status.DNF,
+    "dq": UserRaceHistory.Status.DNF,
+    "dsq": UserRaceHistory.Status.DNF,
+    "dns": UserRaceHistory.Status.DNS,
+}
+_TRUTHY = {"1", "true", "yes", "y"}
+_FALSY = {"0", "false", "no", "n"}
+
+
+class ResultsFormatError(ValueError):
+    """The results file is unreadable: a required column is missing, or it is not UTF-8 CSV."""
+
+
+@dataclass
+class ResultsImport:
+    updated: int = 0
+    unmatched_bibs: list[str] = field(default_factory=list)
+    duplicate_bibs: list[str] = field(default_factory=list)
+    errors: list[dict] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        return {
+            "updated": self.updated,
+            "unmatched_bibs": self.unmatched_bibs,
+            "duplicate_bibs": self.duplicate_bibs,
+            "errors": self.errors,
+        }
+
+
+def parse_finish_time(value: str) -> Optional[timedelta]:
+    """Parse ``H:MM:SS(.f)``, ``MM:SS(.f)`` or plain seconds; blank means no time."""
+    value = (value or "").strip()
+    if not value:
+        return None
+    parts = value.split(":")
+    if len(parts) > 3:
+        raise ValueError(f"Invalid finish time: {value}")
+    try:
+        seconds = float(parts[-1])
+        minutes = int(parts[-2]) if len(parts) > 1 else 0
+        hours = int(parts[-3]) if len(parts) > 2 else 0
+    except ValueError:
+        raise ValueError(f"Invalid finish time: {value}") from None
+    out_of_range = (
+        not math.isfinite(seconds)
+        or min(hours, minutes, seconds) < 0
+        or (len(parts) > 1 and seconds >= 60)
+        or (len(parts) > 2 and minutes >= 60)
+    )
+    if out_of_range:
+        raise ValueError(f"Invalid finish time: {value}")
+    try:
+        return timedelta(hours=hours, minutes=minutes, seconds=seconds)
+    except OverflowError:
+        raise ValueError(f"Invalid finish time: {value}") from None
+
+
+def _resolve_columns(fieldnames: Optional[Iterable[str]]) -> dict[str, str]:
+    normalized = {name.strip().lower(): name for name in (fieldnames or []) if name}
+    columns = {}
+    for column, aliases in _COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in normalized:
+                columns[column] = normalized[alias]
+                break
+    if "bib" not in columns:
+        raise ResultsFormatError("Results file needs a bib column.")
+    if "finish_time" not in columns and "status" not in columns:
+        raise ResultsFormatError("Results file needs a finish_time or status column.")
+    return columns
+
+
+def _parse_row(row: dict, columns: dict[str, str]) -> tuple[str, Optional[timedelta], bool]:
+    finish_time = parse_finish_time(row.get(columns.get("finish_time", ""), ""))
+    raw_status = (row.get(columns.get("status", ""), "") or "").strip().lower()
+    if raw_status not in _STATUS_ALIASES:
+        raise ValueError(f"Unknown status: {raw_status}")
+    status = _STATUS_ALIASES[raw_status]
+    if status == UserRaceHistory.Status.COMPLETED and finish_time is None:
+        raise ValueError("Finishers need a finish time.")
+    if status != UserRaceHistory.Status.COMPLETED:
+        finish_time = None
+
+    medal_awarded = status == UserRaceHistory.Status.COMPLETED
+    raw_medal = (row.get(columns.get("medal", ""), "") or "").strip().lower()
+    if raw_medal in _TRUTHY:
+        medal_awarded = True
+    elif raw_medal in _FALSY:
+        medal_awarded = False
+    elif raw_medal:
+        raise ValueError(f"Invalid medal flag: {raw_medal}")
+    return status, finish_time, medal_awarded
+
+
+def _apply_batch(rows: list[tuple], now) -> int:
+    """
+    Write one batch of parsed results.
+
+    Only the finish time differs per runner, so it is the single field sent
+    through ``bulk_update``; status and medal take a handful of values and are
+    set with one plain UPDATE per combination.
+    """
+    groups = defaultdict(list)
+    for pk, status, _, medal_awarded in rows:
+        groups[(status, medal_awarded)].append(pk)
+    updated = 0
+    for (status, medal_awarded), pks in groups.items():
+        updated += UserRaceHistory.objects.filter(pk__in=pks).update(
+            status=status, medal_awarded=medal_awarded, updated_at=now
+        )
+    UserRaceHistory.objects.bulk_update(
+        [UserRaceHistory(pk=pk, finish_time=finish_time) for pk, _, finish_time, _ in rows],
+        ["finish_time"],
+    )
+    return updated
+
+
+def _rows(reader: csv.DictReader) -> Iterator[dict]:
+    try:
+        yield from reader
+    except csv.Error as exc:
+        raise ResultsFormatError(f"Line {reader.reader.line_num}: {exc}") from None
+
+
+def decode_lines(lines: Iterable[bytes]) -> Iterator[str]:
+    """
+    UTF-8 lines of a binary results file, BOM dropped. Decoded one line at a
+    time so a bad byte is reported on its own line.
+    """
+    for line_number, line in enumerate(lines, start=1):
+        try:
+            yield line.decode("utf-8-sig" if line_number == 1 else "utf-8")
+        except UnicodeDecodeError as exc:
+            raise ResultsFormatError(f"Line {line_number}: not valid UTF-8 ({exc.reason}).") from None
+
+
+def import_results(event, stream: Iterable[str], *, batch_size: int = RESULTS_BATCH_SIZE) -> ResultsImport:
+    """
+    Apply a timing-system CSV to ``event``'s race history.
+
+    Rows are matched on bib number through one bib -> history map built up
+    front, and written every ``batch_size`` rows (see ``_apply_batch``), so the
+    cost is a handful of statements per batch rather than per finisher. Stats,
+    profile caches and leaderboards of the affected runners are refreshed once
+    at the end. The whole import is atomic; malformed CSV raises
+    ``ResultsFormatError`` with its line number.
+    """
+    reader = csv.DictReader(stream, strict=True)
+    try:
+        columns = _resolve_columns(reader.fieldnames)
+    except csv.Error as exc:
+        raise ResultsFormatError(f"Line {reader.reader.line_num}: {exc}") from None
+    bib_map = {
+        bib: (pk, profile_id, user_id)
+        for bib, pk, profile_id, user_id in UserRaceHistory.objects.filter(event=event)
+        .exclude(bib_number="")
+        .order_by()
+        .values_list("bib_number", "id", "profile_id", "profile__user_id")
+    }
+
+    result = ResultsImport()
+    seen = set()
+    profile_ids, user_ids = set(), set()
+    pending = []
+    now = timezone.now()
+
+    with transaction.atomic():
+        for line_number, row in enumerate(_rows(reader), start=2):
+            bib = (row.get(columns["bib"]) or "").strip()
+            if not bib:
+                result.errors.append({"line": line_number, "error": "Missing bib."})
+                continue
+            try:
+                status, finish_time, medal_awarded = _parse_row(row, columns)
+            except ValueError as exc:
+                result.errors.append({"line": line_number, "bib": bib, "error": str(exc)})
+                continue
+            match = bib_map.get(bib)
+            if match is None:
+                result.unmatched_bibs.append(bib)
+                continue
+            if bib in seen:
+                result.duplicate_bibs.append(bib)
+                continue
+            seen.add(bib)
+
+            pk, profile_id, user_id = match
+            profile_ids.add(profile_id)
+            user_ids.add(user_id)
+            pending.append((pk, status, finish_time, medal_awarded))
+            if len(pending) >= batch_size:
+                result.updated += _apply_batch(pending, now)
+                pending = []
+
+        if pending:
+            result.updated += _apply_batch(pending, now)
+
+        # bulk_update bypasses the history signals.
+        refresh_runner_stats(profile_ids)
+        invalidate_profiles(user_ids)
+        invalidate_leaderboards([event.pk])
+
+    return result
@@ -1,11 +1,79 @@
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
-from .models import UserProfile
+from events.models import Event
+from .cache import invalidate_profile, invalidate_profiles
+from .leaderboards import invalidate_leaderboards
+from .stats import refresh_runner_stats
+from .models import RunnerAchievement, RunnerStats, UserProfile, UserRaceHistory
 
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def create_user_profile(sender, instance, created, **kwargs):
     if created:
         UserProfile.objects.get_or_create(user=instance)
+
+
+@receiver(post_save, sender=UserProfile)
+def create_runner_stats(sender, instance, created, **kwargs):
+    # A new profile has no history yet, so its stats are all zeroes.
+    if created:
+        RunnerStats.objects.get_or_create(profile=instance)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_profile_cache(sender, instance, **kwargs):
+    # Username, names and staff flags are part of the cached documents.
+    invalidate_profile(instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_profile_cache(sender, instance, **kwargs):
+    invalidate_profile(instance.user_id)
+
+
+@receiver(post_save, sender=UserRaceHistory)
+@receiver(post_delete, sender=UserRaceHistory)
+@receiver(post_save, sender=RunnerAchievement)
+@receiver(post_delete, sender=RunnerAchievement)
+def invalidate_profile_cache_for_child(sender, instance, origin=None, **kwargs):
+    # Cascades from a profile or user delete are covered by the profile's own
+    # signal, and those from an event delete by invalidate_event_runners.
+    origin_model = getattr(origin, "model", type(origin))
+    if origin is not None and origin_model in (UserProfile, get_user_model(), Event):
+        return
+    if sender.profile.is_cached(instance):
+        user_id = instance.profile.user_id
+    else:
+        # Only the user id is needed; don't load the profile for it.
+        user_id = UserProfile.objects.filter(pk=instance.profile_id).values_list("user_id", flat=True).first()
+    if user_id is not None:
+        invalidate_profile(user_id)
+
+
+@receiver(pre_delete, sender=Event)
+def invalidate_event_runners(sender, instance, **kwargs):
+    # One query for every runner of the event instead of one per history row.
+    invalidate_profiles(
+        UserRaceHistory.objects.filter(event=instance).values_list("profile__user_id", flat=True).distinct()
+    )
+
+
+@receiver(post_save, sender=UserRaceHistory)
+@receiver(post_delete, sender=UserRaceHistory)
+def refresh_stats_for_history(sender, instance, origin=None, **kwargs):
+    # Skip cascades from a profile or user delete: the stats row goes with them.
+    origin_model = getattr(origin, "model", type(origin))
+    if origin is not None and origin_model in (UserProfile, get_user_model()):
+        return
+    refresh_runner_stats([instance.profile_id])
+
+
+@receiver(post_save, sender=UserRaceHistory)
+@receiver(post_delete, sender=UserRaceHistory)
+def invalidate_event_leaderboards(sender, instance, **kwargs):
+    invalidate_leaderboards([instance.event_id])
@@ -0,0 +1,162 @@
+import re
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from django.db.models import Count, Min, OuterRef, Subquery, Sum
+from django.db.models.functions import ExtractYear
+
+from events.models import EventCategory
+from .models import RunnerStats, UserRaceHistory
+
+UPCOMING_STATUSES = (UserRaceHistory.Status.UPCOMING, UserRaceHistory.Status.REGISTERED)
+STATS_FIELDS = (
+    "total_races",
+    "completed_races",
+    "upcoming_races",
+    "total_distance_km",
+    "total_time",
+    "average_pace_seconds",
+    "personal_bests",
+    "yearly",
+    "updated_at",
+)
+STATS_BATCH_SIZE = 500
+
+_DISTANCE_RE = re.compile(r"(\d+(?:[.,]\d+)?)\s*k", re.IGNORECASE)
+
+
+def distance_from_label(label: str) -> Optional[Decimal]:
+    """Best-effort distance for free-text history labels such as "10K" or "21.1k"."""
+    match = _DISTANCE_RE.search(label or "")
+    return Decimal(match.group(1).replace(",", ".")) if match else None
+
+
+def history_aggregates(history=None):
+    """
+    Group history rows by (profile, status, race year, category) in one query.
+
+    Each row carries the race count, how many have a finish time, their summed
+    and best finish times, and the category distance when the label matches an
+    EventCategory. Runner stats fold these rows per profile; leaderboards can
+    run the same grouping over any history queryset.
+    """
+    if history is None:
+        history = UserRaceHistory.objects.all()
+    category_distance = EventCategory.objects.filter(display_name=OuterRef("category")).values("distance_km")[:1]
+    return (
+        history.order_by()
+        .values(
+            "profile_id",
+            "status",
+            "category",
+            year=ExtractYear("event__start_date"),
+            distance_km=Subquery(category_distance),
+        )
+        .annotate(
+            races=Count("id"),
+            timed=Count("finish_time"),
+            total_time=Sum("finish_time"),
+            best_time=Min("finish_time"),
+        )
+    )
+
+
+def _pace(time: timedelta, distance: Decimal) -> Optional[float]:
+    if not distance:
+        return None
+    return round(time.total_seconds() / float(distance), 1)
+
+
+def summarize(rows: Iterable[dict]) -> dict:
+    """Fold one runner's aggregate rows into RunnerStats field values."""
+    stats = {
+        "total_races": 0,
+        "completed_races": 0,
+        "upcoming_races": 0,
+        "total_distance_km": Decimal("0"),
+        "total_time": timedelta(),
+    }
+    paced_time, paced_distance = timedelta(), Decimal("0")
+    bests: dict[Decimal, dict] = {}
+    yearly = defaultdict(
+        lambda: {
+            "races": 0,
+            "distance_km": Decimal("0"),
+            "time": timedelta(),
+            "paced_distance": Decimal("0"),
+            "paced_time": timedelta(),
+        }
+    )
+
+    for row in rows:
+        races = row["races"]
+        stats["total_races"] += races
+        if row["status"] in UPCOMING_STATUSES:
+            stats["upcoming_races"] += races
+        if row["status"] != UserRaceHistory.Status.COMPLETED:
+            continue
+
+        stats["completed_races"] += races
+        distance = row["distance_km"]
+        if distance is None:
+            distance = distance_from_label(row["category"])
+        time = row["total_time"] or timedelta()
+        stats["total_time"] += time
+        year = yearly[str(row["year"])] if row["year"] else None
+        if year is not None:
+            year["races"] += races
+            year["time"] += time
+        if not distance:
+            continue
+
+        stats["total_distance_km"] += distance * races
+        if row["timed"]:
+            paced_distance += distance * row["timed"]
+            paced_time += time
+        if year is not None:
+            year["distance_km"] += distance * races
+            if row["timed"]:
+                year["paced_distance"] += distance * row["timed"]
+                year["paced_time"] += time
+        best = row["best_time"]
+        if best and (distance not in bests or best < bests[distance]["time"]):
+            bests[distance] = {"category": row["category"], "time": best}
+
+    stats["average_pace_seconds"] = _pace(paced_time, paced_distance)
+    stats["personal_bests"] = [
+        {
+            "distance_km": float(distance),
+            "category": best["category"],
+            "finish_time": best["time"].total_seconds(),
+            "pace_seconds": _pace(best["time"], distance),
+        }
+        for distance, best in sorted(bests.items())
+    ]
+    stats["yearly"] = {
+        year: {
+            "races": totals["races"],
+            "distance_km": float(totals["distance_km"]),
+            "time_seconds": totals["time"].total_seconds(),
+            "average_pace_seconds": _pace(totals["paced_time"], totals["paced_distance"]),
+        }
+        for year, totals in sorted(yearly.items())
+    }
+    return stats
+
+
+def refresh_runner_stats(profile_ids: Iterable[int]) -> None:
+    """Recompute and upsert RunnerStats for ``profile_ids`` (one aggregate query per batch)."""
+    profile_ids = sorted(set(profile_ids))
+    for start in range(0, len(profile_ids), STATS_BATCH_SIZE):
+        batch = profile_ids[start:start + STATS_BATCH_SIZE]
+        rows = defaultdict(list)
+        for row in history_aggregates(UserRaceHistory.objects.filter(profile_id__in=batch)):
+            rows[row["profile_id"]].append(row)
+        RunnerStats.objects.bulk_create(
+            [RunnerStats(profile_id=profile_id, **summarize(rows[profile_id])) for profile_id in batch],
+            update_conflicts=True,
+            unique_fields=["profile"],
+            update_fields=STATS_FIELDS,
+        )
@@ -7,6 +7,7 @@ from django.contrib.auth.hashers import check_password # Untuk cek password chan
 # --- TAMBAHKAN IMPORT INI ---
 from django.utils import timezone 
 import datetime
+import decimal
 # -----------------------------
 
 # --- Impor Model & Form dari App Profiles ---
@@ -453,4 +454,550 @@ class ProfileViewTests(TestCase):
         except NoReverseMatch:
              self.fail(f"Could not reverse URL '{url_name}'. Check profiles/urls.py.")
 
-        
\ No newline at end of file
+        
+
+class ProfileLoaderTests(TestCase):
+    """Profile endpoints cost a fixed number of queries regardless of history size."""
+
+    def setUp(self):
+        from events.models import EventCategory
+
+        self.user = User.objects.create_user(username='veteran', password='password123')
+        self.client.login(username='veteran', password='password123')
+        self.profile, _ = UserProfile.objects.get_or_create(user=self.user)
+        self.category = EventCategory.objects.create(
+            name='loader-10k', display_name='Loader 10K', distance_km=10
+        )
+        RunnerAchievement.objects.create(profile=self.profile, title='Sub-50 10K')
+        self.race_count = 0
+
+    def _add_races(self, count):
+        today = timezone.now().date()
+        for _ in range(count):
+            self.race_count += 1
+            event = Event.objects.create(
+                title=f'Race {self.race_count}',
+                city='Jakarta',
+                start_date=today - datetime.timedelta(days=self.race_count),
+                registration_deadline=today - datetime.timedelta(days=self.race_count + 5),
+            )
+            event.categories.add(self.category)
+            UserRaceHistory.objects.create(
+                profile=self.profile,
+                event=event,
+                registration_date=today - datetime.timedelta(days=self.race_count),
+                status=UserRaceHistory.Status.COMPLETED,
+            )
+
+    def _query_count(self, url):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response.json()
+
+    def test_profile_api_query_count_is_constant(self):
+        self._add_races(3)
+        small_count, _ = self._query_count('/api/profile/')
+        self._add_races(30)
+        large_count, payload = self._query_count('/api/profile/')
+
+        self.assertEqual(small_count, large_count)
+        self.assertEqual(len(payload['history']), 20)
+        self.assertEqual(payload['history_total'], 33)
+        self.assertTrue(payload['history_has_next'])
+        self.assertEqual(payload['history'][0]['event']['categories'][0]['display_name'], 'Loader 10K')
+        self.assertEqual(payload['achievements'][0]['title'], 'Sub-50 10K')
+
+    def test_history_endpoint_paginates(self):
+        self._add_races(25)
+        _, first = self._query_count('/api/profile/history/')
+        _, second = self._query_count('/api/profile/history/?page=2')
+
+        self.assertEqual(first['total'], 25)
+        self.assertTrue(first['has_next'])
+        self.assertEqual(len(second['results']), 5)
+        self.assertFalse(second['has_next'])
+        self.assertEqual(first['results'][0]['event']['title'], 'Race 1')
+
+    def test_legacy_profile_json_query_count_is_constant(self):
+        url = reverse('profiles:profile-json')
+        self._add_races(2)
+        small_count, _ = self._query_count(url)
+        self._add_races(20)
+        large_count, payload = self._query_count(url)
+
+        self.assertEqual(small_count, large_count)
+        self.assertEqual(len(payload['history']), 22)
+
+
+class ProfileCacheTests(TestCase):
+    """Per-user profile documents are cached, versioned and invalidated on writes."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from core.cache import TwoTierCache
+
+        cache.clear()
+        TwoTierCache.clear_all_local()
+        self.user = User.objects.create_user(username='cached', password='password123')
+        self.client.login(username='cached', password='password123')
+        self.profile = UserProfile.objects.get(user=self.user)
+        self.event = Event.objects.create(
+            title='Cache Run',
+            city='Surabaya',
+            start_date=timezone.now().date() + datetime.timedelta(days=20),
+            registration_deadline=timezone.now().date() + datetime.timedelta(days=10),
+        )
+
+    def _get(self, url, **extra):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, **extra)
+        profile_queries = [q['sql'] for q in ctx.captured_queries if '"profiles_' in q['sql']]
+        return response, profile_queries
+
+    def test_second_read_is_served_from_cache(self):
+        first, first_queries = self._get('/api/profile/')
+        second, second_queries = self._get('/api/profile/')
+
+        self.assertTrue(first_queries)
+        self.assertEqual(second_queries, [])
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(second['ETag'], f'"{second.json()["version"]}"')
+
+    def test_matching_version_returns_304(self):
+        version = self.client.get('/api/profile/').json()['version']
+
+        response, queries = self._get('/api/profile/', HTTP_IF_NONE_MATCH=f'W/"{version}"')
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(queries, [])
+        self.assertEqual(self.client.get('/api/profile/', {'version': version}).status_code, 304)
+        legacy = self.client.get(reverse('profiles:profile-json'))
+        self.assertEqual(
+            self.client.get(reverse('profiles:profile-json'), {'version': legacy.json()['version']}).status_code,
+            304,
+        )
+
+    def test_writes_invalidate_cached_documents(self):
+        url = reverse('profiles:profile-json')
+        version = self.client.get(url).json()['version']
+
+        RunnerAchievement.objects.create(profile=self.profile, title='Podium')
+        payload = self.client.get(url, {'version': version}).json()
+        self.assertNotEqual(payload['version'], version)
+        self.assertEqual([a['title'] for a in payload['achievements']], ['Podium'])
+
+        self.profile.city = 'Malang'
+        self.profile.save()
+        self.assertEqual(self.client.get('/api/profile/').json()['city'], 'Malang')
+
+    def test_registration_history_sync_invalidates(self):
+        from registrations.bulk import bulk_set_status
+        from registrations.models import EventRegistration
+
+        url = reverse('profiles:profile-json')
+        self.assertEqual(self.client.get(url).json()['history'], [])
+
+        registration = EventRegistration.objects.create(
+            user=self.user,
+            event=self.event,
+            phone_number='0811',
+            emergency_contact_name='Em',
+            emergency_contact_phone='0822',
+        )
+        history = self.client.get(url).json()['history']
+        self.assertEqual([item['event'] for item in history], ['Cache Run'])
+
+        bulk_set_status([registration.id], EventRegistration.Status.CONFIRMED)
+        history = self.client.get(url).json()['history']
+        self.assertEqual(history[0]['status'], UserRaceHistory.Status.UPCOMING)
+
+        bulk_set_status([registration.id], EventRegistration.Status.REJECTED)
+        history = self.client.get(url).json()['history']
+        self.assertEqual(history[0]['status'], UserRaceHistory.Status.DNS)
+
+    def test_event_delete_invalidates_runners_in_one_query(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        url = reverse('profiles:profile-json')
+        for index in range(3):
+            other = User.objects.create_user(username=f'cascade{index}', password='password123')
+            UserRaceHistory.objects.create(profile=other.profile, event=self.event)
+        UserRaceHistory.objects.create(profile=self.profile, event=self.event)
+        version = self.client.get(url).json()['version']
+
+        with CaptureQueriesContext(connection) as ctx:
+            Event.objects.get(pk=self.event.pk).delete()
+        profile_lookups = [
+            q['sql'] for q in ctx.captured_queries
+            if q['sql'].startswith('SELECT') and '"profiles_userprofile"' in q['sql']
+        ]
+        self.assertEqual(len(profile_lookups), 1)
+        payload = self.client.get(url, {'version': version}).json()
+        self.assertNotEqual(payload['version'], version)
+        self.assertEqual(payload['history'], [])
+
+
+class RunnerStatsTests(TestCase):
+    """Aggregated runner stats are computed in one query and kept in sync with history."""
+
+    def setUp(self):
+        from events.models import EventCategory
+
+        self.user = User.objects.create_user(username='statsrunner', password='password123')
+        self.profile = UserProfile.objects.get(user=self.user)
+        self.ten_k = EventCategory.objects.create(name='stats-10k', display_name='Stats 10K', distance_km=10)
+        self.half = EventCategory.objects.create(name='stats-21k', display_name='Stats 21K', distance_km='21.10')
+        self.events = 0
+
+    def _race(self, category, status, finish_minutes=None, year=2024, profile=None):
+        self.events += 1
+        event = Event.objects.create(
+            title=f'Stats Race {self.events}',
+            city='Bandung',
+            start_date=datetime.date(year, 3, self.events),
+            registration_deadline=datetime.date(year, 2, 1),
+        )
+        return UserRaceHistory.objects.create(
+            profile=profile or self.profile,
+            event=event,
+            category=category,
+            status=status,
+            finish_time=datetime.timedelta(minutes=finish_minutes) if finish_minutes else None,
+        )
+
+    def _stats(self):
+        from profiles.models import RunnerStats
+
+        return RunnerStats.objects.get(profile=self.profile)
+
+    def test_aggregates_totals_pbs_pace_and_years(self):
+        completed = UserRaceHistory.Status.COMPLETED
+        self._race('Stats 10K', completed, 50, year=2024)
+        self._race('Stats 10K', completed, 45, year=2025)
+        self._race('Stats 21K', completed, 120, year=2025)
+        self._race('5K', completed, None, year=2025)
+        self._race('Stats 10K', UserRaceHistory.Status.UPCOMING)
+        self._race('Stats 10K', UserRaceHistory.Status.DNF)
+
+        stats = self._stats()
+        self.assertEqual(stats.total_races, 6)
+        self.assertEqual(stats.completed_races, 4)
+        self.assertEqual(stats.upcoming_races, 1)
+        self.assertEqual(stats.total_distance_km, decimal.Decimal('46.10'))
+        self.assertEqual(stats.total_time, datetime.timedelta(minutes=215))
+        self.assertAlmostEqual(stats.average_pace_seconds, round(215 * 60 / 41.1, 1))
+        self.assertEqual(
+            [(pb['distance_km'], pb['finish_time']) for pb in stats.personal_bests],
+            [(10.0, 45 * 60), (21.1, 120 * 60)],
+        )
+        self.assertEqual(stats.yearly['2024']['races'], 1)
+        self.assertEqual(stats.yearly['2025']['races'], 3)
+        self.assertEqual(stats.yearly['2025']['distance_km'], 36.1)
+        self.assertEqual(self.profile.completed_races, 4)
+
+    def test_history_changes_refresh_stats(self):
+        race = self._race('Stats 10K', UserRaceHistory.Status.UPCOMING)
+        self.assertEqual(self._stats().completed_races, 0)
+
+        race.status = UserRaceHistory.Status.COMPLETED
+        race.finish_time = datetime.timedelta(minutes=55)
+        race.save()
+        self.assertEqual(self._stats().personal_bests[0]['finish_time'], 55 * 60)
+
+        race.delete()
+        self.assertEqual(self._stats().total_races, 0)
+
+    def test_refresh_is_one_aggregate_per_batch(self):
+        from profiles.stats import refresh_runner_stats
+
+        profiles = [self.profile]
+        for index in range(3):
+            user = User.objects.create_user(username=f'statsbatch{index}', password='password123')
+            profiles.append(UserProfile.objects.get(user=user))
+            self._race('Stats 10K', UserRaceHistory.Status.COMPLETED, 50 + index, profile=profiles[-1])
+
+        with self.assertNumQueries(2):
+            refresh_runner_stats(profile.pk for profile in profiles)
+
+    def test_dashboard_uses_cached_counts(self):
+        self._race('Stats 10K', UserRaceHistory.Status.COMPLETED, 50)
+        self._race('Stats 21K', UserRaceHistory.Status.REGISTERED)
+        self.client.login(username='statsrunner', password='password123')
+
+        response = self.client.get(reverse('profiles:dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['stats'], {'total_events': 2, 'completed': 1, 'upcoming': 1})
+        self.assertEqual(response.context['next_event'].category, 'Stats 21K')
+
+
+class ResultsImportTests(TestCase):
+    """Tests for profiles.results, the import_results command and the admin upload."""
+
+    def setUp(self):
+        self.event = Event.objects.create(
+            title='Results Run',
+            city='Jakarta',
+            start_date=timezone.now().date() - datetime.timedelta(days=1),
+            registration_deadline=timezone.now().date() - datetime.timedelta(days=10),
+        )
+        self.history = []
+        for index in range(4):
+            user = User.objects.create_user(username=f'resultrunner{index}', password='password123')
+            self.history.append(
+                UserRaceHistory.objects.create(
+                    profile=UserProfile.objects.get(user=user),
+                    event=self.event,
+                    category='10K',
+                    status=UserRaceHistory.Status.UPCOMING,
+                    bib_number=f'A{index + 1:03d}',
+                )
+            )
+
+    def _csv(self, *lines):
+        import io
+
+        return io.StringIO('\n'.join(lines) + '\n')
+
+    def test_import_updates_matched_rows_and_reports_problems(self):
+        from profiles.results import import_results
+
+        result = import_results(self.event, self._csv(
+            'Bib,Chip_Time,Status',
+            'A001,0:45:10,Finished',
+            'A002,,DNF',
+            'A003,52:30.5,',
+            'A003,50:00,',
+            'Z999,1:00:00,',
+            'A004,soon,',
+        ))
+
+        self.assertEqual(result.updated, 3)
+        self.assertEqual(result.unmatched_bibs, ['Z999'])
+        self.assertEqual(result.duplicate_bibs, ['A003'])
+        self.assertEqual(result.errors, [{'line': 7, 'bib': 'A004', 'error': 'Invalid finish time: soon'}])
+
+        first, second, third, fourth = (UserRaceHistory.objects.get(pk=h.pk) for h in self.history)
+        self.assertEqual((first.status, first.finish_time, first.medal_awarded),
+                         ('completed', datetime.timedelta(minutes=45, seconds=10), True))
+        self.assertEqual((second.status, second.finish_time, second.medal_awarded), ('dnf', None, False))
+        self.assertEqual(third.finish_time, datetime.timedelta(minutes=52, seconds=30.5))
+        self.assertEqual(fourth.status, 'upcoming')
+        self.assertEqual(first.profile.stats.completed_races, 1)
+
+    def test_overflowing_times_are_row_errors(self):
+        from profiles.results import import_results
+
+        result = import_results(self.event, self._csv(
+            'Bib,Chip_Time',
+            'A001,inf',
+            'A002,nan',
+            'A003,999999999999:00:00',
+            'A004,1e300',
+        ))
+
+        self.assertEqual(result.updated, 0)
+        self.assertEqual([error['bib'] for error in result.errors], ['A001', 'A002', 'A003', 'A004'])
+        self.assertTrue(all(error['error'].startswith('Invalid finish time') for error in result.errors))
+
+    def test_query_count_does_not_grow_with_rows(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from profiles.results import import_results
+
+        lines = ['bib,finish_time'] + [f'A{i + 1:03d},1:0{i}:00' for i in range(4)]
+        with CaptureQueriesContext(connection) as single_batch:
+            import_results(self.event, self._csv(*lines[:3]))
+        with CaptureQueriesContext(connection) as two_rows_more:
+            import_results(self.event, self._csv(*lines))
+        self.assertEqual(len(single_batch.captured_queries), len(two_rows_more.captured_queries))
+
+    def test_missing_bib_column_is_rejected(self):
+        from profiles.results import ResultsFormatError, import_results
+
+        with self.assertRaises(ResultsFormatError):
+            import_results(self.event, self._csv('runner,finish_time', 'x,1:00:00'))
+
+    def test_command_and_admin_upload(self):
+        import tempfile
+        from io import StringIO
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from django.core.management import call_command
+
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as handle:
+            handle.write('bib,finish_time\nA001,0:40:00\nB404,0:41:00\n')
+        out, err = StringIO(), StringIO()
+        call_command('import_results', handle.name, event=self.event.slug, stdout=out, stderr=err)
+        self.assertIn('Updated 1 results', out.getvalue())
+        self.assertIn('B404', err.getvalue())
+
+        User.objects.create_user(username='resultsadmin', password='password123', is_staff=True)
+        self.client.login(username='resultsadmin', password='password123')
+        upload = SimpleUploadedFile('results.csv', b'\xef\xbb\xbfbib,status\nA002,DNS\n', content_type='text/csv')
+        response = self.client.post(
+            reverse('events_admin_api:event-results', args=[self.event.id]), {'file': upload}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['updated'], 1)
+        self.assertEqual(UserRaceHistory.objects.get(pk=self.history[1].pk).status, 'dns')
+
+    def test_malformed_uploads_are_rejected_with_their_line(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        User.objects.create_user(username='resultsadmin', password='password123', is_staff=True)
+        self.client.login(username='resultsadmin', password='password123')
+        url = reverse('events_admin_api:event-results', args=[self.event.id])
+        for content, line in (
+            (b'bib,finish_time\nA001,0:40:00\nA002,\xff0:41:00\n', 'Line 3'),
+            (b'bib,finish_time\nA001,"0:40:00"x"\n', 'Line 2'),
+        ):
+            upload = SimpleUploadedFile('results.csv', content, content_type='text/csv')
+            response = self.client.post(url, {'file': upload})
+            self.assertEqual(response.status_code, 400)
+            self.assertTrue(response.json()['errors']['file'].startswith(line), response.json())
+        self.assertIsNone(UserRaceHistory.objects.get(pk=self.history[0].pk).finish_time)
+        # NUL bytes are a csv.Error before Python 3.11 and a bad row after.
+        upload = SimpleUploadedFile('results.csv', b'bib,finish_time\nA001,0:4\x000:00\n', content_type='text/csv')
+        self.assertIn(self.client.post(url, {'file': upload}).status_code, (200, 400))
+
+
+class BibAllocationTests(TestCase):
+    """Bibs come from per-event sequences, in contiguous blocks, unique per event."""
+
+    def setUp(self):
+        self.event = Event.objects.create(
+            title='Bib Run',
+            city='Jakarta',
+            start_date=timezone.now().date() + datetime.timedelta(days=30),
+            registration_deadline=timezone.now().date() + datetime.timedelta(days=10),
+        )
+
+    def _history(self, username, category='10K', **kwargs):
+        user = User.objects.create_user(username=username, password='password123')
+        return UserRaceHistory.objects.create(
+            profile=UserProfile.objects.get(user=user), event=self.event, category=category, **kwargs
+        )
+
+    def test_event_sequence_hands_out_consecutive_blocks(self):
+        from profiles.bibs import allocate_bibs
+
+        self.assertEqual(allocate_bibs(self.event.id, 3), ['0001', '0002', '0003'])
+        self.assertEqual(allocate_bibs(self.event.id, 2, '10K'), ['0004', '0005'])
+
+    def test_category_range_is_used_and_enforced(self):
+        from profiles.bibs import BibRangeExhausted, allocate_bibs
+        from profiles.models import BibSequence
+
+        BibSequence.objects.create(event=self.event, category='21K', prefix='H', start=100, end=102, width=3)
+
+        self.assertEqual(allocate_bibs(self.event.id, 2, '21K'), ['H100', 'H101'])
+        with self.assertRaises(BibRangeExhausted):
+            allocate_bibs(self.event.id, 2, '21K')
+        # The failed request did not consume the last number.
+        self.assertEqual(allocate_bibs(self.event.id, 1, '21K'), ['H102'])
+        self.assertEqual(allocate_bibs(self.event.id, 1, '10K'), ['0001'])
+
+    def test_assign_bibs_skips_numbered_rows(self):
+        from profiles.bibs import assign_bibs
+
+        rows = [self._history('bib1'), self._history('bib2', bib_number='0900'), self._history('bib3')]
+
+        assigned = assign_bibs(rows)
+
+        self.assertEqual([row.bib_number for row in assigned], ['0001', '0002'])
+        self.assertEqual(
+            list(UserRaceHistory.objects.filter(event=self.event).order_by('bib_number').values_list('bib_number', flat=True)),
+            ['0001', '0002', '0900'],
+        )
+
+    def test_bib_numbers_are_unique_per_event(self):
+        from django.db import IntegrityError, transaction
+
+        self._history('dup1', bib_number='0007')
+        self._history('blank1')
+        self._history('blank2')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self._history('dup2', bib_number='0007')
+
+    def test_admin_confirm_allocates_from_sequence(self):
+        User.objects.create_user(username='bibadmin', password='password123', is_staff=True, is_superuser=True)
+        participant = self._history('confirmme', status=UserRaceHistory.Status.REGISTERED)
+        self.client.login(username='bibadmin', password='password123')
+
+        self.client.post(reverse('profiles:admin-participant-confirm', args=[participant.id]))
+
+        participant.refresh_from_db()
+        self.assertEqual(participant.status, UserRaceHistory.Status.UPCOMING)
+        self.assertEqual(participant.bib_number, '0001')
+
+    def test_allocation_skips_bibs_already_taken(self):
+        from profiles.bibs import allocate_bibs
+
+        # A legacy bib from before sequences existed sits inside the counter.
+        self._history('legacy', bib_number='0002')
+        self.assertEqual(allocate_bibs(self.event.id, 3), ['0001', '0003', '0004'])
+
+    def test_overlapping_ranges_are_rejected(self):
+        from django.core.exceptions import ValidationError
+        from profiles.models import BibSequence
+
+        BibSequence.objects.create(event=self.event, category='21K', start=100, end=199)
+        with self.assertRaises(ValidationError):
+            BibSequence(event=self.event, category='42K', start=150, end=250).full_clean()
+        with self.assertRaises(ValidationError):
+            BibSequence(event=self.event, category='', start=1).full_clean()
+        BibSequence(event=self.event, category='42K', start=200, end=299).full_clean()
+        BibSequence(event=self.event, category='', prefix='X', start=1).full_clean()
+
+    def test_exhausted_range_confirms_without_a_bib(self):
+        from profiles.bibs import allocate_bibs
+        from profiles.models import BibSequence
+        from registrations.bulk import bulk_set_status
+        from registrations.models import EventRegistration
+
+        BibSequence.objects.create(event=self.event, category='10K', prefix='T', start=1, end=1, width=2)
+        allocate_bibs(self.event.id, 1, '10K')
+        admin = User.objects.create_user(username='bibadmin', password='password123', is_staff=True, is_superuser=True)
+        self.client.force_login(admin)
+
+        participant = self._history('fullrange', status=UserRaceHistory.Status.REGISTERED)
+        response = self.client.post(reverse('profiles:admin-participant-confirm', args=[participant.id]))
+        self.assertEqual(response.status_code, 302)
+        participant.refresh_from_db()
+        self.assertEqual(participant.status, UserRaceHistory.Status.UPCOMING)
+        self.assertEqual(participant.bib_number, '')
+        self.assertIn('without a bib', [str(message) for message in get_messages(response.wsgi_request)][0])
+
+        def register(username):
+            return EventRegistration.objects.create(
+                user=User.objects.create_user(username=username, password='password123'),
+                event=self.event,
+                distance_label='10K',
+                phone_number='0811',
+                emergency_contact_name='Em',
+                emergency_contact_phone='0822',
+            )
+
+        single = register('apifull')
+        response = self.client.post(reverse('registrations_admin_api:participant-confirm', args=[single.id]))
+        self.assertEqual(response.status_code, 409)
+        self.assertIn('detail', response.json())
+        single.refresh_from_db()
+        self.assertEqual(single.status, EventRegistration.Status.CONFIRMED)
+
+        bulk = [register('bulkfull1'), register('bulkfull2')]
+        result = bulk_set_status([row.id for row in bulk], EventRegistration.Status.CONFIRMED)
+        self.assertEqual(sorted(result.without_bib), sorted(str(row.id) for row in bulk))
+        self.assertEqual(
+            EventRegistration.objects.filter(pk__in=[row.id for row in bulk], status=EventRegistration.Status.CONFIRMED).count(),
+            2,
+        )
+        self.assertFalse(
+            UserRaceHistory.objects.filter(event=self.event, category='10K').exclude(bib_number='').exists()
+        )
@@ -1,6 +1,14 @@
 import json
 from django.template.loader import render_to_string
-from django.http import HttpResponseRedirect, JsonResponse
+from django.http import HttpResponseRedirect
+from core.renderers import FastJsonResponse
+from .cache import (
+    cached_profile_document,
+    client_has_version,
+    get_profile_version,
+    not_modified,
+    with_version,
+)
 from forum.models import ForumThread, ForumPost, PostReport
 from .forms import (
     EventForm,
@@ -11,6 +19,8 @@ from .forms import (
 )
 from django.db.models import Count
 from .models import UserRaceHistory, RunnerAchievement, UserProfile
+from .bibs import BibRangeExhausted, allocate_bibs
+from .stats import UPCOMING_STATUSES
 from events.models import Event, EventCategory
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.forms import AuthenticationForm
@@ -27,7 +37,7 @@ from django.urls import reverse
 from django.views.decorators.http import require_http_methods, require_POST
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.models import User
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 
 def is_admin(user):
     return user.is_staff or user.is_superuser
@@ -52,7 +62,7 @@ def admin_event_add(request):
         if form.is_valid():
             form.save()
             if is_ajax:
-                return JsonResponse({
+                return FastJsonResponse({
                     'status': 'success',
                     'message': 'Event created successfully!',
                 }, status=201)
@@ -63,7 +73,7 @@ def admin_event_add(request):
                 context = {"form": form, "title": "Add Event"}
                 html_form = render_to_string("profiles/admin_event_form_partial.html", context, request=request)
                 
-                return JsonResponse({
+                return FastJsonResponse({
                     'status': 'error',
                     'form_html': html_form,
                     'message': 'Form validation failed.',
@@ -164,26 +174,27 @@ class DashboardView(LoginRequiredMixin, TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        profile, _ = UserProfile.objects.get_or_create(user=self.request.user)
+        profile = UserProfile.load_for(self.request.user)
+        runner_stats = profile.runner_stats
         history = (
             profile.history.select_related("event")
             .order_by("-registration_date")
         )
-        upcoming = history.filter(status__in=["upcoming", "registered"])
-        completed = history.filter(status="completed")
+        upcoming = list(history.filter(status__in=UPCOMING_STATUSES))
 
         context.update(
             {
                 "profile": profile,
                 "upcoming_history": upcoming[:5],
-                "completed_history": completed[:5],
+                "completed_history": history.filter(status="completed")[:5],
                 "achievements": profile.achievements.all(),
+                "runner_stats": runner_stats,
                 "stats": {
-                    "total_events": history.count(),
-                    "completed": completed.count(),
-                    "upcoming": upcoming.count(),
+                    "total_events": runner_stats.total_races,
+                    "completed": runner_stats.completed_races,
+                    "upcoming": runner_stats.upcoming_races,
                 },
-                "next_event": upcoming.order_by("event__start_date").first(),
+                "next_event": min(upcoming, key=lambda item: item.event.start_date, default=None),
             }
         )
         return context
@@ -271,24 +282,20 @@ class AccountSettingsView(LoginRequiredMixin, TemplateView):
         )
 
 
-@require_http_methods(["GET"])
-def profile_json(request):
-    if not request.user.is_authenticated:
-        return JsonResponse({"status": False, "message": "Belum login"}, status=401)
-
-    profile, _ = UserProfile.objects.get_or_create(user=request.user)
-    history = profile.history.select_related("event")
+def _profile_json_payload(user):
+    profile = UserProfile.load_for(user, history=True)
+    history = profile.history.all()
 
-    data = {
-        "username": request.user.username,
+    return {
+        "username": user.username,
         "display_name": profile.full_display_name,
         "bio": profile.bio,
         "city": profile.city,
         "country": profile.country,
         "favorite_distance": profile.favorite_distance,
         "avatar_url": profile.avatar_url,
-        "is_superuser": request.user.is_superuser,
-        "is_staff": request.user.is_staff,
+        "is_superuser": user.is_superuser,
+        "is_staff": user.is_staff,
         "achievements": [
             {
                 "id": achievement.id,
@@ -315,7 +322,21 @@ def profile_json(request):
             for item in history
         ],
     }
-    return JsonResponse(data)
+
+
+def _cached_profile_response(request, kind, builder):
+    version = get_profile_version(request.user.pk)
+    if client_has_version(request, version):
+        return not_modified(version)
+    data = cached_profile_document(request.user.pk, kind, lambda: builder(request.user))
+    return with_version(FastJsonResponse({**data, "version": version}), version)
+
+
+@require_http_methods(["GET"])
+def profile_json(request):
+    if not request.user.is_authenticated:
+        return FastJsonResponse({"status": False, "message": "Belum login"}, status=401)
+    return _cached_profile_response(request, "profile_json", _profile_json_payload)
 
 
 @login_required
@@ -336,7 +357,7 @@ def achievements_api(request):
             }
             for achievement in profile.achievements.all()
         ]
-        return JsonResponse({"results": achievements})
+        return FastJsonResponse({"results": achievements})
 
     payload = json.loads(request.body or "{}")
     form = ProfileAchievementForm(payload)
@@ -344,7 +365,7 @@ def achievements_api(request):
         achievement = form.save(commit=False)
         achievement.profile = profile
         achievement.save()
-        return JsonResponse(
+        return FastJsonResponse(
             {
                 "success": True,
                 "achievement": {
@@ -361,7 +382,7 @@ def achievements_api(request):
             status=201,
         )
 
-    return JsonResponse({"success": False, "errors": form.errors}, status=400)
+    return FastJsonResponse({"success": False, "errors": form.errors}, status=400)
 
 
 @login_required
@@ -370,7 +391,7 @@ def delete_achievement(request, achievement_id):
     profile, _ = UserProfile.objects.get_or_create(user=request.user)
     achievement = get_object_or_404(RunnerAchievement, pk=achievement_id, profile=profile)
     achievement.delete()
-    return JsonResponse({"success": True})
+    return FastJsonResponse({"success": True})
 
 
 @login_required
@@ -390,25 +411,38 @@ def admin_participant_list(request):
 @user_passes_test(is_admin)
 def admin_participant_confirm(request, participant_id):
     if request.method == "POST":
-        participant = get_object_or_404(UserRaceHistory, id=participant_id)
+        participant = get_object_or_404(
+            UserRaceHistory.objects.select_related('profile__user', 'event'), id=participant_id
+        )
         participant.status = UserRaceHistory.Status.UPCOMING  # Changed to UPCOMING to match CONFIRMED sync
-        # Generate BIB number kalau belum ada
-        if not participant.bib_number:
-            import random
-            participant.bib_number = f"{participant.event.id}{participant.profile.user.id}{random.randint(100, 999)}"
-        participant.save()
+        bib_error = None
+        with transaction.atomic():
+            if not participant.bib_number:
+                try:
+                    participant.bib_number = allocate_bibs(
+                        participant.event_id, 1, participant.category
+                    )[0]
+                except BibRangeExhausted as exc:
+                    bib_error = str(exc)
+            participant.save()
 
         # Also update the EventRegistration status to CONFIRMED
         from registrations.models import EventRegistration
         registration = EventRegistration.objects.filter(
-            user=participant.profile.user,
-            event=participant.event
+            user_id=participant.profile.user_id,
+            event_id=participant.event_id
         ).first()
         if registration:
             registration.status = EventRegistration.Status.CONFIRMED
             registration.save()
 
-        messages.success(request, f"Participant {participant.profile.full_display_name} confirmed!")
+        if bib_error:
+            messages.warning(
+                request,
+                f"Participant {participant.profile.full_display_name} confirmed without a bib: {bib_error}",
+            )
+        else:
+            messages.success(request, f"Participant {participant.profile.full_display_name} confirmed!")
     return redirect('profiles:admin-participant-list')
 
 
@@ -532,27 +566,27 @@ def login_api(request):
 
         if user is not None:
             login(request, user)
-            return JsonResponse({
+            return FastJsonResponse({
                 "status": True,
                 "message": "Berhasil login!",
                 "username": username,
             }, status=200)
         else:
-            return JsonResponse({
+            return FastJsonResponse({
                 "status": False,
                 "message": "Username atau password salah.",
             }, status=401)
-    return JsonResponse({"status": False, "message": "Method not allowed"}, status=405)
+    return FastJsonResponse({"status": False, "message": "Method not allowed"}, status=405)
 
 @csrf_exempt
 def logout_api(request):
     if request.method == 'POST':
         logout(request)
-        return JsonResponse({
+        return FastJsonResponse({
             "status": True,
             "message": "Berhasil logout!",
         }, status=200)
-    return JsonResponse({"status": False, "message": "Method not allowed"}, status=405)
+    return FastJsonResponse({"status": False, "message": "Method not allowed"}, status=405)
 
 @csrf_exempt
 def register_api(request):
@@ -568,28 +602,31 @@ def register_api(request):
         # --------------------------
         
         if User.objects.filter(username=username).exists():
-            return JsonResponse({"status": False, "message": "Username sudah digunakan"}, status=400)
+            return FastJsonResponse({"status": False, "message": "Username sudah digunakan"}, status=400)
         
         try:
             user = User.objects.create_user(username=username, password=password)
             user.save()
-            return JsonResponse({"status": True, "message": "Akun berhasil dibuat!"}, status=201)
+            return FastJsonResponse({"status": True, "message": "Akun berhasil dibuat!"}, status=201)
         except Exception as e:
-            return JsonResponse({"status": False, "message": str(e)}, status=500)
+            return FastJsonResponse({"status": False, "message": str(e)}, status=500)
             
-    return JsonResponse({"status": False, "message": "Method not allowed"}, status=405)
+    return FastJsonResponse({"status": False, "message": "Method not allowed"}, status=405)
 
 def user_profile_json(request):
     # Mengambil data user yang sedang login (Session-based)
     if not request.user.is_authenticated:
-        return JsonResponse({"status": False, "message": "Belum login"}, status=401)
+        return FastJsonResponse({"status": False, "message": "Belum login"}, status=401)
+    return _cached_profile_response(request, "user_profile_json", _user_profile_payload)
+
+
+def _user_profile_payload(user):
+    profile = UserProfile.load_for(user, achievements=False)
 
-    profile, _ = UserProfile.objects.get_or_create(user=request.user)
-    
     # Format JSON sesuai UserProfile.fromJson di Flutter
-    return JsonResponse({
+    return {
         "id": profile.id,
-        "username": request.user.username,
+        "username": user.username,
         "display_name": profile.full_display_name,
         "bio": profile.bio,
         "city": profile.city,
@@ -600,9 +637,9 @@ def user_profile_json(request):
         "updated_at": profile.updated_at.isoformat(),
         "history": [], # Tambahkan logika history jika perlu
         "achievements": [], # Tambahkan logika achievements jika perlu
-        "is_superuser": request.user.is_superuser,
-        "is_staff": request.user.is_staff
-    })
+        "is_superuser": user.is_superuser,
+        "is_staff": user.is_staff
+    }
 
 @csrf_exempt
 @login_required
@@ -639,7 +676,7 @@ def update_profile_json(request):
 
         profile.save()
 
-        return JsonResponse({
+        return FastJsonResponse({
             'status': True, 
             'message': 'Profil berhasil diperbarui',
             # Kembalikan data profil terbaru agar UI bisa langsung update
@@ -655,4 +692,4 @@ def update_profile_json(request):
         })
 
     except Exception as e:
-        return JsonResponse({'status': False, 'message': str(e)}, status=500)
+        return FastJsonResponse({'status': False, 'message': str(e)}, status=500)
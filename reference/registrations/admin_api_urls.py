@@ -6,6 +6,16 @@ app_name = "registrations_admin_api"
 
 urlpatterns = [
     path("participants/", admin_api_views.admin_registrations_api, name="participants"),
+    path(
+        "participants/export/",
+        admin_api_views.admin_registrations_export_api,
+        name="participants-export",
+    ),
+    path(
+        "participants/bulk/",
+        admin_api_views.admin_registrations_bulk_api,
+        name="participants-bulk",
+    ),
     path(
         "participants/<uuid:registration_id>/confirm/",
         admin_api_views.admin_registration_confirm_api,
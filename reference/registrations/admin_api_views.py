@@ -1,6 +1,11 @@
+import uuid
+
 from django.core.paginator import Paginator
 from django.db.models import Q
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.text import slugify
 from rest_framework import status
 from rest_framework.authentication import SessionAuthentication
 from rest_framework.decorators import (
@@ -10,13 +15,23 @@ from rest_framework.decorators import (
     renderer_classes,
 )
 from rest_framework.permissions import IsAdminUser
-from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 
-from core.api_helpers import serialize_registration
+from core.api_helpers import (
+    REGISTRATION_FIELDS,
+    REGISTRATION_RELATED,
+    REGISTRATION_SOURCES,
+    FieldSet,
+    restrict_queryset,
+    serialize_registration,
+    serialize_registration_page,
+)
+from core.renderers import FastJSONRenderer
 from notifications.models import Notification
 from notifications.utils import send_notification
 from profiles.models import UserProfile, UserRaceHistory
+from .bulk import BULK_ACTIONS, bulk_set_status
+from .exports import EXPORT_FORMATS, stream_export
 from .models import EventRegistration
 
 
@@ -41,18 +56,10 @@ def _remove_history(registration: EventRegistration) -> None:
     ).delete()
 
 
-@api_view(["GET"])
-@permission_classes([IsAdminUser])
-@authentication_classes([CsrfExemptSessionAuthentication])
-@renderer_classes([JSONRenderer])
-def admin_registrations_api(request):
-    queryset = (
-        EventRegistration.objects.select_related("event", "category", "user")
-        .order_by("-created_at")
-    )
-    status_filter = request.GET.get("status")
-    event_id = request.GET.get("event")
-    search = request.GET.get("q") or request.GET.get("search")
+def _filter_registrations(queryset, params):
+    status_filter = params.get("status")
+    event_id = params.get("event")
+    search = params.get("q") or params.get("search")
 
     if status_filter:
         queryset = queryset.filter(status=status_filter)
@@ -63,27 +70,72 @@ def admin_registrations_api(request):
             Q(user__username__icontains=search)
             | Q(event__title__icontains=search)
         )
+    return queryset
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+@authentication_classes([CsrfExemptSessionAuthentication])
+@renderer_classes([FastJSONRenderer])
+def admin_registrations_api(request):
+    queryset = restrict_queryset(
+        _filter_registrations(EventRegistration.objects.order_by("-created_at"), request.GET),
+        FieldSet.from_request(request),
+        REGISTRATION_FIELDS,
+        sources=REGISTRATION_SOURCES,
+        related=REGISTRATION_RELATED,
+    )
 
     paginator = Paginator(queryset, 20)
     page_number = request.GET.get("page") or 1
     page_obj = paginator.get_page(page_number)
 
-    return Response(
+    payload = serialize_registration_page(page_obj.object_list, request=request)
+    payload.update(
         {
-            "results": [
-                serialize_registration(reg, request=request)
-                for reg in page_obj.object_list
-            ],
             "total": paginator.count,
             "has_next": page_obj.has_next(),
         }
     )
+    return Response(payload)
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+@authentication_classes([CsrfExemptSessionAuthentication])
+@renderer_classes([FastJSONRenderer])
+def admin_registrations_export_api(request):
+    """
+    Stream every matching registration as CSV or NDJSON for race-day operations.
+    Accepts the same filters as the participant list plus ``output=csv|ndjson``.
+    """
+    export_format = (request.GET.get("output") or "csv").lower()
+    if export_format not in EXPORT_FORMATS:
+        return Response(
+            {"detail": f"output must be one of: {', '.join(EXPORT_FORMATS)}."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    queryset = _filter_registrations(EventRegistration.objects.all(), request.GET)
+    content_type = (
+        "application/x-ndjson" if export_format == "ndjson" else "text/csv; charset=utf-8"
+    )
+    event_id = slugify(request.GET.get("event") or "")
+    filename_scope = f"event-{event_id}" if event_id else "all"
+    filename = f"registrations-{filename_scope}-{timezone.localdate():%Y%m%d}.{export_format}"
+
+    response = StreamingHttpResponse(
+        stream_export(queryset, export_format),
+        content_type=content_type,
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
 
 
 @api_view(["POST"])
 @permission_classes([IsAdminUser])
 @authentication_classes([CsrfExemptSessionAuthentication])
-@renderer_classes([JSONRenderer])
+@renderer_classes([FastJSONRenderer])
 def admin_registration_confirm_api(request, registration_id):
     registration = get_object_or_404(EventRegistration, pk=registration_id)
 
@@ -91,13 +143,61 @@ def admin_registration_confirm_api(request, registration_id):
         registration.status = EventRegistration.Status.CONFIRMED
         registration.save()
 
+    if registration.bib_error:
+        # Confirmed, but the category's bib range is full.
+        return Response(
+            {"detail": registration.bib_error, "registration": serialize_registration(registration, request=request)},
+            status=status.HTTP_409_CONFLICT,
+        )
     return Response(serialize_registration(registration, request=request))
 
 
+@api_view(["POST"])
+@permission_classes([IsAdminUser])
+@authentication_classes([CsrfExemptSessionAuthentication])
+@renderer_classes([FastJSONRenderer])
+def admin_registrations_bulk_api(request):
+    """Apply confirm/reject/waitlist to many registrations in one request."""
+    payload = request.data
+    if not isinstance(payload, dict):
+        return Response(
+            {"detail": "Send a JSON object with action and ids."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    action = payload.get("action")
+    if not isinstance(action, str) or action not in BULK_ACTIONS:
+        return Response(
+            {"detail": f"action must be one of: {', '.join(BULK_ACTIONS)}."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    raw_ids = payload.get("ids")
+    if not isinstance(raw_ids, list) or not raw_ids or not all(isinstance(value, str) for value in raw_ids):
+        return Response(
+            {"detail": "ids must be a non-empty list of registration ids."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    try:
+        registration_ids = [uuid.UUID(str(value)) for value in raw_ids]
+    except ValueError:
+        return Response(
+            {"detail": "ids must be valid registration UUIDs."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    decision_note = payload.get("decision_note")
+    result = bulk_set_status(
+        registration_ids,
+        BULK_ACTIONS[action],
+        decision_note=decision_note.strip() if isinstance(decision_note, str) else None,
+    )
+    return Response(result.as_dict())
+
+
 @api_view(["POST", "DELETE"])
 @permission_classes([IsAdminUser])
 @authentication_classes([CsrfExemptSessionAuthentication])
-@renderer_classes([JSONRenderer])
+@renderer_classes([FastJSONRenderer])
 def admin_registration_delete_api(request, registration_id):
     registration = get_object_or_404(EventRegistration, pk=registration_id)
 
@@ -4,7 +4,15 @@ from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
-from core.api_helpers import serialize_registration
+from core.api_helpers import (
+    REGISTRATION_FIELDS,
+    REGISTRATION_RELATED,
+    REGISTRATION_SOURCES,
+    FieldSet,
+    restrict_queryset,
+    serialize_registration,
+    serialize_registration_page,
+)
 from events.models import Event, EventCategory
 from .models import EventRegistration
 
@@ -16,23 +24,24 @@ def registrations_api(request):
     POST: create or update a registration for an event.
     """
     if request.method == "GET":
-        queryset = (
-            EventRegistration.objects.filter(user=request.user)
-            .select_related("event", "category", "user")
-            .order_by("-created_at")
+        queryset = restrict_queryset(
+            EventRegistration.objects.filter(user=request.user).order_by("-created_at"),
+            FieldSet.from_request(request),
+            REGISTRATION_FIELDS,
+            sources=REGISTRATION_SOURCES,
+            related=REGISTRATION_RELATED,
         )
         paginator = Paginator(queryset, 20)
         page_number = request.GET.get("page") or 1
         page_obj = paginator.get_page(page_number)
-        return Response(
+        payload = serialize_registration_page(page_obj.object_list, request=request)
+        payload.update(
             {
-                "results": [
-                    serialize_registration(reg) for reg in page_obj.object_list
-                ],
                 "total": paginator.count,
                 "has_next": page_obj.has_next(),
             }
         )
+        return Response(payload)
 
     # POST branch
     payload = request.data
@@ -88,7 +97,9 @@ def registrations_api(request):
 def registration_detail_api(request, reference_code: str):
     """Get a single registration by reference code."""
     registration = get_object_or_404(
-        EventRegistration.objects.select_related("event", "category", "user"),
+        EventRegistration.objects.select_related("event", "category", "user").prefetch_related(
+            "event__categories"
+        ),
         reference_code=reference_code,
         user=request.user,
     )
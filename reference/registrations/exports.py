@@ -0,0 +1,100 @@
+import csv
+import json
+from datetime import date, datetime
+from typing import Iterable, Iterator
+
+from django.db.models import OuterRef, Subquery
+
+from profiles.models import UserRaceHistory
+from .models import EventRegistration
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = ("csv", "ndjson")
+
+# (column header, queryset lookup) pairs, in output order.
+EXPORT_COLUMNS = (
+    ("reference_code", "reference_code"),
+    ("event_id", "event_id"),
+    ("event_title", "event__title"),
+    ("username", "user__username"),
+    ("email", "user__email"),
+    ("first_name", "user__first_name"),
+    ("last_name", "user__last_name"),
+    ("category", "category__display_name"),
+    ("distance_label", "distance_label"),
+    ("bib_number", "bib_number"),
+    ("status", "status"),
+    ("payment_status", "payment_status"),
+    ("phone_number", "phone_number"),
+    ("emergency_contact_name", "emergency_contact_name"),
+    ("emergency_contact_phone", "emergency_contact_phone"),
+    ("medical_notes", "medical_notes"),
+    ("created_at", "created_at"),
+    ("confirmed_at", "confirmed_at"),
+)
+EXPORT_HEADERS = tuple(header for header, _ in EXPORT_COLUMNS)
+
+
+class _Echo:
+    """File-like object whose write() hands the line back instead of buffering it."""
+
+    def write(self, value):
+        return value
+
+
+def export_queryset(queryset=None):
+    """
+    Flatten registrations into plain value tuples for export.
+
+    The bib number lives on the matching UserRaceHistory row, so it is pulled
+    in with a correlated subquery instead of a per-row lookup.
+    """
+    if queryset is None:
+        queryset = EventRegistration.objects.all()
+    bib_number = (
+        UserRaceHistory.objects.filter(
+            profile__user=OuterRef("user_id"),
+            event=OuterRef("event_id"),
+        )
+        .exclude(bib_number="")
+        .values("bib_number")[:1]
+    )
+    return (
+        queryset.annotate(bib_number=Subquery(bib_number))
+        .order_by("event_id", "created_at")
+        .values_list(*(lookup for _, lookup in EXPORT_COLUMNS))
+    )
+
+
+def iter_rows(queryset, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[tuple]:
+    """Stream rows from the database without caching the queryset."""
+    return export_queryset(queryset).iterator(chunk_size=chunk_size)
+
+
+def _format_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def iter_csv(rows: Iterable[tuple]) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_HEADERS)
+    for row in rows:
+        yield writer.writerow(["" if value is None else _format_value(value) for value in row])
+
+
+def iter_ndjson(rows: Iterable[tuple]) -> Iterator[str]:
+    for row in rows:
+        record = dict(zip(EXPORT_HEADERS, (_format_value(value) for value in row)))
+        yield json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def stream_export(queryset, export_format: str = "csv", chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[str]:
+    """Return a lazy iterator of serialized lines for the given format."""
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {export_format}")
+    rows = iter_rows(queryset, chunk_size=chunk_size)
+    if export_format == "ndjson":
+        return iter_ndjson(rows)
+    return iter_csv(rows)
@@ -0,0 +1,79 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from events.models import Event
+from registrations.exports import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, stream_export
+from registrations.models import EventRegistration
+
+
+class Command(BaseCommand):
+    help = "Stream registrations for race-day operations as CSV or NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--event",
+            type=str,
+            help="Event id or slug to export (default: every event).",
+        )
+        parser.add_argument(
+            "--status",
+            action="append",
+            choices=[choice[0] for choice in EventRegistration.Status.choices],
+            help="Only export registrations with this status (repeatable).",
+        )
+        parser.add_argument(
+            "--format",
+            dest="export_format",
+            choices=EXPORT_FORMATS,
+            default="csv",
+            help="Output format (default: csv).",
+        )
+        parser.add_argument(
+            "--output",
+            type=str,
+            help="Destination file path (default: stdout).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help=f"Rows fetched per database round trip (default: {EXPORT_CHUNK_SIZE}).",
+        )
+
+    def handle(self, *args, **options):
+        queryset = EventRegistration.objects.all()
+
+        event_ref = options.get("event")
+        if event_ref:
+            lookup = {"pk": int(event_ref)} if event_ref.isdigit() else {"slug": event_ref}
+            event = Event.objects.filter(**lookup).only("id").first()
+            if event is None:
+                raise CommandError(f"Event not found: {event_ref}")
+            queryset = queryset.filter(event=event)
+
+        statuses = options.get("status")
+        if statuses:
+            queryset = queryset.filter(status__in=statuses)
+
+        chunk_size = options["chunk_size"]
+        if chunk_size < 1:
+            raise CommandError("--chunk-size must be a positive integer.")
+
+        lines = stream_export(queryset, options["export_format"], chunk_size=chunk_size)
+
+        output = options.get("output")
+        if output:
+            path = Path(output)
+            rows = 0
+            with open(path, "w", newline="", encoding="utf-8") as handle:
+                for line in lines:
+                    handle.write(line)
+                    rows += 1
+            if options["export_format"] == "csv":
+                rows -= 1  # header line
+            self.stderr.write(self.style.SUCCESS(f"Exported {rows} registrations to {path}."))
+            return
+
+        for line in lines:
+            self.stdout.write(line, ending="")
@@ -4,7 +4,9 @@ from django.conf import settings
 from django.db import models
 from django.utils import timezone
 
+from events.cache import invalidate_events
 from events.models import Event, EventCategory
+from profiles.bibs import BibRangeExhausted, allocate_bibs
 from profiles.models import UserProfile, UserRaceHistory
 
 
@@ -63,6 +65,29 @@ class EventRegistration(models.Model):
     confirmed_at = models.DateTimeField(null=True, blank=True)
     cancelled_at = models.DateTimeField(null=True, blank=True)
 
+    ACTIVE_STATUSES = (Status.PENDING, Status.CONFIRMED, Status.WAITLISTED)
+
+    # Status-change notifications as (title template, message) pairs.
+    STATUS_NOTIFICATIONS = {
+        Status.CONFIRMED: (
+            "You're confirmed for {title}",
+            "See your registration summary for race-day details.",
+        ),
+        Status.WAITLISTED: (
+            "Waitlist for {title}",
+            "The event has reached capacity but we've placed you on the waitlist. "
+            "We'll notify you if a slot opens.",
+        ),
+        Status.REJECTED: (
+            "Registration update for {title}",
+            "We were unable to confirm your registration. Contact support for more details.",
+        ),
+        Status.CANCELLED: (
+            "Registration cancelled - {title}",
+            "Your registration has been cancelled. If this is unexpected please reach out.",
+        ),
+    }
+
     class Meta:
         ordering = ["-created_at"]
         unique_together = ("user", "event")
@@ -74,6 +99,9 @@ class EventRegistration(models.Model):
     def __str__(self) -> str:
         return f"{self.user.username} - {self.event.title} ({self.status})"
 
+    # Set by sync_history() when confirming found the bib range full.
+    bib_error: str | None = None
+
     def save(self, *args, **kwargs):
         is_new = self._state.adding
         previous_status = None
@@ -103,21 +131,56 @@ class EventRegistration(models.Model):
         self.update_event_counter()
 
     def update_event_counter(self):
-        active_statuses = [
-            self.Status.PENDING,
-            self.Status.CONFIRMED,
-            self.Status.WAITLISTED,
-        ]
-        count = EventRegistration.objects.filter(
-            event=self.event, status__in=active_statuses
-        ).count()
-        Event.objects.filter(pk=self.event.pk).update(registered_count=count)
+        self.refresh_event_counters([self.event_id])
+
+    @classmethod
+    def refresh_event_counters(cls, event_ids):
+        """Recompute ``Event.registered_count`` for the given events in one aggregate query."""
+        event_ids = set(event_ids)
+        if not event_ids:
+            return
+        counts = dict(
+            cls.objects.filter(event_id__in=event_ids, status__in=cls.ACTIVE_STATUSES)
+            .values("event_id")
+            .annotate(total=models.Count("pk"))
+            .values_list("event_id", "total")
+        )
+        for event_id in event_ids:
+            Event.objects.filter(pk=event_id).update(registered_count=counts.get(event_id, 0))
+        # .update() skips the post_save hook that normally drops cached events.
+        invalidate_events(event_ids)
+
+    @staticmethod
+    def history_label(category_display_name: str | None, distance_label: str) -> str:
+        """The ``UserRaceHistory.category`` value a registration is tracked under."""
+        return category_display_name or distance_label or "Open Category"
+
+    @classmethod
+    def history_status_for(cls, status: str) -> str:
+        if status == cls.Status.CONFIRMED:
+            return UserRaceHistory.Status.UPCOMING
+        if status in (cls.Status.CANCELLED, cls.Status.REJECTED):
+            return UserRaceHistory.Status.DNS
+        return UserRaceHistory.Status.REGISTERED
+
+    @classmethod
+    def status_change_notification(cls, status: str) -> tuple[str, str] | None:
+        """
+        ``(title, message)`` sent when an existing registration moves to
+        ``status``; ``None`` when the change is not announced. Being moved to
+        the waitlist is only announced on creation.
+        """
+        if status == cls.Status.WAITLISTED:
+            return None
+        return cls.STATUS_NOTIFICATIONS.get(status)
 
     def sync_history(self):
+        self.bib_error = None
         profile, _ = UserProfile.objects.get_or_create(user=self.user)
-        distance_label = self.category.display_name if self.category else self.distance_label
-        if not distance_label:
-            distance_label = "Open Category"
+        distance_label = self.history_label(
+            self.category.display_name if self.category else None,
+            self.distance_label,
+        )
         history, _ = UserRaceHistory.objects.get_or_create(
             profile=profile,
             event=self.event,
@@ -128,15 +191,17 @@ class EventRegistration(models.Model):
             },
         )
 
-        if self.status == self.Status.CONFIRMED:
-            history.status = UserRaceHistory.Status.UPCOMING
-        elif self.status == self.Status.CANCELLED:
-            history.status = UserRaceHistory.Status.DNS
-        elif self.status == self.Status.REJECTED:
-            history.status = UserRaceHistory.Status.DNS
-        else:
-            history.status = UserRaceHistory.Status.REGISTERED
-        history.save(update_fields=["status", "updated_at"])
+        history.status = self.history_status_for(self.status)
+        update_fields = ["status", "updated_at"]
+        if self.status == self.Status.CONFIRMED and not history.bib_number:
+            try:
+                history.bib_number = allocate_bibs(history.event_id, 1, history.category)[0]
+            except BibRangeExhausted as exc:
+                # Stay confirmed without a bib; the caller reports it.
+                self.bib_error = str(exc)
+            else:
+                update_fields.append("bib_number")
+        history.save(update_fields=update_fields)
 
     @property
     def is_active(self) -> bool:
@@ -158,13 +223,11 @@ class EventRegistration(models.Model):
 
         if is_new:
             if self.status == self.Status.WAITLISTED:
+                title, message = self.STATUS_NOTIFICATIONS[self.Status.WAITLISTED]
                 send_notification(
                     recipient=self.user,
-                    title=f"Waitlist for {self.event.title}",
-                    message=(
-                        "The event has reached capacity but we've placed you on the waitlist. "
-                        "We'll notify you if a slot opens."
-                    ),
+                    title=title.format(title=self.event.title),
+                    message=message,
                     category=Notification.Category.REGISTRATION,
                     url_name="registrations:detail",
                     url_kwargs=detail_kwargs,
@@ -181,29 +244,13 @@ class EventRegistration(models.Model):
             return
 
         if old_status and old_status != self.status:
-            if self.status == self.Status.CONFIRMED:
-                send_notification(
-                    recipient=self.user,
-                    title=f"You're confirmed for {self.event.title}",
-                    message="See your registration summary for race-day details.",
-                    category=Notification.Category.REGISTRATION,
-                    url_name="registrations:detail",
-                    url_kwargs=detail_kwargs,
-                )
-            elif self.status == self.Status.REJECTED:
-                send_notification(
-                    recipient=self.user,
-                    title=f"Registration update for {self.event.title}",
-                    message="We were unable to confirm your registration. Contact support for more details.",
-                    category=Notification.Category.REGISTRATION,
-                    url_name="registrations:detail",
-                    url_kwargs=detail_kwargs,
-                )
-            elif self.status == self.Status.CANCELLED:
+            template = self.status_change_notification(self.status)
+            if template:
+                title, message = template
                 send_notification(
                     recipient=self.user,
-                    title=f"Registration cancelled - {self.event.title}",
-                    message="Your registration has been cancelled. If this is unexpected please reach out.",
+                    title=title.format(title=self.event.title),
+                    message=message,
                     category=Notification.Category.REGISTRATION,
                     url_name="registrations:detail",
                     url_kwargs=detail_kwargs,
@@ -396,3 +396,366 @@ class RegistrationViewTests(TestCase):
 
     # Tes untuk register_ajax bisa ditambahkan jika fitur itu aktif digunakan
 
+
+class RegistrationExportTests(TestCase):
+    """Tests for the streaming registration export endpoint and command."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='exportadmin', password='password123', is_staff=True)
+        cls.runner = User.objects.create_user(username='runner', password='password123', email='runner@example.com')
+        cls.other_runner = User.objects.create_user(username='runner2', password='password123')
+        cls.category = EventCategory.objects.create(name="21K", distance_km=21.1, display_name="Half Marathon")
+        cls.event = Event.objects.create(
+            title="Export Event",
+            description="Race-day export",
+            city="Jakarta",
+            start_date=timezone.now().date() + datetime.timedelta(days=30),
+            registration_deadline=timezone.now().date() + datetime.timedelta(days=15),
+        )
+        cls.other_event = Event.objects.create(
+            title="Other Event",
+            description="Should not be exported",
+            city="Bandung",
+            start_date=timezone.now().date() + datetime.timedelta(days=40),
+            registration_deadline=timezone.now().date() + datetime.timedelta(days=20),
+        )
+        cls.registration = EventRegistration.objects.create(
+            user=cls.runner,
+            event=cls.event,
+            category=cls.category,
+            phone_number='0811',
+            emergency_contact_name='Mom, "Home"',
+            emergency_contact_phone='0822',
+        )
+        EventRegistration.objects.create(
+            user=cls.other_runner,
+            event=cls.other_event,
+            phone_number='0833',
+            emergency_contact_name='Dad',
+            emergency_contact_phone='0844',
+        )
+        from profiles.models import UserRaceHistory
+        UserRaceHistory.objects.filter(profile__user=cls.runner, event=cls.event).update(bib_number="21001")
+
+    def setUp(self):
+        self.client = Client()
+        self.url = reverse('registrations_admin_api:participants-export')
+
+    def _read(self, response):
+        return b"".join(response.streaming_content).decode("utf-8")
+
+    def test_export_requires_admin(self):
+        self.client.login(username='runner', password='password123')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+
+    def test_export_csv_streams_event_rows(self):
+        import csv
+        import io
+        self.client.login(username='exportadmin', password='password123')
+        response = self.client.get(self.url, {"event": self.event.pk})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn("text/csv", response["Content-Type"])
+        self.assertIn(f"event-{self.event.pk}", response["Content-Disposition"])
+
+        rows = list(csv.DictReader(io.StringIO(self._read(response))))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["reference_code"], self.registration.reference_code)
+        self.assertEqual(rows[0]["bib_number"], "21001")
+        self.assertEqual(rows[0]["category"], "Half Marathon")
+        self.assertEqual(rows[0]["emergency_contact_name"], 'Mom, "Home"')
+        self.assertEqual(rows[0]["confirmed_at"], "")
+
+    def test_export_ndjson(self):
+        self.client.login(username='exportadmin', password='password123')
+        response = self.client.get(self.url, {"output": "ndjson"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        records = [json.loads(line) for line in self._read(response).splitlines()]
+        self.assertEqual(len(records), 2)
+        self.assertEqual({record["username"] for record in records}, {"runner", "runner2"})
+        self.assertIsNone(records[0]["confirmed_at"])
+
+    def test_export_rejects_unknown_format(self):
+        self.client.login(username='exportadmin', password='password123')
+        response = self.client.get(self.url, {"output": "xlsx"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_export_command_writes_file(self):
+        import os
+        import tempfile
+        from io import StringIO
+        from django.core.management import call_command
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "export.ndjson")
+            stderr = StringIO()
+            call_command(
+                "export_registrations",
+                event=self.event.slug,
+                export_format="ndjson",
+                output=path,
+                stderr=stderr,
+            )
+            with open(path, encoding="utf-8") as handle:
+                records = [json.loads(line) for line in handle]
+
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["event_title"], "Export Event")
+        self.assertIn("Exported 1 registrations", stderr.getvalue())
+
+    def test_export_command_stdout_csv(self):
+        from io import StringIO
+        from django.core.management import call_command
+
+        stdout = StringIO()
+        call_command("export_registrations", status=["pending"], stdout=stdout)
+        lines = stdout.getvalue().strip().splitlines()
+        self.assertTrue(lines[0].startswith("reference_code,event_id"))
+        self.assertEqual(len(lines), 3)
+
+
+class RegistrationBulkActionTests(TestCase):
+    """Tests for the bulk confirm/reject/waitlist admin endpoint."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='bulkadmin', password='password123', is_staff=True)
+        cls.event = Event.objects.create(
+            title="Bulk Event",
+            description="Bulk confirm",
+            city="Jakarta",
+            start_date=timezone.now().date() + datetime.timedelta(days=30),
+            registration_deadline=timezone.now().date() + datetime.timedelta(days=15),
+        )
+        cls.runners = [
+            User.objects.create_user(username=f'bulkrunner{index}', password='password123')
+            for index in range(3)
+        ]
+
+    def setUp(self):
+        self.client = Client()
+        self.client.login(username='bulkadmin', password='password123')
+        self.url = reverse('registrations_admin_api:participants-bulk')
+        self.registrations = [
+            EventRegistration.objects.create(
+                user=runner,
+                event=self.event,
+                phone_number='0811',
+                emergency_contact_name='Em',
+                emergency_contact_phone='0822',
+            )
+            for runner in self.runners
+        ]
+
+    def _post(self, payload):
+        return self.client.post(self.url, data=json.dumps(payload), content_type='application/json')
+
+    def test_bulk_confirm_updates_registrations_history_and_notifications(self):
+        from notifications.models import Notification
+        from profiles.models import UserRaceHistory
+
+        ids = [str(reg.id) for reg in self.registrations[:2]]
+        notifications_before = Notification.objects.count()
+
+        response = self._post({"action": "confirm", "ids": ids, "decision_note": "Welcome"})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["updated_count"], 2)
+        self.assertEqual(sorted(data["updated"]), sorted(ids))
+
+        confirmed = EventRegistration.objects.filter(pk__in=ids)
+        self.assertTrue(all(reg.status == EventRegistration.Status.CONFIRMED for reg in confirmed))
+        self.assertTrue(all(reg.confirmed_at for reg in confirmed))
+        self.assertTrue(all(reg.decision_note == "Welcome" for reg in confirmed))
+        self.assertEqual(
+            UserRaceHistory.objects.filter(
+                event=self.event, status=UserRaceHistory.Status.UPCOMING
+            ).count(),
+            2,
+        )
+        self.assertEqual(
+            list(
+                UserRaceHistory.objects.filter(event=self.event)
+                .exclude(bib_number="")
+                .order_by("bib_number")
+                .values_list("bib_number", flat=True)
+            ),
+            ["0001", "0002"],
+        )
+        self.assertEqual(Notification.objects.count(), notifications_before + 2)
+        note = Notification.objects.filter(recipient=self.runners[0]).first()
+        self.assertEqual(note.title, "You're confirmed for Bulk Event")
+        self.assertIn(self.registrations[0].reference_code, note.link_url)
+
+    def test_bulk_notifications_match_single_saves(self):
+        from notifications.models import Notification
+        from registrations.bulk import bulk_set_status
+
+        def sent(registrations):
+            return sorted(
+                Notification.objects.filter(recipient__in=[reg.user for reg in registrations])
+                .exclude(title__startswith="Registration received")
+                .values_list("title", flat=True)
+            )
+
+        single, bulk = self.registrations[:1], self.registrations[1:2]
+        for status in (EventRegistration.Status.WAITLISTED, EventRegistration.Status.CONFIRMED):
+            for registration in single:
+                registration.status = status
+                registration.save()
+            bulk_set_status([reg.id for reg in bulk], status)
+        self.assertEqual(sent(single), ["You're confirmed for Bulk Event"])
+        self.assertEqual(sent(bulk), sent(single))
+
+    def test_bulk_reject_refreshes_event_counter_once(self):
+        ids = [str(reg.id) for reg in self.registrations]
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registered_count, 3)
+
+        response = self._post({"action": "reject", "ids": ids})
+
+        self.assertEqual(response.status_code, 200)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registered_count, 0)
+
+    def test_bulk_query_count_is_independent_of_batch_size(self):
+        from registrations.bulk import bulk_set_status
+
+        with self.assertNumQueries(11):
+            bulk_set_status([self.registrations[0].id], EventRegistration.Status.WAITLISTED)
+        with self.assertNumQueries(11):
+            bulk_set_status(
+                [reg.id for reg in self.registrations[1:]], EventRegistration.Status.WAITLISTED
+            )
+
+    def test_bulk_reports_unchanged_and_missing_ids(self):
+        self.registrations[0].status = EventRegistration.Status.CONFIRMED
+        self.registrations[0].save()
+        missing = str(uuid.uuid4())
+
+        response = self._post({
+            "action": "confirm",
+            "ids": [str(self.registrations[0].id), str(self.registrations[1].id), missing],
+        })
+
+        data = response.json()
+        self.assertEqual(data["unchanged"], [str(self.registrations[0].id)])
+        self.assertEqual(data["updated"], [str(self.registrations[1].id)])
+        self.assertEqual(data["not_found"], [missing])
+
+    def test_bulk_rejects_invalid_payloads(self):
+        self.assertEqual(self._post({"action": "delete", "ids": []}).status_code, 400)
+        self.assertEqual(self._post({"action": "confirm", "ids": []}).status_code, 400)
+        self.assertEqual(self._post({"action": "confirm", "ids": ["not-a-uuid"]}).status_code, 400)
+        registration_id = str(self.registrations[0].id)
+        for payload in (
+            [registration_id],
+            "confirm",
+            {"action": ["confirm"], "ids": [registration_id]},
+            {"action": {"confirm": 1}, "ids": [registration_id]},
+            {"action": "confirm", "ids": [[registration_id]]},
+            {"action": "confirm", "ids": [{"id": registration_id}]},
+        ):
+            self.assertEqual(self._post(payload).status_code, 400)
+
+    def test_bulk_requires_admin(self):
+        self.client.logout()
+        self.client.login(username='bulkrunner0', password='password123')
+        response = self._post({"action": "confirm", "ids": [str(self.registrations[0].id)]})
+        self.assertEqual(response.status_code, 403)
+
+
+class RegistrationListPayloadTests(TestCase):
+    """Tests for the compact registration list payload with sideloaded events."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='listadmin', password='password123', is_staff=True)
+        cls.category = EventCategory.objects.create(name="5K", distance_km=5, display_name="Fun Run 5K")
+        cls.events = []
+        for index in range(3):
+            event = Event.objects.create(
+                title=f"Payload Event {index}",
+                description="Listing",
+                city="Jakarta",
+                start_date=timezone.now().date() + datetime.timedelta(days=30 + index),
+                registration_deadline=timezone.now().date() + datetime.timedelta(days=15),
+            )
+            event.categories.add(cls.category)
+            cls.events.append(event)
+        cls.runners = []
+        for index in range(4):
+            runner = User.objects.create_user(username=f'payloadrunner{index}', password='password123')
+            cls.runners.append(runner)
+            EventRegistration.objects.create(
+                user=runner,
+                event=cls.events[index % 2],
+                category=cls.category,
+                phone_number='0811',
+                emergency_contact_name='Em',
+                emergency_contact_phone='0822',
+            )
+
+    def setUp(self):
+        self.client = Client()
+        self.client.login(username='listadmin', password='password123')
+        self.url = reverse('registrations_admin_api:participants')
+
+    def test_list_references_events_by_id_with_sideloaded_map(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(len(data["results"]), 4)
+        self.assertEqual(set(data["events"]), {str(self.events[0].pk), str(self.events[1].pk)})
+        for row in data["results"]:
+            self.assertIsInstance(row["event"], int)
+            self.assertIn(str(row["event"]), data["events"])
+        event_payload = data["events"][str(self.events[0].pk)]
+        self.assertEqual(event_payload["title"], "Payload Event 0")
+        self.assertEqual(event_payload["categories"][0]["display_name"], "Fun Run 5K")
+
+    def test_expand_event_keeps_nested_shape(self):
+        response = self.client.get(self.url, {"expand": "event"})
+
+        data = response.json()
+        self.assertNotIn("events", data)
+        self.assertEqual(data["results"][0]["event"]["categories"][0]["display_name"], "Fun Run 5K")
+
+    def test_category_queries_do_not_scale_with_rows(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        def category_queries():
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.get(self.url, {"expand": "event"})
+            return [q for q in ctx.captured_queries if "events_eventcategory" in q["sql"]]
+
+        baseline = len(category_queries())
+        for index in range(4, 8):
+            runner = User.objects.create_user(username=f'payloadrunner{index}', password='password123')
+            EventRegistration.objects.create(
+                user=runner,
+                event=self.events[2],
+                category=self.category,
+                phone_number='0811',
+                emergency_contact_name='Em',
+                emergency_contact_phone='0822',
+            )
+        self.assertEqual(len(category_queries()), baseline)
+
+    def test_user_registrations_api_uses_compact_shape(self):
+        self.client.logout()
+        self.client.login(username='payloadrunner0', password='password123')
+        response = self.client.get('/api/registrations/')
+
+        data = response.json()
+        self.assertEqual(data["total"], 1)
+        self.assertEqual(data["results"][0]["event"], self.events[0].pk)
+        self.assertEqual(list(data["events"]), [str(self.events[0].pk)])
@@ -1,7 +1,6 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils.decorators import method_decorator
@@ -10,6 +9,7 @@ from django.views.generic import DetailView, FormView, ListView
 from django.contrib.auth import authenticate, login, logout
 from django.views.decorators.csrf import csrf_exempt
 
+from core.renderers import FastJsonResponse
 from events.models import Event
 from profiles.models import UserProfile
 from .forms import RegistrationForm
@@ -149,7 +149,7 @@ def my_registrations_json(request):
                 ),
             }
         )
-    return JsonResponse({"results": results})
+    return FastJsonResponse({"results": results})
 
 
 @csrf_exempt # Tambahkan ini untuk memudahkan testing API dari mobile
@@ -235,7 +235,7 @@ def register_ajax(request, slug):
             }
 
         # Return JSON lengkap sesuai model Flutter EventRegistration
-        return JsonResponse({
+        return FastJsonResponse({
             "success": True,
             "message": "Registration submitted successfully." if created else "Registration updated successfully.",
             "registration_url": reverse("registrations:detail", kwargs={"reference": registration.reference_code}),
@@ -262,7 +262,7 @@ def register_ajax(request, slug):
             "cancelled_at": registration.cancelled_at.isoformat() if registration.cancelled_at else None,
         })
 
-    return JsonResponse({
+    return FastJsonResponse({
         "success": False,
         "errors": form.errors,
         "non_field_errors": form.non_field_errors(),
@@ -95,6 +95,51 @@ document.addEventListener("DOMContentLoaded", () => {
             });
     };
 
+    // Event pickers hold only the selected event; matching events are
+    // fetched from the search endpoint as the user types.
+    document.querySelectorAll("select[data-event-search]").forEach((select) => {
+        const endpoint = select.dataset.eventSearch;
+        const searchInput = document.createElement("input");
+        searchInput.type = "search";
+        searchInput.className = "control event-search";
+        searchInput.placeholder = "Type to find an event";
+        searchInput.setAttribute("aria-label", "Search events");
+        select.before(searchInput);
+
+        let timeout;
+        let latest = 0;
+        const search = () => {
+            const requestId = ++latest;
+            const params = new URLSearchParams({ q: searchInput.value.trim() });
+            fetch(`${endpoint}?${params.toString()}`, { headers: { "X-Requested-With": "XMLHttpRequest" } })
+                .then((response) => (response.ok ? response.json() : Promise.reject()))
+                .then((data) => {
+                    if (requestId !== latest) {
+                        return;
+                    }
+                    const keep = Array.from(select.options).filter((option) => !option.value || option.selected);
+                    const kept = new Set(keep.map((option) => option.value));
+                    select.replaceChildren(...keep);
+                    (data.results || []).forEach((event) => {
+                        if (!kept.has(String(event.id))) {
+                            select.add(new Option(event.title, event.id));
+                        }
+                    });
+                })
+                .catch(() => {});
+        };
+        searchInput.addEventListener("input", () => {
+            clearTimeout(timeout);
+            timeout = setTimeout(search, 250);
+        });
+        searchInput.addEventListener("change", (event) => event.stopPropagation());
+        searchInput.addEventListener("focus", () => {
+            if (select.options.length <= 2) {
+                search();
+            }
+        }, { once: true });
+    });
+
     if (filterForm && threadListSection) {
         filterForm.addEventListener("change", fetchThreads);
         filterForm.addEventListener("submit", (event) => {
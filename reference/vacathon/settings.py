@@ -29,7 +29,7 @@ SECRET_KEY = 'django-insecure-k+xd%pr9%+(q9ah=0%p#j(idbzbxx=38v!oud-(%qxv=gyr-ii
 
 PRODUCTION = os.getenv('PRODUCTION', 'False').lower() == 'true'
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.getenv('DEBUG', str(not PRODUCTION)).lower() == 'true'
 
 ALLOWED_HOSTS = [
     "localhost",
@@ -69,6 +69,7 @@ MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'core.middleware.JSONCompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -112,6 +113,16 @@ WSGI_APPLICATION = 'vacathon.wsgi.application'
 # Database configuration
 if PRODUCTION:
     # Production: gunakan PostgreSQL dengan kredensial dari environment variables
+    #
+    # Connections are reused instead of opened per request. With DB_POOL (the
+    # default; needs psycopg 3 + psycopg_pool) each worker process keeps a
+    # server-side pool of up to DB_POOL_MAX_SIZE connections, checked before
+    # being handed out; size it to the worker's threads and keep
+    # workers x DB_POOL_MAX_SIZE below the server's max_connections. Without
+    # the pool, connections persist for CONN_MAX_AGE seconds and are
+    # health-checked before reuse. search_path travels in the startup packet,
+    # so it is applied once per physical connection.
+    DB_POOL = os.getenv('DB_POOL', 'True').lower() == 'true'
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.postgresql',
@@ -120,11 +131,25 @@ if PRODUCTION:
             'PASSWORD': os.getenv('DB_PASSWORD'),
             'HOST': os.getenv('DB_HOST'),
             'PORT': os.getenv('DB_PORT'),
+            # The pool owns connection lifetime; Django requires 0 alongside it.
+            'CONN_MAX_AGE': 0 if DB_POOL else int(os.getenv('CONN_MAX_AGE', '600')),
+            'CONN_HEALTH_CHECKS': True,
             'OPTIONS': {
                 'options': f"-c search_path={os.getenv('SCHEMA', 'public')}"
             }
         }
     }
+    if DB_POOL:
+        from psycopg_pool import ConnectionPool
+
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '1')),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '4')),
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+            'max_idle': 5 * 60,
+            'max_lifetime': 30 * 60,
+            'check': ConnectionPool.check_connection,
+        }
 else:
     # Development: gunakan SQLite
     DATABASES = {
@@ -134,6 +159,38 @@ else:
         }
     }
 
+# Cache
+# Shared (L2) tier behind core.cache.TwoTierCache; every worker also keeps a
+# small in-process LRU (L1) in front of it. Invalidation bumps version keys
+# here, so the backend must be shared by all gunicorn workers: Redis when
+# REDIS_URL is set, else a file cache (one host), else per-process memory for
+# development.
+CACHE_TIMEOUT = int(os.getenv('CACHE_TIMEOUT', '300'))
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+            'TIMEOUT': CACHE_TIMEOUT,
+        }
+    }
+elif PRODUCTION:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv('CACHE_DIR', str(BASE_DIR / '.cache')),
+            'TIMEOUT': CACHE_TIMEOUT,
+            'OPTIONS': {'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', '10000'))},
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'TIMEOUT': CACHE_TIMEOUT,
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -170,15 +227,38 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
 STATIC_URL = '/static/'
-if DEBUG:
-    STATICFILES_DIRS = [
-        BASE_DIR / 'static' # merujuk ke /static root project pada mode development
-    ]
-else:
-    STATIC_ROOT = BASE_DIR / 'static' # merujuk ke /static root project pada mode production
+STATICFILES_DIRS = [
+    BASE_DIR / 'static' # sumber asset project
+]
+STATIC_ROOT = Path(os.getenv('STATIC_ROOT', BASE_DIR / 'staticfiles')) # hasil collectstatic
+
+# Production builds fingerprint every asset (css/base.<hash>.css), write the
+# manifest and precompress .gz/.br copies during `collectstatic`. WhiteNoise
+# serves hashed names with `Cache-Control: max-age=315360000, public,
+# immutable` and picks the precompressed copy the client accepts. Hashed URLs
+# are only emitted with DEBUG off.
+# Verify a build with `manage.py check --deploy --tag staticfiles`.
+STATIC_PIPELINE = os.getenv('STATIC_PIPELINE', str(PRODUCTION)).lower() == 'true'
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+        if STATIC_PIPELINE
+        else 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+# Serve straight from the source folders only while developing without a build.
+WHITENOISE_AUTOREFRESH = DEBUG and not STATIC_PIPELINE
+WHITENOISE_USE_FINDERS = WHITENOISE_AUTOREFRESH
 
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# Uploads are served by Django itself with DEBUG off only when explicitly
+# enabled (no separate media server); django.views.static.serve is slow and
+# unaudited for production traffic.
+SERVE_MEDIA = os.getenv('SERVE_MEDIA', 'false').lower() == 'true'
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -194,10 +274,21 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
 }
 
+# Recent activity counted by `manage.py refresh_popularity` loses half its
+# weight every this many days.
+POPULARITY_HALF_LIFE_DAYS = float(os.getenv('POPULARITY_HALF_LIFE_DAYS', '7'))
+
+# JSON responses smaller than this are sent uncompressed.
+JSON_COMPRESSION_MIN_SIZE = int(os.getenv('JSON_COMPRESSION_MIN_SIZE', '1024'))
+
 LOGIN_URL = '/profile/login/'
 LOGIN_REDIRECT_URL = '/profile/'
 LOGOUT_REDIRECT_URL = '/'
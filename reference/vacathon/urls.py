@@ -15,7 +15,10 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+import re
+
+from django.urls import path, include, re_path
+from django.views.static import serve
 
 # Impor ini untuk menyajikan file media (upload) saat development
 from django.conf import settings
@@ -23,6 +26,9 @@ from django.conf.urls.static import static
 
 
 urlpatterns = [
+    # Admin JSON API used by the mobile app; must precede the Django admin catch-all
+    path('admin/api/', include('events.admin_api_urls')),
+    path('admin/api/', include('registrations.admin_api_urls')),
     path('admin/', admin.site.urls),
     path('accounts/', include('django.contrib.auth.urls')),
     path('', include('core.urls')),
@@ -47,3 +53,12 @@ urlpatterns = [
 # Ini agar server Django mau menyajikan file yang di-upload ke MEDIA_ROOT
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+elif settings.SERVE_MEDIA:
+    # Opt-in untuk deployment tanpa media server terpisah (SERVE_MEDIA=true).
+    urlpatterns += [
+        re_path(
+            r"^%s(?P<path>.*)$" % re.escape(settings.MEDIA_URL.lstrip("/")),
+            serve,
+            {"document_root": settings.MEDIA_ROOT},
+        ),
+    ]